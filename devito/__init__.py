@@ -5,6 +5,7 @@ from devito.finite_difference import *  # noqa
 from devito.dimension import *  # noqa
 from devito.grid import *  # noqa
 from devito.function import Forward, Backward  # noqa
+from devito.interpolators import *  # noqa
 from devito.logger import error, warning, info  # noqa
 from devito.parameters import *  # noqa
 from devito.symbolics import *  # noqa
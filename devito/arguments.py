@@ -186,6 +186,11 @@ class ArgumentEngine(object):
 
         return arguments, user_autotune and dle_autotune
 
+    @property
+    def blocking_arguments(self):
+        """The DLE arguments whose value depends on a :class:`Dimension` size."""
+        return [i for i in self.dle_arguments if isinstance(i.argument, Dimension)]
+
     def _offset_adjust(self, kwargs):
         for k, v in kwargs.items():
             if k in self.offsets:
@@ -204,7 +209,7 @@ class ArgumentEngine(object):
                 v = dim_dep_mapper.setdefault(d, [])
                 v.append(ValueDependency(argument, param=i))
 
-        for arg in self.dle_arguments:
+        for arg in self.blocking_arguments:
             v = dim_dep_mapper.setdefault(arg.argument, [])
             v.append(ValueDependency(derive_dle_arg_value, param=arg))
 
@@ -249,9 +254,11 @@ class ArgumentEngine(object):
                 # should have exactly one entry
                 assert(len(orig_param_l) == 1)
                 orig_param = orig_param_l[0]
-                # Pull out the children and add them to kwargs
+                # Pull out the children used by the Operator and add them to kwargs
+                names = [i.name for i in self.parameters]
                 for orig_child, new_child in zip(orig_param.children, v.children):
-                    new_params[orig_child.name] = new_child
+                    if orig_child.name in names:
+                        new_params[orig_child.name] = new_child
         kwargs.update(new_params)
         return kwargs
 
@@ -259,7 +266,7 @@ class ArgumentEngine(object):
         # Add user-provided block sizes, if any
         dle_arguments = OrderedDict()
         autotune = True
-        for i in self.dle_arguments:
+        for i in self.blocking_arguments:
             dim_size = dim_sizes.get(i.original_dim.name, None)
             if dim_size is None:
                 raise InvalidArgument('Unable to derive size of dimension %s from '
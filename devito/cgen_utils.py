@@ -2,8 +2,9 @@ from collections import OrderedDict
 
 import cgen as c
 from mpmath.libmp import prec_to_dps, to_str
-from sympy import Eq, Function
+from sympy import Eq, Function, Pow, Symbol
 from sympy.printing.ccode import C99CodePrinter
+from sympy.printing.precedence import precedence
 
 
 class Allocator(object):
@@ -100,6 +101,56 @@ class CodePrinter(C99CodePrinter):
 
         return '%d.0F/%d.0F' % (p, q)  # float precision by default
 
+    def _print_Pow(self, expr):
+        """Print reciprocals as float divisions
+
+        :param expr: A power
+        :returns: The resulting code as a string
+        """
+        if expr.exp == -1:
+            return '1.0F/%s' % self.parenthesize(expr.base, precedence(expr))
+        return super(CodePrinter, self)._print_Pow(expr)
+
+    def _print_Mul(self, expr):
+        """Print product, parenthesizing the products in the denominator
+
+        :param expr: A product
+        :returns: The resulting code as a string
+        """
+        args = []
+        for i in expr.args:
+            if i.is_Pow and i.exp.is_negative and i.base.is_Mul:
+                # E.g., the unevaluated 1/(a*a) produced by pow_to_mul would
+                # otherwise be printed as /a*a, that is (1/a)*a
+                base = Symbol('(%s)' % self._print(i.base))
+                i = Pow(base, i.exp, evaluate=False)
+            args.append(i)
+        return super(CodePrinter, self)._print_Mul(expr.func(*args, evaluate=False))
+
+    def _print_Min(self, expr):
+        """Print min as a conditional expression, which, unlike fmin, also
+        applies to integers
+
+        :param expr: A minimum
+        :returns: The resulting code as a string
+        """
+        if len(expr.args) == 1:
+            return self._print(expr.args[0])
+        a, b = self._print(expr.args[0]), self._print(expr.func(*expr.args[1:]))
+        return '((%s) < (%s) ? (%s) : (%s))' % (a, b, a, b)
+
+    def _print_Max(self, expr):
+        """Print max as a conditional expression, which, unlike fmax, also
+        applies to integers
+
+        :param expr: A maximum
+        :returns: The resulting code as a string
+        """
+        if len(expr.args) == 1:
+            return self._print(expr.args[0])
+        a, b = self._print(expr.args[0]), self._print(expr.func(*expr.args[1:]))
+        return '((%s) > (%s) ? (%s) : (%s))' % (a, b, a, b)
+
     def _print_Mod(self, expr):
         """Print mod using % operator in C++
 
@@ -6,6 +6,7 @@ from functools import reduce
 from operator import mul
 import resource
 
+from devito.dle.backends import BlockingArg, ParallelArg
 from devito.ir.iet import Iteration, FindNodes, FindSymbols
 from devito.logger import info, info_at
 from devito.parameters import configuration
@@ -51,8 +52,13 @@ def autotune(operator, arguments, tunable):
         info_at("Couldn't understand loop structure, giving up auto-tuning")
         return arguments
 
+    blocking = [i for i in tunable if isinstance(i, BlockingArg)]
+    parallel = [i for i in tunable if isinstance(i, ParallelArg)]
+    if not blocking and not parallel:
+        return arguments
+
     # Attempted block sizes ...
-    mapper = OrderedDict([(i.argument.symbolic_size.name, i) for i in tunable])
+    mapper = OrderedDict([(i.argument.symbolic_size.name, i) for i in blocking])
     # ... Defaults (basic mode)
     blocksizes = [OrderedDict([(i, v) for i in mapper]) for v in options['at_blocksize']]
     # ... Always try the entire iteration space (degenerate block)
@@ -74,7 +80,7 @@ def autotune(operator, arguments, tunable):
     # Note: there is only a single loop over 'blocksize' because only
     # square blocks are tested
     timings = OrderedDict()
-    for bs in blocksizes:
+    for bs in (blocksizes if blocking else []):
         illegal = False
         for k, v in at_arguments.items():
             if k in bs:
@@ -109,27 +115,41 @@ def autotune(operator, arguments, tunable):
             info_at("Couldn't determine stack size, skipping block size %s" % str(bs))
             continue
 
-        # Use AT-specific profiler structs
-        timer = operator.profiler.new()
-        at_arguments[operator.profiler.name] = timer
-
-        operator.cfunction(*list(at_arguments.values()))
-        elapsed = sum(getattr(timer._obj, i) for i, _ in timer._obj._fields_)
+        elapsed = run(operator, at_arguments)
         timings[tuple(bs.items())] = elapsed
         info_at("Block shape <%s> took %f (s) in %d time steps" %
                 (','.join('%d' % i for i in bs.values()), elapsed, timesteps))
 
-    try:
-        best = dict(min(timings, key=timings.get))
-        info("Auto-tuned block shape: %s" % best)
-    except ValueError:
-        info("Auto-tuning request, but couldn't find legal block sizes")
-        return arguments
+    if blocking:
+        try:
+            best = dict(min(timings, key=timings.get))
+            info("Auto-tuned block shape: %s" % best)
+        except ValueError:
+            info("Auto-tuning request, but couldn't find legal block sizes")
+            return arguments
+        at_arguments.update(best)
+    else:
+        best = {}
+
+    # Attempted OpenMP parameters (e.g., chunk size, number of threads). These
+    # are tuned one at a time, on top of the best block shape
+    for i in parallel:
+        timings = OrderedDict()
+        for v in i.candidates:
+            at_arguments[i.argument.name] = v
+            timings[v] = run(operator, at_arguments)
+            info_at("OpenMP parameter <%s=%d> took %f (s) in %d time steps" %
+                    (i.argument.name, v, timings[v], timesteps))
+        best[i.argument.name] = at_arguments[i.argument.name] =\
+            min(timings, key=timings.get)
+    if parallel:
+        info("Auto-tuned OpenMP parameters: %s" %
+             {i.argument.name: best[i.argument.name] for i in parallel})
 
     # Build the new argument list
     tuned = OrderedDict()
     for k, v in arguments.items():
-        tuned[k] = best[k] if k in mapper else v
+        tuned[k] = best[k] if k in best else v
 
     # Reset the profiling struct
     assert operator.profiler.name in tuned
@@ -138,6 +158,18 @@ def autotune(operator, arguments, tunable):
     return tuned
 
 
+def run(operator, at_arguments):
+    """
+    Run ``operator`` with the given arguments, and return the elapsed time.
+    """
+    # Use AT-specific profiler structs
+    timer = operator.profiler.new()
+    at_arguments[operator.profiler.name] = timer
+
+    operator.cfunction(*list(at_arguments.values()))
+    return sum(getattr(timer._obj, i) for i, _ in timer._obj._fields_)
+
+
 def more_heuristic_attempts(blocksizes):
     # Ramp up to higher block sizes
     handle = OrderedDict([(i, options['at_blocksize'][-1]) for i in blocksizes[0]])
@@ -14,9 +14,10 @@ class OperatorCore(OperatorRunnable):
     def _autotune(self, arguments):
         """
         Use auto-tuning on this Operator to determine empirically the
-        best block sizes when loop blocking is in use.
+        best block sizes when loop blocking is in use, as well as the best
+        OpenMP parameters when parallelism is in use.
         """
-        if self.dle_flags.get('blocking', False):
+        if self.dle_flags.get('blocking', False) or self.dle_flags.get('openmp', False):
             return autotune(self, arguments, self.dle_arguments)
         else:
             return arguments
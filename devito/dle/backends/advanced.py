@@ -4,24 +4,35 @@ from __future__ import absolute_import
 
 from collections import OrderedDict
 from itertools import combinations
+import re
 
 import cgen
 import numpy as np
 import psutil
+from sympy import Max, Min
 
 from devito.cgen_utils import ccode
 from devito.dimension import Dimension
-from devito.dle import fold_blockable_tree, unfold_blocked_tree
-from devito.dle.backends import (BasicRewriter, BlockingArg, dle_pass, omplang,
-                                 simdinfo, get_simd_flag, get_simd_items)
+from devito.dle import (blockshape_heuristic, fold_blockable_tree, unfold_blocked_tree,
+                        wavefront_heuristic, wavefront_skew)
+from devito.dle.backends import (BasicRewriter, BlockingArg, ParallelArg, dle_pass,
+                                 omplang, omp_chunk_candidates, omp_schedules,
+                                 prefetchlang, prefetch_distance, vectorlang,
+                                 simdinfo, get_cache_size, get_simd_flag,
+                                 get_simd_items)
 from devito.dse import promote_scalar_expressions
 from devito.exceptions import DLEException
-from devito.ir.iet import (Block, Expression, Iteration, List,
-                           PARALLEL, ELEMENTAL, REMAINDER, tagger,
+from devito.function import Constant
+from devito.ir.iet import (Block, Element, Expression, Increment, Iteration, List,
+                           PARALLEL, SEQUENTIAL, ELEMENTAL, REMAINDER, SKEWED,
+                           tagger, FindNodes,
                            FindSymbols, IsPerfectIteration, Transformer,
                            compose_nodes, retrieve_iteration_tree, filter_iterations)
+from devito.ir.support.basic import split_offset
 from devito.logger import dle_warning
-from devito.tools import as_tuple, grouper
+from devito.symbolics import q_inc, retrieve_indexed, xreplace_zeros
+from devito.tools import as_tuple, flatten, grouper, is_integer
+from devito.types import Scalar
 
 
 class DevitoRewriter(BasicRewriter):
@@ -29,12 +40,20 @@ class DevitoRewriter(BasicRewriter):
     def _pipeline(self, state):
         self._avoid_denormals(state)
         self._loop_fission(state)
+        if self.params['wavefront'] is True:
+            self._loop_wavefront(state)
         self._loop_blocking(state)
         self._simdize(state)
         if self.params['openmp'] is True:
             self._ompize(state)
         self._create_elemental_functions(state)
         self._minimize_remainders(state)
+        if self.params['regions']:
+            self._specialize_regions(state)
+        if self.params['unroll'] is not None:
+            self._loop_unroll_jam(state)
+        if self.params['simd'] == 'explicit':
+            self._vectorize(state)
 
     @dle_pass
     def _loop_fission(self, nodes, state):
@@ -116,17 +135,30 @@ class DevitoRewriter(BasicRewriter):
         two outer loops will blocked, and the resulting 2-dimensional block will
         have size 4x7. The latter may be set to True to also block innermost parallel
         :class:`Iteration` objects.
+
+        If no ``blockshape`` is provided, square blocks are used, whose size is
+        chosen so that the working set of a block fits in the L2 cache (see
+        :func:`blockshape_heuristic`).
         """
         exclude_innermost = not self.params.get('blockinner', False)
         ignore_heuristic = self.params.get('blockalways', False)
+        blockshape = self.params.get('blockshape')
+
+        # Only half of the L2 cache is targeted, to leave room for the data
+        # brought in by the hardware prefetchers and to mitigate conflict misses
+        cache_size = get_cache_size(2) // 2
 
         # Make sure loop blocking will span as many Iterations as possible
         fold = fold_blockable_tree(nodes, exclude_innermost)
 
         mapper = {}
         blocked = OrderedDict()
+        heuristics = {}
         for tree in retrieve_iteration_tree(fold):
             # Is the Iteration tree blockable ?
+            if any(i.is_Skewed for i in tree):
+                # Already tiled by wavefront blocking
+                continue
             iterations = [i for i in tree if i.is_Parallel]
             if exclude_innermost:
                 iterations = [i for i in iterations if not i.is_Vectorizable]
@@ -143,6 +175,11 @@ class DevitoRewriter(BasicRewriter):
                 # sequential loop (e.g., a timestepping loop)
                 continue
 
+            # Estimate a suitable block size before the tree gets transformed
+            if not blockshape:
+                heuristic = blockshape_heuristic(iterations, cache_size)
+                heuristics.update({i: heuristic for i in iterations})
+
             # Decorate intra-block iterations with an IterationProperty
             TAG = tagger(len(mapper))
 
@@ -214,13 +251,8 @@ class DevitoRewriter(BasicRewriter):
             return processed, {}
 
         # Determine the block shape
-        blockshape = self.params.get('blockshape')
         if not blockshape:
-            # Use trivial heuristic for a suitable blockshape
-            def heuristic(dim_size):
-                ths = 8  # FIXME: This really needs to be improved
-                return ths if dim_size > ths else 1
-            blockshape = {k: heuristic for k in blocked.keys()}
+            blockshape = {k: heuristics[k] for k in blocked.keys()}
         else:
             try:
                 nitems, nrequired = len(blockshape), len(blocked)
@@ -241,6 +273,111 @@ class DevitoRewriter(BasicRewriter):
 
         return processed, {'arguments': arguments, 'flags': 'blocking'}
 
+    @dle_pass
+    def _loop_wavefront(self, nodes, state):
+        """
+        Apply wavefront temporal blocking to time-stepping :class:`Iteration`s.
+
+        Consecutive timesteps are grouped into time tiles. Within a time tile,
+        the outermost space Iteration is tiled too, and the resulting tiles are
+        swept in a wavefront fashion, shifted by ``s`` points per timestep: ::
+
+            for time
+              for x
+                for y
+                  u[t1,x,y] = f(u[t0,x-1,y], u[t0,x+1,y], ...)
+
+        becomes: ::
+
+            for time_tile = time_start to time_end, step T
+              for x_tile = x_start to x_end + s*(T-1), step X
+                for time = time_tile to min(time_tile + T, time_end)
+                  for x = max(x_tile - s*(time - time_tile), x_start) to
+                          min(x_tile + X - s*(time - time_tile), x_end)
+                    for y
+                      u[t1,x,y] = f(u[t0,x-1,y], u[t0,x+1,y], ...)
+
+        so that the data produced in a timestep are reused by the subsequent
+        timesteps while still in cache. The skew ``s`` is the smallest one
+        preserving the dependence distances computed by :class:`Scope`, also
+        taking into account the reuse of the modulo buffer slots (see
+        :func:`wavefront_skew`).
+
+        Only time loops embedding a single loop nest are transformed; in
+        particular, sparse point injection and interpolation, which access
+        arbitrary grid points at every timestep, prevent wavefront blocking.
+        The tile sizes are runtime arguments, and may thus be autotuned.
+        """
+        mapper = {}
+        arguments = []
+        seen = set()
+        for tree in retrieve_iteration_tree(nodes):
+            time = tree[0]
+            if time in seen or not time.dim.is_Time or not time.is_Sequential:
+                continue
+            seen.add(time)
+            if time.reverse:
+                dle_warning("Couldn't apply wavefront blocking to `%s`: backward "
+                            "time-stepping is unsupported" % time.index)
+                continue
+
+            # Is the time loop embedding a single parallel loop nest ?
+            trees = retrieve_iteration_tree(time)
+            roots = set(i[1] if len(i) > 1 else None for i in trees)
+            if len(roots) != 1 or None in roots or\
+                    len(FindNodes(Expression).visit(time)) !=\
+                    len(FindNodes(Expression).visit(tree[1])):
+                dle_warning("Couldn't apply wavefront blocking to `%s`: it embeds "
+                            "more than one loop nest (e.g., sparse point injection "
+                            "or interpolation)" % time.index)
+                continue
+            root = tree[1]
+            if not root.is_Parallel or root.is_Vectorizable:
+                # Heuristically avoided
+                continue
+
+            skew = wavefront_skew(time, root)
+            if skew is None:
+                dle_warning("Couldn't apply wavefront blocking to `%s`: unable to "
+                            "determine the dependence distances" % time.index)
+                continue
+
+            name = '%s%d_tile'
+            tdim = Dimension(name=name % (time.dim.name, len(mapper)))
+            xdim = Dimension(name=name % (root.dim.name, len(mapper)))
+            tstart, tend = time.bounds_symbolic
+            xstart, xend = root.bounds_symbolic
+            tsize, xsize = tdim.symbolic_size, xdim.symbolic_size
+
+            # The Iterations over time tiles and, within a time tile, over the
+            # (skewed) space tiles
+            ttile = Iteration([], tdim, [tstart, tend, tsize], properties=SEQUENTIAL)
+            xtile = Iteration([], xdim, [xstart, xend + skew*(tsize - 1), xsize],
+                              properties=SEQUENTIAL)
+
+            # The Iterations within a tile
+            shift = skew*(time.dim - tdim)
+            skewed = root._rebuild(limits=[Max(xdim - shift, xstart),
+                                           Min(xdim + xsize - shift, xend), 1],
+                                   offsets=None, properties=root.properties + (SKEWED,))
+            body = Transformer({root: skewed}).visit(time.nodes)
+            inner = time._rebuild(body, limits=[tdim, Min(tdim + tsize, tend), 1],
+                                  offsets=None)
+
+            mapper[time] = compose_nodes([ttile, xtile, inner])
+
+            # Track the tile sizes as additional arguments
+            heuristics = wavefront_heuristic(root, skew, get_cache_size(3) // 2)
+            arguments.extend([BlockingArg(tdim, time, heuristics[0]),
+                              BlockingArg(xdim, root, heuristics[1])])
+
+        if not mapper:
+            return nodes, {}
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {'arguments': arguments, 'flags': 'wavefront'}
+
     @dle_pass
     def _simdize(self, nodes, state):
         """
@@ -274,8 +411,32 @@ class DevitoRewriter(BasicRewriter):
     @dle_pass
     def _ompize(self, nodes, state):
         """
-        Add OpenMP pragmas to the Iteration/Expression tree to emit parallel code
+        Add OpenMP pragmas to the Iteration/Expression tree to emit parallel code.
+
+        The scheduling policy, the chunk size, the collapse depth and the number
+        of threads are drawn from the DLE options. The chunk size and the number
+        of threads become runtime arguments of the generated code, which may
+        therefore be autotuned.
         """
+        schedule = self.params['schedule']
+        if schedule not in omp_schedules:
+            dle_warning("Unknown OpenMP schedule `%s`, using `static`" % schedule)
+            schedule = 'static'
+
+        arguments = []
+        chunk = self.params['chunk']
+        if chunk is not None or schedule != 'static':
+            chunk = Constant(name='chunk_size', dtype=np.int32, value=int(chunk or 1))
+            candidates = sorted({chunk.data} | set(omp_chunk_candidates))
+            arguments.append(ParallelArg(chunk, candidates))
+            schedule = '%s,%s' % (schedule, chunk.name)
+        nthreads = self.params['nthreads']
+        if nthreads is not None:
+            nthreads = Constant(name='nthreads', dtype=np.int32, value=int(nthreads))
+            candidates = sorted({nthreads.data >> i
+                                 for i in range(nthreads.data.bit_length())})
+            arguments.append(ParallelArg(nthreads, candidates))
+
         # Group by outer loop so that we can embed within the same parallel region
         was_tagged = False
         groups = OrderedDict()
@@ -284,6 +445,13 @@ class DevitoRewriter(BasicRewriter):
             key = lambda i: i.is_Parallel and\
                 not (i.is_Elementizable or i.is_Vectorizable)
             candidates = filter_iterations(tree, key=key, stop='asap')
+            # Resort to atomic updates, if it makes an outer Iteration parallel
+            key = lambda i: i.is_ParallelAtomic and\
+                not (i.is_Elementizable or i.is_Vectorizable)
+            atomic = filter_iterations(tree, key=key, stop='any')
+            if atomic and (not candidates or
+                           tree.index(atomic[0]) < tree.index(candidates[0])):
+                candidates = atomic[:1]
             if not candidates:
                 was_tagged = False
                 continue
@@ -303,13 +471,31 @@ class DevitoRewriter(BasicRewriter):
                 # physical core count is greater than self.thresholds['collapse'],
                 # then omp-collapse the loops
                 nparallel = len(tree)
-                if psutil.cpu_count(logical=False) < self.thresholds['collapse'] or\
-                        nparallel < 2:
-                    parallel = omplang['for']
+                ncollapse = self.params['collapse']
+                if ncollapse is None:
+                    if psutil.cpu_count(logical=False) < self.thresholds['collapse']:
+                        ncollapse = 1
+                    else:
+                        ncollapse = nparallel
+                ncollapse = max(min(ncollapse, nparallel), 1)
+                if ncollapse == 1:
+                    parallel = omplang['for'](schedule)
+                else:
+                    parallel = omplang['collapse'](ncollapse, schedule)
+
+                if root.is_ParallelAtomic:
+                    # Increments, such as those performed by sparse point injection,
+                    # may hit the same grid point from different threads
+                    increments = [i for i in FindNodes(Expression).visit(root)
+                                  if q_inc(i.expr) and i.expr.lhs in i.expr.rhs.args]
+                    atomics = {i: List(header=omplang['atomic'],
+                                       body=Increment(i.expr, i.dtype))
+                               for i in increments}
+                    body = Transformer(atomics).visit(root.nodes)
                 else:
-                    parallel = omplang['collapse'](nparallel)
+                    body = root.nodes
 
-                mapper[root] = root._rebuild(pragmas=root.pragmas + (parallel,))
+                mapper[root] = root._rebuild(body, pragmas=root.pragmas + (parallel,))
 
                 # Track the thread-private and thread-shared variables
                 private.extend([i for i in FindSymbols('symbolics').visit(root)
@@ -318,15 +504,21 @@ class DevitoRewriter(BasicRewriter):
             # Build the parallel region
             private = sorted(set([i.name for i in private]))
             private = ('private(%s)' % ','.join(private)) if private else ''
+            if nthreads is not None:
+                private = ' '.join([private, 'num_threads(%s)' % nthreads.name])
             rebuilt = [v for k, v in mapper.items() if k in group]
-            par_region = Block(header=omplang['par-region'](private), body=rebuilt)
+            par_region = Block(header=omplang['par-region'](private.strip()),
+                               body=rebuilt)
             for k, v in list(mapper.items()):
                 if isinstance(v, Iteration):
                     mapper[k] = None if v.is_Remainder else par_region
 
+        if not mapper:
+            return nodes, {}
+
         processed = Transformer(mapper).visit(nodes)
 
-        return processed, {}
+        return processed, {'arguments': arguments, 'flags': 'openmp'}
 
     @dle_pass
     def _minimize_remainders(self, nodes, state):
@@ -392,6 +584,273 @@ class DevitoRewriter(BasicRewriter):
 
         return processed, {}
 
+    @dle_pass
+    def _specialize_regions(self, nodes, state):
+        """
+        Specialize the :class:`Iteration` nests reading a :class:`Function` known
+        to be zero everywhere but in a boundary layer, whose width is given in
+        ``self.params['regions']``. A nest is split into an interior nest, in
+        which the Function is dropped, and a pair of boundary nests for each of
+        the Function's dimensions, in which it is left untouched. For example,
+        with absorbing boundary conditions, the interior nest neither reads the
+        damping field nor performs the arithmetic it is involved in.
+
+        Only perfect, parallel nests whose innermost Iteration consists of
+        Expressions only are transformed. As the Iteration bounds are rewritten,
+        this pass must follow loop blocking.
+        """
+        regions = self.params['regions']
+        if not isinstance(regions, dict):
+            dle_warning("Illegal regions `%s`, must be a dictionary" % regions)
+            return nodes, {}
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            exprs = tree[-1].nodes
+            if not all(i.is_Expression for i in exprs):
+                continue
+            for f, width in regions.items():
+                dims = [i.name for i in f.indices]
+                widths = width if isinstance(width, tuple) else (width,)*len(dims)
+                if len(widths) != len(dims) or not all(is_integer(i) for i in widths):
+                    dle_warning("Illegal width `%s` for `%s`" % (width, f.name))
+                    continue
+                iterations = [i for i in tree if i.dim.name in dims]
+                if len(iterations) != len(dims):
+                    continue
+                nest = tree[tree.index(iterations[0]):]
+                if any(i.nodes != (j,) for i, j in zip(nest, nest[1:])):
+                    # Not a perfect nest
+                    continue
+                if any(i.uindices or i.limits[2] != 1 for i in nest) or\
+                        not all(i.is_Parallel for i in iterations):
+                    continue
+
+                # The interior region along each dimension, that is where all
+                # of the reads of /f/ fall in [width, size - width)
+                reads = [i for i in flatten(retrieve_indexed(e.expr) for e in exprs)
+                         if i.base.function.name == f.name]
+                if not reads:
+                    continue
+                bases, offsets = zip(*[zip(*[split_offset(j) for j in i.indices])
+                                       for i in reads])
+                if any([str(j) for j in b] != dims for b in bases):
+                    # /f/ is not accessed along its own dimensions
+                    continue
+                bounds = {}
+                for d, w, o in zip(f.indices, widths, zip(*offsets)):
+                    start, finish = iterations[dims.index(d.name)].bounds_symbolic
+                    lower = Min(Max(start, w - min(o)), finish)
+                    upper = Max(Min(finish, d.symbolic_size - w - max(o)), lower)
+                    bounds[d.name] = (start, lower, upper, finish)
+
+                # The interior nest, in which /f/ is dropped, and, for each
+                # dimension, the nests before and after the interior region
+                interior = {k: v[1:3] for k, v in bounds.items()}
+                before, after = [], []
+                for n, i in enumerate(iterations):
+                    handle = {j.dim.name: interior[j.dim.name] for j in iterations[:n]}
+                    before.append(dict(handle, **{i.dim.name: bounds[i.dim.name][:2]}))
+                    after.insert(0, dict(handle, **{i.dim.name: bounds[i.dim.name][2:]}))
+                processed = []
+                for region in before + [interior] + after:
+                    if region is interior:
+                        body = [e._rebuild(expr=xreplace_zeros(e.expr, reads))
+                                for e in exprs]
+                    else:
+                        body = exprs
+                    for i in reversed(nest):
+                        if i.dim.name in region:
+                            body = i._rebuild(body, limits=region[i.dim.name] + (1,),
+                                              offsets=None)
+                        else:
+                            body = i._rebuild(body)
+                    processed.append(body)
+
+                mapper[nest[0]] = List(body=processed)
+                break
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {}
+
+    @dle_pass
+    def _loop_unroll_jam(self, nodes, state):
+        """
+        Unroll the second-innermost :class:`Iteration` of each Iteration tree by
+        a factor ``self.params['unroll']``, and jam the unrolled bodies into the
+        innermost Iteration. This way, the loads of neighbouring stencil points
+        along the unrolled dimension may be reused in registers. A unitary-step
+        Iteration takes care of the points left over by the unrolled Iteration.
+
+        Only perfect, parallel nests whose innermost Iteration consists of
+        Expressions only are transformed. Iterations collapsed into an enclosing
+        OpenMP loop are left untouched.
+        """
+        factor = self.params['unroll']
+        if not is_integer(factor) or factor < 1:
+            dle_warning("Illegal unroll factor `%s`, must be a positive integer"
+                        % factor)
+            return nodes, {}
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            if len(tree) < 2 or factor == 1:
+                continue
+            outer, inner = tree[-2:]
+            if not outer.is_Parallel or outer.uindices or outer.limits[2] != 1:
+                continue
+            if outer.nodes != (inner,) or inner.uindices or\
+                    not all(i.is_Expression for i in inner.nodes):
+                # Not a perfect nest
+                continue
+            if outer.dim.name in [i.name for i in
+                                  flatten(j.free_symbols for j in inner.bounds_symbolic)]:
+                # Non-rectangular nest
+                continue
+            if any(not i.is_scalar and outer.dim not in i.output.free_symbols
+                   for i in inner.nodes):
+                # A tensor not indexed by /outer/ would be written by all of the
+                # jammed bodies
+                continue
+            collapsed = [tree.index(i) + int(n) for i in tree[:-2] for j in i.pragmas
+                         for n in re.findall(r'collapse\((\d+)\)', str(j.value))]
+            if any(i > len(tree) - 2 for i in collapsed):
+                continue
+
+            # Build the jammed bodies; scalar temporaries are renamed to avoid
+            # clashing declarations
+            jammed = list(inner.nodes)
+            for n in range(1, factor):
+                subs = {outer.dim: outer.dim + n}
+                subs.update({i.output: Scalar(name='%s_%d' % (i.output.name, n),
+                                              dtype=i.output.dtype)
+                             for i in inner.nodes if i.is_scalar})
+                jammed.extend([i._rebuild(expr=i.expr.xreplace(subs))
+                               for i in inner.nodes])
+
+            # Build the unrolled Iteration and the unitary-step Iteration over
+            # the leftover points
+            start, finish = outer.bounds_symbolic
+            split = finish - (finish - start) % factor
+            unrolled = outer._rebuild(inner._rebuild(jammed),
+                                      limits=[start, split, factor], offsets=None)
+            remainder = outer._rebuild(limits=[split, finish, 1], offsets=None)
+
+            mapper[outer] = List(body=[unrolled, remainder])
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {}
+
+
+    @dle_pass
+    def _vectorize(self, nodes, state):
+        """
+        Turn the innermost vectorizable :class:`Iteration`s into explicit SIMD
+        code, through the vector extensions of GNU-compatible compilers, so that
+        vectorization does not depend on the compiler honouring SIMD pragmas.
+        The accesses along the vectorized dimension are loaded and stored
+        unaligned, while the loop-invariant values are broadcast. A unitary-step
+        Iteration, peeled off the vectorized Iteration, takes care of the points
+        left over.
+
+        Only Iterations consisting of Expressions built out of additions,
+        multiplications and divisions, with unit-stride accesses along the
+        vectorized dimension, are transformed.
+        """
+        def is_vectorizable(expr):
+            if expr.is_Indexed or expr.is_Number:
+                return True
+            elif expr.is_Symbol:
+                dtype = getattr(expr, 'dtype', None)
+                return dtype is not None and np.issubdtype(dtype, np.floating)
+            elif expr.is_Add or expr.is_Mul:
+                return all(is_vectorizable(i) for i in expr.args)
+            elif expr.is_Pow:
+                return expr.exp == -1 and is_vectorizable(expr.base)
+            else:
+                return False
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            root = tree[-1]
+            if not root.is_Vectorizable or root.uindices or root.limits[2] != 1:
+                continue
+            exprs = root.nodes
+            if not all(i.is_Expression and not isinstance(i, Increment) for i in exprs):
+                continue
+            if not all(is_vectorizable(i.expr.rhs) for i in exprs):
+                continue
+
+            # The accesses along the vectorized dimension must be unit-stride
+            accesses = set()
+            for i in flatten(retrieve_indexed(e.expr) for e in exprs):
+                found = [n for n, j in enumerate(i.indices)
+                         if root.dim.name in [k.name for k in j.free_symbols]]
+                if not found:
+                    continue
+                elif found != [len(i.indices) - 1] or\
+                        str(split_offset(i.indices[-1])[0]) != root.dim.name:
+                    break
+                accesses.add(i)
+            else:
+                dtypes = set(i.base.function.dtype for i in accesses)
+                if len(dtypes) != 1:
+                    continue
+            if not accesses or len(dtypes) != 1:
+                continue
+
+            # The scalar temporaries depending on the vectorized dimension become
+            # vectors, while the tensors written must be accessed along it
+            vectors = set()
+            outputs = set(e.output for e in exprs if e.is_scalar)
+            defined = set()
+            for e in exprs:
+                reads = retrieve_terminals(e.expr.rhs)
+                if any(i in outputs and i not in defined for i in reads):
+                    # Loop-carried scalar
+                    break
+                defined.add(e.output)
+                varying = any(i in accesses or i in vectors for i in reads)
+                if e.is_scalar:
+                    if varying:
+                        vectors.add(e.output)
+                elif not varying or e.output not in accesses:
+                    break
+            else:
+                dtype = dtypes.pop()
+                try:
+                    items = get_simd_items(dtype)
+                except KeyError:
+                    continue
+                ctype = cgen.dtype_to_ctype(dtype)
+                vtype = 'v%d%s' % (items, ctype)
+                subs = {i: Symbol(vectorlang['access'](vtype, ccode(i))) for i in accesses}
+
+                body = []
+                for e in exprs:
+                    lhs = ccode(e.expr.lhs.xreplace(subs))
+                    rhs = ccode(e.expr.rhs.xreplace(subs))
+                    if e.is_tensor:
+                        body.append(Element(cgen.Assign(lhs, rhs)))
+                    else:
+                        value = cgen.Value(vtype if e.output in vectors else ctype, lhs)
+                        body.append(Element(cgen.Initializer(value, rhs)))
+
+                start, finish = root.bounds_symbolic
+                split = finish - (finish - start) % items
+                vector = root._rebuild(body, limits=[start, split, items],
+                                       offsets=None, pragmas=None)
+                remainder = root._rebuild(limits=[split, finish, 1], offsets=None)
+
+                size = np.dtype(dtype).itemsize
+                typedef = vectorlang['typedef'](ctype, vtype, items*size, size)
+                mapper[root] = Block(body=[Element(typedef), vector, remainder])
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {}
 
 class DevitoRewriterSafeMath(DevitoRewriter):
 
@@ -402,12 +861,20 @@ class DevitoRewriterSafeMath(DevitoRewriter):
     """
 
     def _pipeline(self, state):
+        if self.params['wavefront'] is True:
+            self._loop_wavefront(state)
         self._loop_blocking(state)
         self._simdize(state)
         if self.params['openmp'] is True:
             self._ompize(state)
         self._create_elemental_functions(state)
         self._minimize_remainders(state)
+        if self.params['regions']:
+            self._specialize_regions(state)
+        if self.params['unroll'] is not None:
+            self._loop_unroll_jam(state)
+        if self.params['simd'] == 'explicit':
+            self._vectorize(state)
 
 
 class DevitoSpeculativeRewriter(DevitoRewriter):
@@ -415,6 +882,8 @@ class DevitoSpeculativeRewriter(DevitoRewriter):
     def _pipeline(self, state):
         self._avoid_denormals(state)
         self._loop_fission(state)
+        if self.params['wavefront'] is True:
+            self._loop_wavefront(state)
         self._loop_blocking(state)
         self._simdize(state)
         self._nontemporal_stores(state)
@@ -422,6 +891,14 @@ class DevitoSpeculativeRewriter(DevitoRewriter):
             self._ompize(state)
         self._create_elemental_functions(state)
         self._minimize_remainders(state)
+        if self.params['regions']:
+            self._specialize_regions(state)
+        if self.params['unroll'] is not None:
+            self._loop_unroll_jam(state)
+        if self.params['prefetch'] is not False:
+            self._prefetch(state)
+        if self.params['simd'] == 'explicit':
+            self._vectorize(state)
 
     @dle_pass
     def _nontemporal_stores(self, nodes, state):
@@ -432,7 +909,7 @@ class DevitoSpeculativeRewriter(DevitoRewriter):
         pragma = self._compiler_decoration('ntstores')
         fence = self._compiler_decoration('storefence')
         if not pragma or not fence:
-            return {}
+            return nodes, {}
 
         mapper = {}
         for tree in retrieve_iteration_tree(nodes):
@@ -451,16 +928,85 @@ class DevitoSpeculativeRewriter(DevitoRewriter):
 
         return processed, {'flags': 'ntstores'}
 
+    @dle_pass
+    def _prefetch(self, nodes, state):
+        """
+        Add software prefetching to the innermost blocked loop nests. At each
+        iteration of the second-innermost Iteration, the beginning of the rows
+        ``self.params['prefetch']`` points ahead of the leading rows read from
+        each :class:`TensorFunction` is prefetched. As a block only sweeps short
+        segments of the rows, hardware prefetchers would otherwise pick up each
+        stream too late, if at all.
+        """
+        distance = self.params['prefetch']
+        if distance is False:
+            return nodes, {}
+        elif distance is None or distance is True:
+            distance = prefetch_distance
+        if not is_integer(distance) or distance < 0:
+            dle_warning("Illegal prefetch distance `%s`, must be a non-negative "
+                        "integer" % distance)
+            return nodes, {}
+
+        mapper = {}
+        for tree in retrieve_iteration_tree(nodes):
+            if len(tree) < 2:
+                continue
+            outer, inner = tree[-2:]
+            if outer.tag is None or not inner.is_Vectorizable:
+                # Not a blocked nest
+                continue
+            step = outer.limits[2] if is_integer(outer.limits[2]) else 1
+            start = inner.bounds_symbolic[0]
+
+            # Determine the leading row of each stream along /outer/
+            leading = OrderedDict()
+            exprs = FindNodes(Expression).visit(inner)
+            for i in flatten(retrieve_indexed(e.expr.rhs) for e in exprs):
+                if not i.base.function.is_TensorFunction:
+                    continue
+                bases, offsets = zip(*[split_offset(j) for j in i.indices])
+                if outer.dim not in bases:
+                    continue
+                position = bases.index(outer.dim)
+                key = (i.base, bases, tuple(v for k, v in zip(bases, offsets)
+                                            if k not in (outer.dim, inner.dim)))
+                handle = leading.setdefault(key, i)
+                if offsets[position] > split_offset(handle.indices[position])[1]:
+                    leading[key] = i
+
+            # Prefetch, for each stream, the rows that will soon be needed
+            prefetches = []
+            for (base, bases, _), i in leading.items():
+                position = bases.index(outer.dim)
+                for n in range(step):
+                    indices = list(i.indices)
+                    indices[position] += distance + n
+                    if inner.dim in bases:
+                        indices[bases.index(inner.dim)] = start
+                    prefetches.append(prefetchlang(ccode(base[indices])))
+            if prefetches:
+                mapper[inner] = List(header=prefetches, body=inner)
+
+        processed = Transformer(mapper).visit(nodes)
+
+        return processed, {'flags': 'prefetch'} if mapper else {}
+
 
 class DevitoCustomRewriter(DevitoSpeculativeRewriter):
 
     passes_mapper = {
         'denormals': DevitoSpeculativeRewriter._avoid_denormals,
         'blocking': DevitoSpeculativeRewriter._loop_blocking,
+        'wavefront': DevitoSpeculativeRewriter._loop_wavefront,
         'openmp': DevitoSpeculativeRewriter._ompize,
         'simd': DevitoSpeculativeRewriter._simdize,
         'fission': DevitoSpeculativeRewriter._loop_fission,
-        'split': DevitoSpeculativeRewriter._create_elemental_functions
+        'split': DevitoSpeculativeRewriter._create_elemental_functions,
+        'unroll': DevitoSpeculativeRewriter._loop_unroll_jam,
+        'prefetch': DevitoSpeculativeRewriter._prefetch,
+        'regions': DevitoSpeculativeRewriter._specialize_regions,
+        'vectorize': DevitoSpeculativeRewriter._vectorize
     }
 
     def __init__(self, nodes, passes, params):
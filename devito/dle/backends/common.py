@@ -6,7 +6,7 @@ from devito.logger import dle
 from devito.tools import as_tuple
 
 
-__all__ = ['AbstractRewriter', 'Arg', 'BlockingArg', 'State', 'dle_pass']
+__all__ = ['AbstractRewriter', 'Arg', 'BlockingArg', 'ParallelArg', 'State', 'dle_pass']
 
 
 def dle_pass(func):
@@ -82,6 +82,23 @@ class BlockingArg(Arg):
         return self.iteration.dim
 
 
+class ParallelArg(Arg):
+
+    def __init__(self, argument, candidates):
+        """
+        Represent an argument introduced in the kernel by Rewriter._ompize.
+
+        :param argument: The :class:`Constant` carrying the runtime value of
+                         an OpenMP parameter, such as the number of threads.
+        :param candidates: The values of ``argument`` attempted by the autotuner.
+        """
+        super(ParallelArg, self).__init__(argument, argument.data)
+        self.candidates = candidates
+
+    def __repr__(self):
+        return "DLE-ParallelArg[%s,suggested=%s]" % (self.argument, self.value)
+
+
 class AbstractRewriter(object):
     """
     Transform Iteration/Expression trees to generate high performance C.
@@ -1,3 +1,6 @@
+import os
+from glob import glob
+
 import cpuinfo
 import numpy as np
 
@@ -7,12 +10,38 @@ import cgen as c
 A dictionary to quickly access standard OpenMP pragmas
 """
 omplang = {
-    'for': c.Pragma('omp for schedule(static)'),
-    'collapse': lambda i: c.Pragma('omp for collapse(%d) schedule(static)' % i),
+    'for': lambda i: c.Pragma('omp for schedule(%s)' % i),
+    'collapse': lambda i, j: c.Pragma('omp for collapse(%d) schedule(%s)' % (i, j)),
     'par-region': lambda i: c.Pragma('omp parallel %s' % i),
     'par-for': c.Pragma('omp parallel for schedule(static)'),
     'simd-for': c.Pragma('omp simd'),
-    'simd-for-aligned': lambda i, j: c.Pragma('omp simd aligned(%s:%d)' % (i, j))
+    'simd-for-aligned': lambda i, j: c.Pragma('omp simd aligned(%s:%d)' % (i, j)),
+    'atomic': c.Pragma('omp atomic update')
+}
+
+"""
+The OpenMP loop scheduling policies
+"""
+omp_schedules = ('static', 'dynamic', 'guided')
+omp_chunk_candidates = (1, 2, 4, 8, 16, 32, 64)
+
+"""
+Software prefetching (supported by all GNU-compatible compilers), with the
+default prefetch distance in number of rows
+"""
+prefetchlang = lambda i: c.Statement('__builtin_prefetch(&%s, 0, 3)' % i)
+prefetch_distance = 1
+
+"""
+Explicit SIMD code through the vector extensions of GNU-compatible compilers.
+Vector types are only aligned to their items, so that the accesses shifted along
+the vectorized dimension are loaded and stored unaligned
+"""
+vectorlang = {
+    'typedef': lambda i, j, k, l: c.Statement(
+        'typedef %s %s __attribute__((vector_size(%d), aligned(%d), may_alias))'
+        % (i, j, k, l)),
+    'access': lambda i, j: '(*(%s*)&%s)' % (i, j)
 }
 
 """
@@ -36,6 +65,15 @@ simdinfo = {
     'avx512f': 64
 }
 
+"""
+Cache hierarchy info
+"""
+sysfs_cache_path = '/sys/devices/system/cpu/cpu0/cache/index*'
+default_cache_size = {
+    # Sizes in bytes, used when the cache hierarchy cannot be inspected
+    1: 32*1024, 2: 256*1024, 3: 8*1024**2
+}
+
 
 def get_simd_flag():
     """Retrieve the best SIMD flag on the current architecture."""
@@ -61,3 +99,47 @@ def get_simd_items(dtype):
     simd_size = simdinfo[get_simd_flag()]
     assert simd_size % np.dtype(dtype).itemsize == 0
     return int(simd_size / np.dtype(dtype).itemsize)
+
+
+def get_cache_size(level=2):
+    """Retrieve the size, in bytes, of the data (or unified) cache at level
+    ``level`` of the current architecture. The size is first looked up in
+    sysfs, then through cpuinfo; if both fail, a conservative default is
+    returned."""
+    if level not in get_cache_size.sizes:
+        size = None
+        for i in sorted(glob(sysfs_cache_path)):
+            try:
+                with open(os.path.join(i, 'level')) as f:
+                    found = int(f.read())
+                with open(os.path.join(i, 'type')) as f:
+                    kind = f.read().strip()
+                with open(os.path.join(i, 'size')) as f:
+                    value = f.read().strip()
+            except (IOError, OSError, ValueError):
+                continue
+            if found == level and kind in ('Data', 'Unified'):
+                size = parse_size(value)
+                break
+        if size is None:
+            key = 'l1_data_cache_size' if level == 1 else 'l%d_cache_size' % level
+            size = parse_size(cpuinfo.get_cpu_info().get(key))
+        if size is None:
+            size = default_cache_size.get(level)
+        # "Cached" because calls to cpuinfo are expensive
+        get_cache_size.sizes[level] = size
+    return get_cache_size.sizes[level]
+get_cache_size.sizes = {}  # noqa
+
+
+def parse_size(value):
+    """Convert a cache size, such as ``'2048K'`` or ``'256 KB'``, into bytes.
+    Return None if ``value`` cannot be parsed."""
+    if isinstance(value, int):
+        return value
+    try:
+        value = value.strip().upper().rstrip('B').rstrip('I').strip()
+        multiplier = {'K': 1024, 'M': 1024**2, 'G': 1024**3}.get(value[-1:], 1)
+        return int(float(value.rstrip('KMG').strip()) * multiplier)
+    except (AttributeError, ValueError):
+        return None
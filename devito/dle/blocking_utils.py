@@ -1,15 +1,27 @@
+from collections import OrderedDict
+
 import cgen as c
+import numpy as np
 from sympy import Symbol
 
 from devito.cgen_utils import ccode
 from devito.ir.iet import (Expression, Iteration, List, UnboundedIndex, ntags,
-                           FindAdjacentIterations, FindNodes, IsPerfectIteration,
-                           NestedTransformer, Transformer, compose_nodes,
-                           is_foldable, retrieve_iteration_tree)
-from devito.symbolics import as_symbol, xreplace_indices
-from devito.tools import as_tuple
+                           FindAdjacentIterations, FindNodes, FindSymbols,
+                           IsPerfectIteration, NestedTransformer, Transformer,
+                           compose_nodes, is_foldable, retrieve_iteration_tree)
+from devito.ir.support.basic import Scope, split_offset
+from devito.symbolics import as_symbol, retrieve_indexed, xreplace_indices
+from devito.tools import as_tuple, flatten, is_integer
+
+__all__ = ['fold_blockable_tree', 'unfold_blocked_tree', 'blockshape_heuristic',
+           'wavefront_skew', 'wavefront_heuristic']
+
+
+blocksize_candidates = (8, 16, 24, 32, 40, 48, 64, 96, 128)
+"""The block sizes among which :func:`blockshape_heuristic` selects."""
 
-__all__ = ['fold_blockable_tree', 'unfold_blocked_tree']
+wavefront_timesteps = 4
+"""The number of timesteps in a time tile used by :func:`wavefront_heuristic`."""
 
 
 def fold_blockable_tree(node, exclude_innermost=False):
@@ -108,6 +120,169 @@ def unfold_blocked_tree(node):
     return processed
 
 
+def blockshape_heuristic(iterations, cache_size):
+    """
+    Return a function which, given the size of a blocked :class:`Dimension`,
+    returns a block size for the blockable :class:`Iteration`s ``iterations``.
+
+    The block size is the largest in ``blocksize_candidates`` such that the
+    working set of a square block fits in ``cache_size`` bytes. The working
+    set is estimated from the :class:`Expression`s within ``iterations``.
+    Each stream, that is each :class:`Function` or :class:`Array` accessed at
+    a given set of non-iterated indices (e.g., a time slot), contributes: ::
+
+        * along the outermost blocked Dimension, as many planes as the width
+          of the stencil, since these are the only ones reused while sweeping
+          through a block;
+        * along the other blocked Dimensions, the block size plus the halo
+          induced by the stencil radius;
+        * along the non-blocked Dimensions, the domain extent plus the halo.
+
+    These are multiplied by the size of the stream's dtype.
+    """
+    root = iterations[-1]
+    exprs = FindNodes(Expression).visit(root)
+    if root.is_IterationFold:
+        exprs.extend(flatten(FindNodes(Expression).visit(i) for _, i in root.folds))
+
+    blocked = [i.dim for i in iterations]
+    inner = [i.dim for i in flatten(retrieve_iteration_tree(root))
+             if i.dim not in blocked]
+
+    # Compute the stencil radius of each stream along each Dimension
+    streams = OrderedDict()
+    for e in exprs:
+        for i in retrieve_indexed(e.expr):
+            radius = {}
+            others = []
+            for index in i.indices:
+                base, offset = split_offset(index)
+                if base in blocked or base in inner:
+                    radius[base] = max(radius.get(base, 0), abs(offset))
+                else:
+                    others.append(index)
+            handle = streams.setdefault((i.base.function, tuple(others)), {})
+            for k, v in radius.items():
+                handle[k] = max(handle.get(k, 0), v)
+
+    # Determine the extent of the non-blocked Dimensions from the data shapes
+    extents = {}
+    for f, _ in streams:
+        for d, size in zip(f.indices, f.shape):
+            if d in inner and is_integer(size):
+                extents[d] = max(extents.get(d, 0), int(size))
+
+    def working_set(block_size):
+        total = 0
+        for (f, _), radius in streams.items():
+            points = 1
+            for d, r in radius.items():
+                if d == blocked[0]:
+                    points *= 2*r + 1
+                elif d in blocked:
+                    points *= block_size + 2*r
+                else:
+                    points *= extents.get(d, blocksize_candidates[-1]) + 2*r
+            total += points*np.dtype(f.dtype).itemsize
+        return total
+
+    fits = [i for i in blocksize_candidates if working_set(i) <= cache_size]
+    block_size = fits[-1] if fits else blocksize_candidates[0]
+
+    def heuristic(dim_size):
+        return max(min(block_size, dim_size), 1)
+
+    return heuristic
+
+
+def wavefront_skew(iteration, root):
+    """
+    Return the minimum skew, that is the shift along the Dimension of ``root``
+    per timestep, that makes wavefront temporal blocking of the time
+    :class:`Iteration` ``iteration`` legal. Return None if the skew cannot be
+    determined, for example because of irregular accesses or because some of
+    the written :class:`Function`s do not depend on time.
+
+    Let ``dt`` and ``dx`` be the time and space distances between a write and
+    a read (or another write) of the same Function, buffered over ``M`` time
+    slots. With a skew ``s``, wavefront blocking preserves: ::
+
+        * the flow dependences, if ``s*dt >= -dx``;
+        * the anti dependences induced by the reuse of the modulo buffer
+          slots, if ``s*(M - dt) >= dx``.
+    """
+    exprs = [e.expr for e in FindNodes(Expression).visit(root)]
+
+    # Replace the modulo buffer indices (e.g., t0, t1) with the time points
+    # they stand for (e.g., t, t + 1), so that distances become integers
+    mapper = {}
+    for i in flatten(retrieve_indexed(e) for e in exprs):
+        mapper.update({j: j.origin for j in i.indices if getattr(j, 'is_Lowered', 0)})
+    scope = Scope([e.xreplace(mapper) for e in exprs])
+
+    skew = 0
+    for e in exprs:
+        if not e.lhs.is_Indexed:
+            continue
+        function = e.lhs.base.function
+        findices = [i.parent if i.is_Derived else i for i in function.indices]
+        try:
+            tpos = findices.index(iteration.dim)
+            xpos = findices.index(root.dim)
+        except ValueError:
+            return None
+        if getattr(e.lhs.indices[tpos], 'is_Lowered', False):
+            size = function.shape[tpos]
+        else:
+            # No buffer slot is ever reused
+            size = None
+        for w in scope.getwrites(function):
+            for i in scope[function]:
+                if i is w:
+                    continue
+                distance = w.distance(i)
+                dt, dx = distance[tpos], distance[xpos]
+                if not (is_integer(dt) and is_integer(dx)) or dt < 0:
+                    return None
+                if dt > 0:
+                    skew = max(skew, -(dx // dt))
+                if size is None:
+                    continue
+                elif dt >= size:
+                    return None
+                skew = max(skew, -(-dx // (size - dt)))
+
+    return skew
+
+
+def wavefront_heuristic(root, skew, cache_size):
+    """
+    Return two functions which, given the size of a :class:`Dimension`, return
+    the size of the time tiles and of the space tiles for wavefront temporal
+    blocking of the :class:`Iteration` ``root``, skewed by ``skew``.
+
+    A time tile spans ``wavefront_timesteps`` timesteps. The space tiles are
+    as large as possible, under the constraint that the planes of data swept
+    by a tile fit in ``cache_size`` bytes.
+    """
+    # The size, in bytes, of a plane orthogonal to the Dimension of ``root``
+    # of all data accessed within ``root``, including all buffer slots
+    plane_size = 0
+    for i in FindSymbols('symbolics').visit(root):
+        if i.is_Tensor and root.dim in i.indices and all(is_integer(j) for j in i.shape):
+            plane_size += np.dtype(i.dtype).itemsize*int(np.prod(i.shape)) //\
+                i.shape[i.indices.index(root.dim)]
+    planes = cache_size // max(plane_size, 1) - skew*(wavefront_timesteps - 1)
+
+    def theuristic(dim_size):
+        return max(min(wavefront_timesteps, dim_size), 1)
+
+    def xheuristic(dim_size):
+        return max(min(planes, dim_size), 1)
+
+    return theuristic, xheuristic
+
+
 def optimize_unfolded_tree(unfolded, root):
     """
     Transform folded trees to reduce the memory footprint.
@@ -20,7 +20,16 @@ modes = {
 default_options = {
     'blockinner': False,
     'blockshape': None,
-    'blockalways': False
+    'blockalways': False,
+    'wavefront': False,
+    'schedule': 'static',
+    'chunk': None,
+    'collapse': None,
+    'nthreads': None,
+    'unroll': None,
+    'prefetch': None,
+    'regions': None,
+    'simd': 'pragma'
 }
 """Default values for the various optimization options."""
 
@@ -59,6 +68,36 @@ def transform(node, mode='basic', options=None):
                         heuristic.
         * 'blockalways': Apply blocking even though the DLE thinks it's not
                          worthwhile applying it.
+        * 'wavefront': Apply wavefront temporal blocking to the time-stepping
+                       loops, whenever legal.
+        * 'schedule': The OpenMP loop scheduling policy, one of 'static' (default),
+                      'dynamic' and 'guided'.
+        * 'chunk': The OpenMP chunk size. Unless the schedule is 'static' and no
+                   chunk size is given, this becomes a runtime argument of the
+                   generated code, ``chunk_size``, which may be autotuned.
+        * 'collapse': The number of parallel loops to be collapsed by OpenMP. By
+                      default, this is decided heuristically based on the number
+                      of available physical cores.
+        * 'nthreads': The number of OpenMP threads. If provided, this becomes a
+                      runtime argument of the generated code, ``nthreads``, which
+                      may be autotuned.
+        * 'unroll': Unroll the second-innermost loop of each loop nest by the
+                    given factor, and jam the unrolled bodies into the innermost
+                    loop.
+        * 'prefetch': The distance, in number of rows, at which the rows read in
+                      the innermost blocked loops are prefetched. This is used in
+                      the 'speculative' mode, unless set to False.
+        * 'regions': A dictionary mapping :class:`Function`s to the width, in
+                     number of points, of the boundary layer outside of which
+                     they are known to be zero (e.g., a damping field). Either
+                     an integer or a tuple, with one entry per dimension. The
+                     loop nests reading these Functions are split into an
+                     interior loop nest, in which they are dropped, and boundary
+                     loop nests.
+        * 'simd': Either 'pragma' (default), to rely on the compiler honouring
+                  SIMD pragmas, or 'explicit', to emit explicit SIMD code for the
+                  innermost loops through the vector extensions of GNU-compatible
+                  compilers.
     """
     assert isinstance(node, Node)
 
@@ -75,6 +114,10 @@ def transform(node, mode='basic', options=None):
     params['compiler'] = configuration['compiler']
     params['openmp'] = configuration['openmp']
 
+    # Unpack single modes, e.g. as in ('advanced', {...})
+    if isinstance(mode, tuple) and len(mode) == 1:
+        mode = mode[0]
+
     # Force OpenMP if parallelism was requested, even though mode is 'noop'
     if mode == 'noop' and params['openmp'] is True:
         mode = 'openmp'
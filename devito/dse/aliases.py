@@ -51,18 +51,17 @@ def collect(exprs):
             if handle:
                 candidates[expr.rhs] = ExprData(*handle)
 
+    # Group the aliasing expressions. Two expressions alias each other if and
+    # only if they have the same translation-invariant signature, so the groups
+    # are determined through a single dictionary lookup per candidate
+    groups = OrderedDict()
+    for k, v in candidates.items():
+        groups.setdefault(signature(k, v.offsets), []).append(k)
+
     aliases = OrderedDict()
     mapper = OrderedDict()
-    unseen = list(candidates)
-    while unseen:
-        # Find aliasing expressions
-        handle = unseen.pop(0)
-        group = [handle]
-        for e in list(unseen):
-            if compare(handle, e) and\
-                    is_translated(candidates[handle].offsets, candidates[e].offsets):
-                group.append(e)
-                unseen.remove(e)
+    for group in groups.values():
+        handle = group[0]
         mapper.update([(i, group) for i in group])
 
         # Try creating a basis for the aliasing expressions' offsets
@@ -195,37 +194,41 @@ def distance(ofs1, ofs2):
     return handle
 
 
-def is_translated(ofs1, ofs2):
+def signature(expr, offsets):
     """
-    Return True if ``ofs2`` is translated w.r.t. to ``ofs1``, False otherwise.
+    Return a hashable, translation-invariant signature of ``expr``, whose
+    indexed objects are at the given ``offsets``. Two expressions alias each
+    other if and only if their signatures are equal.
+
+    The signature consists of the structure of ``expr`` -- the operations and
+    the operands, with indexed objects reduced to their base -- as well as the
+    ``offsets`` relative to the offsets of the first indexed object.
 
     For example: ::
 
         e1 = A[i,j] + A[i,j+1]
         e2 = A[i+1,j] + A[i+1,j+1]
 
-    ``ofs1`` would be [(0, 0), (0, 1)], while ``ofs2`` would be [(1, 0), (1,1)], so
-    ``e2`` is translated w.r.t. ``e1`` by ``(1, 0)``, and True is returned.
+    The offsets of ``e1`` are [(0, 0), (0, 1)], while those of ``e2`` are
+    [(1, 0), (1, 1)]. In both cases, the relative offsets are
+    [(0, 0), (0, 1)], so ``e1`` and ``e2`` have the same signature.
     """
-    return len(distance(ofs1, ofs2)) == 1
+    origin = offsets[0]
+    relative = tuple(tuple(i - j for i, j in zip(ofs, origin)) for ofs in offsets)
+    return structure(expr), relative
 
 
-def compare(e1, e2):
+def structure(expr):
     """
-    Return True if the two expressions e1 and e2 alias each other, False otherwise.
+    Return a hashable representation of the operations and operands in ``expr``,
+    in which indexed objects are reduced to their base.
     """
-    if type(e1) == type(e2) and len(e1.args) == len(e2.args):
-        if e1.is_Atom:
-            return True if e1 == e2 else False
-        elif isinstance(e1, Indexed) and isinstance(e2, Indexed):
-            return True if e1.base == e2.base else False
-        else:
-            for a1, a2 in zip(e1.args, e2.args):
-                if not compare(a1, a2):
-                    return False
-            return True
+    if isinstance(expr, Indexed):
+        return (Indexed, expr.base)
+    elif expr.is_Atom:
+        return (type(expr), expr)
     else:
-        return False
+        return (type(expr),) + tuple(structure(i) for i in expr.args)
 
 
 class Alias(object):
@@ -1,6 +1,7 @@
 from devito.dse.backends.common import *  # noqa
 from devito.dse.backends.basic import BasicRewriter  # noqa
-from devito.dse.backends.advanced import AdvancedRewriter  # noqa
+from devito.dse.backends.advanced import AdvancedRewriter, AdvancedRewriterSafeMath  # noqa
 from devito.dse.backends.speculative import (SpeculativeRewriter,  # noqa
                                              AggressiveRewriter,
                                              CustomRewriter)
+from devito.dse.backends.auto import AutoRewriter  # noqa
@@ -5,19 +5,101 @@ from collections import OrderedDict
 from devito.ir import Cluster, ClusterGroup, groupby
 from devito.dse.aliases import collect
 from devito.dse.backends import BasicRewriter, dse_pass
-from devito.symbolics import Eq, estimate_cost, xreplace_constrained, iq_timeinvariant
+from devito.dimension import Dimension
+from devito.symbolics import (Eq, estimate_cost, xreplace_constrained, iq_timeinvariant,
+                              q_reciprocal, retrieve_indexed, search)
 from devito.dse.manipulation import (common_subexprs_elimination, collect_nested,
-                                     compact_temporaries)
+                                     collect_coefficients, compact_temporaries)
+from devito.tools import flatten
 from devito.types import Indexed, Scalar, Array
 
 
 class AdvancedRewriter(BasicRewriter):
 
     def _pipeline(self, state):
+        self._extract_reciprocals(state)
         self._extract_time_invariants(state, costmodel=lambda e: e.is_Function)
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
+        self._factorize_coefficients(state)
+
+    @dse_pass
+    def _extract_reciprocals(self, cluster, template, **kwargs):
+        """
+        Replace the divisions by loop-invariant denominators with multiplications
+        by precomputed reciprocals. The reciprocals are assigned to: ::
+
+            * scalar temporaries, if the denominator is invariant in all of the
+              iteration space (e.g., ``dt**2/h_x**2``);
+            * time-invariant :class:`Array`s, computed in a new :class:`Cluster`,
+              if the denominator only depends on time-invariant data accessed
+              at the current space point (e.g., ``1/m[x,y,z]``).
+
+        Examples
+        ========
+        Let ``t`` be the time dimension, ``x, y, z`` the space dimensions. Then:
+
+        1) temp = a[t,x,y,z]/(h_x*h_x) + b[t,x,y,z]/(2*m[x,y,z] + damp[x,y,z])
+           >>>
+           rcp0 = 1/(h_x*h_x)
+           rcp1[x,y,z] = 1/(2*m[x,y,z] + damp[x,y,z])
+           temp = rcp0*a[t,x,y,z] + rcp1[x,y,z]*b[t,x,y,z]
+
+        As ``a*(1/b)`` may differ from ``a/b`` in the last bit, this
+        transformation is not applied in safe-math mode.
+        """
+        if cluster.is_sparse:
+            return cluster
+
+        g = cluster.trace
+        indices = g.space_indices
+
+        # Template for the reciprocals of space-varying denominators
+        shape = tuple(i.symbolic_extent for i in indices)
+        make = lambda i: Array(name=template(i), shape=shape,
+                               dimensions=indices).indexed
+
+        scalars = []
+        arrays = []
+        rules = OrderedDict()
+        mapper = {}
+        for div in flatten(search(e, q_reciprocal, 'all', 'dfs') for e in cluster.exprs):
+            base, exp = div.as_base_exp()
+            if base not in rules:
+                if base.is_Number or any(i in g for i in base.free_symbols):
+                    # Literal denominators are folded by the compiler, while
+                    # the temporaries are not available outside of /cluster/
+                    continue
+                dimensions = [i for i in base.free_symbols if isinstance(i, Dimension)]
+                indexeds = retrieve_indexed(base)
+                if not indexeds and not dimensions:
+                    temporary = Scalar(name=template(len(rules))).indexify()
+                    scalars.append(Eq(temporary, 1/base))
+                elif all(i in indices for i in dimensions) and\
+                        all(i not in g and set(i.indices) <= set(indices)
+                            for i in indexeds):
+                    # Only accessed at the current space point, hence invariant
+                    # along the time dimension
+                    temporary = Indexed(make(len(rules)), *indices)
+                    arrays.append(Eq(temporary, 1/base))
+                else:
+                    continue
+                rules[base] = temporary
+            mapper[div] = rules[base] if exp == -1 else rules[base]**(-exp)
+        if not mapper:
+            return cluster
+
+        # The reciprocals stored in Arrays are computed outside of the time loop
+        ispace = cluster.ispace.drop([i.dim for i in cluster.ispace.intervals
+                                      if i.dim not in indices])
+        clusters = groupby(ClusterGroup([Cluster([i], ispace) for i in arrays]))
+        clusters = clusters.finalize()
+
+        # Switch reciprocals in the expression trees
+        processed = scalars + [e.xreplace(mapper) for e in cluster.exprs]
+
+        return clusters + [cluster.rebuild(processed)]
 
     @dse_pass
     def _extract_time_invariants(self, cluster, template, with_cse=True,
@@ -73,6 +155,28 @@ class AdvancedRewriter(BasicRewriter):
 
         return cluster.rebuild(processed)
 
+    @dse_pass
+    def _factorize_coefficients(self, cluster, *args, **kwargs):
+        """
+        Factorize the coefficients shared by several terms of a sum, to minimize
+        the number of multiplications. This captures, in particular, the
+        symmetric and antisymmetric pairs of centered finite-difference stencils,
+        in all dimensions, whatever the coefficients are -- literals, symbols
+        such as the grid spacing, or temporaries introduced by previous passes.
+        For example: ::
+
+            ti0*u[x-1] - 2*ti0*u[x] + ti0*u[x+1] --> ti0*(u[x-1] + u[x+1] - 2*u[x])
+        """
+        processed = []
+        for expr in cluster.exprs:
+            handle = collect_coefficients(expr)
+            if estimate_cost(handle) < estimate_cost(expr):
+                processed.append(handle)
+            else:
+                processed.append(expr)
+
+        return cluster.rebuild(processed)
+
     @dse_pass
     def _eliminate_inter_stencil_redundancies(self, cluster, template, **kwargs):
         """
@@ -157,3 +261,19 @@ class AdvancedRewriter(BasicRewriter):
         processed = [e.xreplace(rules) for e in processed]
 
         return alias_clusters + [cluster.rebuild(processed)]
+
+
+class AdvancedRewriterSafeMath(AdvancedRewriter):
+
+    """
+    This Rewriter is slightly less aggressive than :class:`AdvancedRewriter`, as
+    it doesn't replace divisions by multiplications by reciprocals, which may
+    sometimes harm the numerical precision.
+    """
+
+    def _pipeline(self, state):
+        self._extract_time_invariants(state, costmodel=lambda e: e.is_Function)
+        self._eliminate_inter_stencil_redundancies(state)
+        self._eliminate_intra_stencil_redundancies(state)
+        self._factorize(state)
+        self._factorize_coefficients(state)
@@ -0,0 +1,84 @@
+import numpy as np
+
+from devito.dse.backends import (AbstractRewriter, BasicRewriter, AdvancedRewriter,
+                                 SpeculativeRewriter, AggressiveRewriter, dse_pass)
+from devito.logger import dse
+from devito.parameters import configuration
+from devito.symbolics import estimate_cost, estimate_memory, retrieve_indexed
+from devito.tools import flatten
+
+
+class AutoRewriter(AbstractRewriter):
+
+    """
+    Apply each of the ``candidates`` rewriters, and retain the output with the
+    shortest execution time according to a roofline model of the target ISA.
+    """
+
+    candidates = [BasicRewriter, AdvancedRewriter, SpeculativeRewriter,
+                  AggressiveRewriter]
+    """The rewriters competing for a cluster, in order of preference."""
+
+    machines = {
+        'cpp': (2., 4.),
+        'avx': (16., 4.),
+        'avx2': (32., 4.),
+        'avx512': (64., 4.)
+    }
+    """
+    A mapper from ISAs to the per-core peak single-precision flops per cycle
+    and sustained memory bandwidth, in bytes per cycle.
+    """
+
+    def _pipeline(self, state):
+        self._select(state)
+
+    @dse_pass
+    def _select(self, cluster, *args, **kwargs):
+        """
+        Rewrite ``cluster`` with each of the candidate rewriters, and retain the
+        output with the lowest roofline estimate of the time per grid point,
+        that is the maximum of the compute and the memory times. Ties are broken
+        in favour of fewer flops, then less memory traffic, and finally in
+        order of preference.
+        """
+        peak, bandwidth = self.machines[configuration['isa']]
+
+        best = None
+        for n, rewriter in enumerate(self.candidates):
+            processed = rewriter(False).run(cluster)
+            flops, traffic = self._estimate(cluster, processed)
+            key = (max(flops / peak, traffic / bandwidth), flops, traffic, n)
+            if best is None or key < best[0]:
+                best = (key, rewriter, processed)
+
+        (_, flops, traffic, _), rewriter, processed = best
+        if self.profile:
+            dse("auto: selected %s [flops: %d, traffic: %d bytes]" %
+                (rewriter.__name__, flops, traffic))
+
+        return processed
+
+    def _estimate(self, cluster, processed):
+        """
+        Estimate the flops and the bytes of memory traffic per grid point of
+        ``processed``, the clusters obtained by rewriting ``cluster``.
+
+        The traffic includes that incurred by the :class:`Array` temporaries.
+        The clusters which are hoisted out of the time loop are neglected, as
+        their cost is amortized over the time iterations.
+        """
+        time = {i.dim for i in cluster.ispace.intervals if i.dim.is_Time}
+
+        flops = 0
+        traffic = 0
+        for c in processed:
+            if time and not any(i.dim in time for i in c.ispace.intervals):
+                continue
+            indexeds = flatten(retrieve_indexed(e) for e in c.exprs)
+            itemsize = max([np.dtype(i.base.function.dtype).itemsize
+                            for i in indexeds] or [0])
+            flops += estimate_cost(c.exprs)
+            traffic += estimate_memory(c.exprs)*itemsize
+
+        return flops, traffic
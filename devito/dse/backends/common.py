@@ -59,6 +59,7 @@ class AbstractRewriter(object):
     Name conventions for new temporaries.
     """
     conventions = {
+        '_extract_reciprocals': 'rcp',
         '_extract_sum_of_products': 'sop',
         '_extract_time_invariants': 'ti',
         '_extract_time_varying': 'td',
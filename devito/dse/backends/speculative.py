@@ -7,11 +7,13 @@ from devito.types import Scalar
 class SpeculativeRewriter(AdvancedRewriter):
 
     def _pipeline(self, state):
+        self._extract_reciprocals(state)
         self._extract_time_varying(state)
         self._extract_time_invariants(state, costmodel=lambda e: e.is_Function)
         self._eliminate_inter_stencil_redundancies(state)
         self._eliminate_intra_stencil_redundancies(state)
         self._factorize(state)
+        self._factorize_coefficients(state)
 
     @dse_pass
     def _extract_time_varying(self, cluster, template, **kwargs):
@@ -34,6 +36,7 @@ class AggressiveRewriter(SpeculativeRewriter):
     def _pipeline(self, state):
         """Three CSRE phases, progressively searching for less structure."""
 
+        self._extract_reciprocals(state)
         self._extract_time_varying(state)
         self._extract_time_invariants(state, with_cse=False,
                                       costmodel=lambda e: e.is_Function)
@@ -45,6 +48,7 @@ class AggressiveRewriter(SpeculativeRewriter):
 
         self._factorize(state)
         self._eliminate_intra_stencil_redundancies(state)
+        self._factorize_coefficients(state)
 
     @dse_pass
     def _extract_sum_of_products(self, cluster, template, **kwargs):
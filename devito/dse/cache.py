@@ -0,0 +1,171 @@
+from __future__ import absolute_import
+
+import os
+from hashlib import sha1
+
+import numpy as np
+from sympy import Float, Number, Rational, preorder_traversal
+
+from devito.dimension import Dimension
+from devito.dse.pickling import dumps, loads
+from devito.logger import dse_warning
+from devito.parameters import configuration
+from devito.types import AbstractCachedSymbol, IndexedData
+
+__all__ = ['fetch', 'store', 'clear']
+
+
+_cache = {}
+"""The in-memory cache, mapping keys to serialized rewritten Clusters."""
+
+
+def fetch(cluster, mode):
+    """
+    Retrieve the :class:`Cluster`s produced by a previous rewrite, in mode
+    ``mode``, of a Cluster identical to ``cluster`` up to the names of the
+    symbolic objects. The retrieved Clusters use the symbolic objects of
+    ``cluster``, while the temporaries are created afresh.
+
+    Return None if no such rewrite has been cached.
+
+    The cache is controlled by ``configuration['dse_cache']``: ::
+
+        * 'off': No caching.
+        * 'memory': Cache in memory.
+        * Any other value: Cache in memory as well as in files, in the
+                           directory given by the value. The files are
+                           shared by all Devito runs using the same
+                           directory.
+    """
+    if configuration['dse_cache'] == 'off':
+        return None
+
+    key, objects, _ = canonicalize(cluster, mode)
+    data = _cache.get(key)
+    if data is None:
+        path = _path(key)
+        if path is not None and os.path.exists(path):
+            with open(path, 'rb') as f:
+                data = _cache.setdefault(key, f.read())
+    if data is None:
+        return None
+
+    return loads(data, objects)
+
+
+def store(cluster, mode, processed):
+    """
+    Cache ``processed``, the :class:`Cluster`s produced by rewriting ``cluster``
+    in mode ``mode``.
+    """
+    if configuration['dse_cache'] == 'off':
+        return
+
+    key, _, pids = canonicalize(cluster, mode)
+    try:
+        data = dumps(list(processed), pids)
+    except Exception:
+        # Some object cannot be rebuilt, so the rewrite won't be cached
+        return
+    _cache[key] = data
+
+    path = _path(key)
+    if path is not None:
+        try:
+            if not os.path.exists(os.path.dirname(path)):
+                os.makedirs(os.path.dirname(path))
+            # Write, then rename, as other processes may be reading the file
+            handle = '%s.%d' % (path, os.getpid())
+            with open(handle, 'wb') as f:
+                f.write(data)
+            os.rename(handle, path)
+        except (IOError, OSError):
+            dse_warning("Couldn't write the DSE cache file %s" % path)
+
+
+def clear():
+    """Drop all cached rewrites from memory."""
+    _cache.clear()
+
+
+def canonicalize(cluster, mode):
+    """
+    Compute a canonical form of ``cluster``, in which the symbolic objects,
+    with the exception of the :class:`Dimension`s, are identified by their
+    order of appearance rather than by their name.
+
+    Return a 3-tuple consisting of: ::
+
+        * a key identifying the canonical form, ``mode`` and the target ISA;
+        * the list of symbolic objects reachable from ``cluster``, in a
+          canonical order -- Clusters with the same key have, in the same
+          position, objects playing the same role;
+        * a mapper from the ids of these objects to their position.
+    """
+    names = {}
+    tokens = [mode, configuration['isa']]
+    objects = [cluster.ispace]
+
+    for i in cluster.ispace.intervals:
+        tokens.append((_token(i.dim, names), i.lower, i.upper))
+        objects.append(i.dim)
+    for k, v in cluster.ispace.sub_iterators.items():
+        tokens.append((_token(k, names),
+                       tuple((_token(i.dim, names), sorted(i.ofs)) for i in v)))
+        objects.extend([k] + [i.dim for i in v])
+
+    for expr in cluster.exprs:
+        tokens.append(type(expr).__name__)
+        for i in preorder_traversal(expr):
+            tokens.append(_token(i, names))
+            objects.extend([i, i.func, getattr(i, 'function', None)])
+
+    pids = {}
+    for n, i in enumerate(objects):
+        if i is not None:
+            pids.setdefault(id(i), n)
+
+    key = sha1(str(tokens).encode('utf-8')).hexdigest()
+
+    return key, objects, pids
+
+
+def _token(obj, names):
+    """
+    Return a hashable representation of ``obj`` that is independent of its
+    name, unless ``obj`` is a :class:`Dimension`.
+    """
+    cls = type(obj)
+    if isinstance(obj, Dimension):
+        return (cls.__name__, obj.name, str(obj._hashable_content()), obj.reverse)
+    elif isinstance(obj, IndexedData):
+        function = obj.function
+        return (cls.__name__, type(function).__bases__[0].__name__,
+                _name(function.name, names), np.dtype(function.dtype).str,
+                tuple(i.name for i in function.indices))
+    elif isinstance(obj, AbstractCachedSymbol):
+        return (cls.__bases__[0].__name__, _name(obj.name, names),
+                np.dtype(obj.dtype).str)
+    elif isinstance(obj, Float):
+        return (cls.__name__, obj._mpf_)
+    elif isinstance(obj, Rational):
+        return (cls.__name__, obj.p, obj.q)
+    elif isinstance(obj, Number):
+        return (cls.__name__, str(obj))
+    elif obj.is_Symbol:
+        return (cls.__name__, _name(obj.name, names))
+    else:
+        return ('%s.%s' % (cls.__module__, cls.__name__), len(obj.args))
+
+
+def _name(name, names):
+    return names.setdefault(name, 'n%d' % len(names))
+
+
+def _path(key):
+    from devito import __version__
+    directory = configuration['dse_cache']
+    if directory in ['off', 'memory']:
+        return None
+    # The cached rewrites may be invalidated by a different version of Devito
+    return os.path.join(directory, __version__, '%s.pickle' % key)
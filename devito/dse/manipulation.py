@@ -1,13 +1,15 @@
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
+from itertools import groupby
 
-from sympy import collect, collect_const
+from sympy import Add, Mul, S, collect, collect_const
+from sympy.core.mul import _keep_coeff
 
 from devito.ir import FlowGraph
-from devito.symbolics import Eq, count, estimate_cost, q_op, q_leaf, xreplace_constrained
+from devito.symbolics import Eq, q_op, q_leaf, retrieve_indexed, xreplace_constrained
 from devito.types import Indexed, Array
 from devito.tools import flatten
 
-__all__ = ['promote_scalar_expressions', 'collect_nested',
+__all__ = ['promote_scalar_expressions', 'collect_nested', 'collect_coefficients',
            'common_subexprs_elimination', 'compact_temporaries']
 
 
@@ -79,6 +81,73 @@ def collect_nested(expr, aggressive=False):
     return run(expr)[0]
 
 
+def collect_coefficients(expr):
+    """
+    Factorize, in each sum within ``expr``, the coefficients shared by several
+    terms, so that the number of multiplications is minimized. Unlike
+    ``collect_nested``, which only collects Float literals, a coefficient may
+    be any product of numbers, symbols and temporaries. For example, the
+    symmetric stencil: ::
+
+        a/(h*h)*u[x-1] - 2*a/(h*h)*u[x] + a/(h*h)*u[x+1]
+
+    becomes: ::
+
+        a/(h*h)*(u[x-1] + u[x+1] - 2*u[x])
+
+    A coefficient shared by terms of opposite sign, as in antisymmetric
+    stencils, is collected as well.
+
+    :param expr: the expression to be factorized.
+    """
+    if expr.is_Atom or expr.is_Indexed:
+        return expr
+
+    args = [collect_coefficients(i) for i in expr.args]
+    if not expr.is_Add:
+        return expr.func(*args, evaluate=False)
+
+    # Split each term into number, coefficient and operand, for all candidate
+    # operands (i.e., any of its non-numeric factors)
+    processed = []
+    terms = []
+    for i in args:
+        number, rest = i.as_coeff_Mul()
+        factors = Mul.make_args(rest)
+        if rest is S.One:
+            processed.append(i)
+        else:
+            terms.append((number, [(Mul(*(factors[:n] + factors[n+1:])), factors[n])
+                                   for n in range(len(factors))]))
+
+    # The coefficient of a term is the one shared with the most other terms
+    frequency = defaultdict(int)
+    for _, candidates in terms:
+        for coefficient, _ in candidates:
+            frequency[coefficient] += 1
+    groups = OrderedDict()
+    for number, candidates in terms:
+        coefficient, operand = max(candidates, key=lambda i: frequency[i[0]])
+        handle = groups.setdefault(coefficient, OrderedDict())
+        handle.setdefault(abs(number), []).append((number, operand))
+
+    # Rebuild, collecting coefficients and numbers shared by multiple terms
+    for coefficient, v in groups.items():
+        rebuilt = []
+        for handle in v.values():
+            number = handle[0][0]
+            operands = [i if n == number else -i for n, i in handle]
+            rebuilt.append(_keep_coeff(number, Add(*operands, evaluate=False)))
+        if coefficient is S.One:
+            processed.extend(rebuilt)
+        elif len(rebuilt) == 1:
+            processed.append(Mul(coefficient, *rebuilt))
+        else:
+            processed.append(Mul(coefficient, Add(*rebuilt, evaluate=False)))
+
+    return Add(*processed, evaluate=False)
+
+
 def common_subexprs_elimination(exprs, make, mode='default'):
     """
     Perform common subexpressions elimination.
@@ -102,34 +171,175 @@ def common_subexprs_elimination(exprs, make, mode='default'):
     processed = list(exprs)
     mapped = []
     while True:
-        # Detect redundancies
-        counted = count(mapped + processed, q_op).items()
-        targets = OrderedDict([(k, estimate_cost(k)) for k, v in counted if v > 1])
-        if not targets:
+        # Rebuilding the expressions may trigger SymPy's canonicalization, which
+        # in turn may expose further redundancies; hence, iterate until fixpoint
+        n = len(mapped)
+        temporaries, handle = _eliminate_redundancies(mapped + processed,
+                                                      lambda i: make(n + i))
+        if not temporaries:
             break
-
-        # Create temporaries
-        hit = max(targets.values())
-        picked = [k for k, v in targets.items() if v == hit]
-        mapper = OrderedDict([(e, make(len(mapped) + i)) for i, e in enumerate(picked)])
-
-        # Apply repleacements
-        processed = [e.xreplace(mapper) for e in processed]
-        mapped = [e.xreplace(mapper) for e in mapped]
-        mapped = [Eq(v, k) for k, v in reversed(list(mapper.items()))] + mapped
-
-        # Prepare for the next round
-        for k in picked:
-            targets.pop(k)
+        mapped = temporaries + handle[:n]
+        processed = handle[n:]
+
+    # The temporaries of later iterations may use those of earlier ones
+    definitions = OrderedDict([(i.lhs, i) for i in mapped])
+    ordered = OrderedDict()
+
+    def schedule(temp):
+        if temp not in ordered:
+            for i in retrieve_indexed(definitions[temp].rhs):
+                if i in definitions:
+                    schedule(i)
+            ordered[temp] = definitions[temp]
+    for i in definitions:
+        schedule(i)
+    mapped = list(ordered.values())
     processed = mapped + processed
 
     # Simply renumber the temporaries in ascending order
-    mapper = {i.lhs: j.lhs for i, j in zip(mapped, reversed(mapped))}
-    processed = [e.xreplace(mapper) for e in processed]
+    mapper = {i.lhs: make(n) for n, i in enumerate(mapped)}
+    mapper = {k: v for k, v in mapper.items() if k != v}
+    if mapper:
+        processed = [e.xreplace(mapper) for e in processed]
 
     return processed
 
 
+def _eliminate_redundancies(exprs, make):
+    """
+    Perform a single pass of common subexpressions elimination over ``exprs``.
+    Return the newly created temporaries, the least expensive first, and the
+    rebuilt ``exprs``.
+    """
+    processed = list(exprs)
+
+    # Hash-cons the subexpressions into a DAG, in which equal subexpressions are
+    # the same node. Nodes are numbered in postorder, so operands always precede
+    # operations, and an operation is identified by its type and the nodes of
+    # its (canonically ordered) operands -- hence, subtrees are never compared.
+    # Indexed objects are leaves, so array index access functions are not captured
+    nodes = []
+    operands = []
+    visits = []
+    seen = {}
+    interned = {}
+    clock = [0]
+
+    def build(expr):
+        try:
+            return seen[id(expr)]
+        except KeyError:
+            pass
+        visit = clock[0]
+        clock[0] += 1
+        if q_leaf(expr):
+            args = ()
+            key = expr
+        else:
+            args = tuple(build(a) for a in expr.args)
+            key = (type(expr), args)
+        node = interned.get(key)
+        if node is None:
+            node = interned[key] = len(nodes)
+            nodes.append(expr)
+            operands.append(args)
+            visits.append(visit)
+        seen[id(expr)] = node
+        return node
+    roots = [build(e.rhs) for e in processed]
+
+    # Count all occurrences of all subexpressions in a single pass
+    def occurrences(roots, within):
+        counter = defaultdict(int)
+        for i in roots:
+            counter[i] += 1
+        for i in sorted(within, reverse=True):
+            for a in operands[i]:
+                counter[a] += counter[i]
+        return counter
+    counter = occurrences(roots, range(len(nodes)))
+
+    # Operation counts, as in `estimate_cost`, derived bottom-up
+    cost = []
+    for expr, args in zip(nodes, operands):
+        if expr.is_Function:
+            handle = 1
+        elif expr.is_Add or expr.is_Mul:
+            handle = len(args) - (1 + sum(True for a in expr.args if a.is_Integer))
+        else:
+            handle = 0
+        cost.append(handle + sum(cost[a] for a in args))
+
+    # Pick the redundancies, from the most to the least expensive. Once a
+    # subexpression is replaced by a temporary, the occurrences of its own
+    # subexpressions drop to those within the temporary
+    candidates = [i for i, e in enumerate(nodes) if q_op(e) and counter[i] > 1]
+    candidates.sort(key=lambda i: (-cost[i], visits[i]))
+    picked = []
+    for _, group in groupby(candidates, key=lambda i: cost[i]):
+        group = [i for i in group if counter[i] > 1]
+        if len(group) > 1:
+            # Ties are picked in order of appearance, with the temporaries
+            # created so far (the most recent first) preceding the expressions
+            order = preorder(flatten(operands[i] for i in reversed(picked)) + roots,
+                             operands, set(picked))
+            group.sort(key=lambda i: order[i])
+        for i in group:
+            within = set()
+            queue = list(operands[i])
+            while queue:
+                j = queue.pop()
+                if j not in within:
+                    within.add(j)
+                    queue.extend(operands[j])
+            local = occurrences(operands[i], within)
+            for j in within:
+                counter[j] -= (counter[i] - 1)*local[j]
+        picked.extend(group)
+
+    # Create temporaries, the least expensive first, and apply replacements
+    mapper = OrderedDict([(i, make(n)) for n, i in enumerate(reversed(picked))])
+    cache = {}
+
+    def rebuild(expr, node, root=False):
+        # Only rebuild what actually changed, as rebuilding may trigger
+        # SymPy's canonicalization (e.g., 3*(x + y) -> 3*x + 3*y)
+        if node in mapper and not root:
+            return mapper[node]
+        if node not in cache:
+            args = [rebuild(*i) for i in zip(expr.args, operands[node])]
+            if any(a is not b for a, b in zip(args, expr.args)):
+                cache[node] = expr.func(*args)
+            else:
+                cache[node] = None
+        return expr if cache[node] is None else cache[node]
+    temporaries = [Eq(v, rebuild(nodes[k], k, True)) for k, v in mapper.items()]
+    processed = [e.func(e.lhs, rebuild(e.rhs, i)) for e, i in zip(processed, roots)]
+
+    return temporaries, processed
+
+
+def preorder(roots, operands, stop):
+    """
+    Return a mapper from the nodes of a DAG reachable from ``roots`` to
+    their position in a preorder traversal, without descending into the
+    nodes in ``stop``.
+
+    :param roots: The nodes from which the DAG is traversed.
+    :param operands: A mapper from each node to its operand nodes.
+    :param stop: The nodes whose operands are not visited.
+    """
+    mapper = OrderedDict()
+    queue = list(reversed(roots))
+    while queue:
+        node = queue.pop()
+        if node not in mapper:
+            mapper[node] = len(mapper)
+            if node not in stop:
+                queue.extend(reversed(operands[node]))
+    return mapper
+
+
 def compact_temporaries(temporaries, leaves):
     """
     Drop temporaries consisting of single symbols.
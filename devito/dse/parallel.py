@@ -0,0 +1,108 @@
+from __future__ import absolute_import
+
+import multiprocessing as mp
+import os
+import sys
+
+from sympy import preorder_traversal
+
+from devito.dse.pickling import dumps, loads
+
+__all__ = ['parallel_rewrite']
+
+
+_state = {}
+"""The state shared, through ``fork``, with the worker processes."""
+
+
+def parallel_rewrite(clusters, func, workers=1):
+    """
+    Apply ``func``, a callable transforming a :class:`Cluster` into a list of
+    :class:`Cluster`s, to each of the ``clusters`` through a pool of ``workers``
+    processes.
+
+    The worker processes are forked, so they inherit ``func`` and ``clusters``
+    rather than receiving them through pickling. Only the output Clusters are
+    sent back. The symbolic objects already existing in the parent process
+    (e.g., :class:`Function`s, :class:`Dimension`s, unaltered sub-expressions)
+    are sent back as references, while those created by ``func`` (e.g., the DSE
+    temporaries) are rebuilt without evaluation. Since each Cluster is
+    transformed independently of the others, the output, including the names
+    of the temporaries, is identical to that of a sequential run.
+
+    If a worker fails, or if its output cannot be sent back, the corresponding
+    Cluster is transformed again in the parent process.
+
+    :param clusters: The input :class:`Cluster`s.
+    :param func: The transformation to be applied to each Cluster.
+    :param workers: (Optional) The number of worker processes. Defaults to 1,
+                    that is a sequential run in the parent process.
+    :returns: A list of lists of :class:`Cluster`s, one per input Cluster.
+    """
+    context = fork_context()
+    if workers <= 1 or len(clusters) <= 1 or context is None:
+        return [func(i) for i in clusters]
+
+    registry = {}
+    for i in clusters:
+        register(i, registry)
+
+    _state.update(func=func, clusters=clusters, registry=registry)
+    pool = context.Pool(min(workers, len(clusters)))
+    try:
+        results = pool.map(_rewrite, range(len(clusters)))
+    finally:
+        pool.terminate()
+        _state.clear()
+
+    return [func(c) if i is None else loads(i, registry)
+            for c, i in zip(clusters, results)]
+
+
+def fork_context():
+    """
+    Return a multiprocessing context using the ``fork`` start method, or None
+    if ``fork`` is unavailable.
+    """
+    if sys.version_info < (3, 4) or os.name != 'posix':
+        return None
+    try:
+        return mp.get_context('fork')
+    except ValueError:
+        return None
+
+
+def register(cluster, registry):
+    """
+    Store all of the symbolic objects reachable from ``cluster`` in ``registry``,
+    a mapper from object ids to objects.
+    """
+    registry[id(cluster)] = cluster
+    registry[id(cluster.ispace)] = cluster.ispace
+
+    dimensions = [i.dim for i in cluster.ispace.intervals]
+    for k, v in cluster.ispace.sub_iterators.items():
+        dimensions.extend([k] + [i.dim for i in v])
+    for expr in cluster.exprs:
+        for i in preorder_traversal(expr):
+            registry[id(i)] = i
+            registry[id(i.func)] = i.func
+            function = getattr(i, 'function', None)
+            if function is not None:
+                registry[id(function)] = function
+            if getattr(i, 'is_Dimension', False):
+                dimensions.append(i)
+
+    for d in dimensions:
+        while d is not None:
+            registry[id(d)] = d
+            d = getattr(d, 'parent', None)
+
+
+def _rewrite(index):
+    """Transform the ``index``-th Cluster in a worker process."""
+    try:
+        processed = _state['func'](_state['clusters'][index])
+        return dumps(processed, {i: i for i in _state['registry']})
+    except Exception:
+        return None
@@ -0,0 +1,98 @@
+from __future__ import absolute_import
+
+import pickle
+from io import BytesIO
+
+from sympy import Add, Mul, Pow
+from sympy.core.relational import Relational
+
+from devito.ir.clusters import Cluster
+from devito.types import AbstractCachedSymbol, Array, IndexedData
+
+__all__ = ['dumps', 'loads']
+
+
+def dumps(obj, pids):
+    """
+    Serialize ``obj``, which may contain Devito symbolic objects.
+
+    :param obj: The object to be serialized.
+    :param pids: A mapper from object ids to persistent ids. The objects in
+                 ``pids`` are serialized as their persistent id, while all
+                 other objects are serialized by value.
+    """
+    handle = BytesIO()
+    _Pickler(handle, pids).dump(obj)
+    return handle.getvalue()
+
+
+def loads(data, objects):
+    """
+    Deserialize an object serialized through :func:`dumps`.
+
+    :param data: The serialized object.
+    :param objects: A mapper from persistent ids to the objects they stand for.
+    """
+    return _Unpickler(BytesIO(data), objects).load()
+
+
+class _Pickler(pickle.Pickler):
+
+    def __init__(self, file, pids):
+        super(_Pickler, self).__init__(file, pickle.HIGHEST_PROTOCOL)
+        self.pids = pids
+        self.dispatch_table = _Reducers()
+
+    def persistent_id(self, obj):
+        return self.pids.get(id(obj))
+
+
+class _Unpickler(pickle.Unpickler):
+
+    def __init__(self, file, objects):
+        super(_Unpickler, self).__init__(file)
+        self.objects = objects
+
+    def persistent_load(self, pid):
+        return self.objects[pid]
+
+
+class _Reducers(object):
+
+    """
+    A pickling dispatch table for the symbolic objects that cannot be pickled
+    by default -- the Devito types, each of which is an instance of a class
+    created on the fly -- or whose default unpickling would alter them -- the
+    SymPy operations, which would be re-evaluated.
+    """
+
+    def __getitem__(self, cls):
+        if issubclass(cls, AbstractCachedSymbol):
+            return lambda i: (_rebuild_symbol, (cls.__bases__[0], i.name, i.dtype))
+        elif issubclass(cls, Array):
+            return lambda i: (_rebuild_array, (i.name, i.dtype, i.shape, i.indices,
+                                               i._external, i._onstack, i._onheap))
+        elif issubclass(cls, IndexedData):
+            return lambda i: (_rebuild_indexed_data, (i.function,))
+        elif issubclass(cls, Cluster):
+            return lambda i: (Cluster, (i.exprs, i.ispace))
+        elif issubclass(cls, (Add, Mul, Pow, Relational)):
+            return lambda i: (_rebuild_unevaluated, (cls, i.args))
+        raise KeyError(cls)
+
+
+def _rebuild_symbol(cls, name, dtype):
+    return cls(name=name, dtype=dtype)
+
+
+def _rebuild_array(name, dtype, shape, dimensions, external, onstack, onheap):
+    return Array(name=name, dtype=dtype, shape=shape, dimensions=dimensions,
+                 external=external, onstack=onstack, onheap=onheap)
+
+
+def _rebuild_indexed_data(function):
+    return function.indexed
+
+
+def _rebuild_unevaluated(cls, args):
+    return cls(*args, evaluate=False)
@@ -1,11 +1,18 @@
 from __future__ import absolute_import
 
+from collections import OrderedDict
+
 from devito.ir.clusters import ClusterGroup, groupby
-from devito.dse.backends import (BasicRewriter, AdvancedRewriter, SpeculativeRewriter,
-                                 AggressiveRewriter, CustomRewriter)
+from devito.dse.backends import (BasicRewriter, AdvancedRewriter,
+                                 AdvancedRewriterSafeMath, SpeculativeRewriter,
+                                 AggressiveRewriter, AutoRewriter, CustomRewriter)
+from devito.dse import cache
+from devito.dse.parallel import parallel_rewrite
 from devito.exceptions import DSEException
 from devito.logger import dse_warning
 from devito.parameters import configuration
+from devito.symbolics import retrieve_indexed
+from devito.types import Array
 
 __all__ = ['rewrite']
 
@@ -13,15 +20,19 @@ __all__ = ['rewrite']
 modes = {
     'basic': BasicRewriter,
     'advanced': AdvancedRewriter,
+    'advanced-safemath': AdvancedRewriterSafeMath,
     'speculative': SpeculativeRewriter,
-    'aggressive': AggressiveRewriter
+    'aggressive': AggressiveRewriter,
+    'auto': AutoRewriter
 }
 """The DSE transformation modes."""
 
 configuration.add('dse', 'advanced', list(modes))
+configuration.add('dse_workers', 1)
+configuration.add('dse_cache', 'memory')
 
 
-def rewrite(clusters, mode='advanced'):
+def rewrite(clusters, mode='advanced', workers=None):
     """
     Transform N :class:`Cluster` objects of SymPy expressions into M
     :class:`Cluster` objects of SymPy expressions with reduced
@@ -29,6 +40,11 @@ def rewrite(clusters, mode='advanced'):
 
     :param clusters: The clusters to be transformed.
     :param mode: drive the expression transformation
+    :param workers: (Optional) The number of processes transforming the
+                    clusters concurrently. Defaults to ``configuration['dse_workers']``.
+
+    The clusters are looked up in the DSE cache before being transformed; see
+    :func:`devito.dse.cache.fetch` for more information.
 
     The ``mode`` parameter recognises the following values: ::
 
@@ -36,7 +52,12 @@ def rewrite(clusters, mode='advanced'):
          * 'basic': Apply common sub-expressions elimination.
          * 'advanced': Apply all transformations that will reduce the
                        operation count w/ minimum increase to the memory pressure,
-                       namely 'basic', factorization, CSRE for time-invariants only.
+                       namely 'basic', factorization, CSRE for time-invariants only,
+                       and the replacement of divisions by loop-invariant
+                       denominators with multiplications by reciprocals.
+         * 'advanced-safemath': Like 'advanced', but without replacing divisions
+                                by multiplications, which may sometimes harm
+                                the numerical precision.
          * 'speculative': Like 'advanced', but apply CSRE also to time-varying
                           sub-expressions, which might further increase the memory
                           pressure.
@@ -44,6 +65,9 @@ def rewrite(clusters, mode='advanced'):
                          sub-expression (i.e., anything that is at least in a
                          sum-of-products form). This may substantially increase
                          the memory pressure.
+         * 'auto': Apply, to each cluster, the mode among 'basic', 'advanced',
+                   'speculative' and 'aggressive' that minimizes a roofline
+                   estimate of the execution time for ``configuration['isa']``.
     """
     if not (mode is None or isinstance(mode, str)):
         raise ValueError("Parameter 'mode' should be a string, not %s." % type(mode))
@@ -51,21 +75,64 @@ def rewrite(clusters, mode='advanced'):
     if mode is None or mode == 'noop':
         return clusters
 
-    processed = ClusterGroup()
-    for cluster in clusters:
+    def _rewrite(cluster):
         if cluster.is_dense:
             if mode in modes:
-                processed.extend(modes[mode]().run(cluster))
+                return modes[mode]().run(cluster)
             else:
                 try:
-                    processed.extend(CustomRewriter().run(cluster))
+                    return CustomRewriter().run(cluster)
                 except DSEException:
                     dse_warning("Unknown rewrite mode(s) %s" % mode)
-                    processed.append(cluster)
+                    return [cluster]
         else:
             # Downgrade sparse clusters to basic rewrite mode since it's
             # pointless to expose loop-redundancies when the iteration space
             # only consists of a few points
-            processed.extend(BasicRewriter(False).run(cluster))
+            return BasicRewriter(False).run(cluster)
+
+    workers = configuration['dse_workers'] if workers is None else workers
+
+    # Rewrite the clusters that have no match in the DSE cache
+    cached = [cache.fetch(i, mode) for i in clusters]
+    missing = [c for c, i in zip(clusters, cached) if i is None]
+    rewritten = iter(parallel_rewrite(missing, _rewrite, workers))
+
+    processed = ClusterGroup()
+    names = set()
+    for cluster, i in zip(clusters, cached):
+        if i is None:
+            i = next(rewritten)
+            cache.store(cluster, mode, i)
+        processed.extend(uniquify(i, names))
 
     return groupby(processed).finalize()
+
+
+def uniquify(clusters, names):
+    """
+    Rename the :class:`Array` temporaries in ``clusters`` clashing with those
+    in ``names``, as distinct Clusters are rewritten independently of each
+    other. ``names`` is updated with the names of the Arrays in ``clusters``.
+    """
+    arrays = OrderedDict()
+    for c in clusters:
+        for e in c.exprs:
+            for i in retrieve_indexed(e.lhs):
+                if i.base.function.is_Array:
+                    arrays[i.base.function] = i.base.function
+
+    mapper = {}
+    for f in arrays:
+        name = f.name
+        while name in names:
+            name = '%s_%d' % (f.name, len(names))
+        names.add(name)
+        if name != f.name:
+            mapper[f.indexed] = Array(name=name, dtype=f.dtype, shape=f.shape,
+                                      dimensions=f.indices, external=f._external,
+                                      onstack=f._onstack, onheap=f._onheap).indexed
+    if not mapper:
+        return clusters
+
+    return [c.rebuild([e.xreplace(mapper) for e in c.exprs]) for c in clusters]
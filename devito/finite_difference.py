@@ -3,12 +3,13 @@ from __future__ import absolute_import
 from functools import reduce
 from operator import mul
 
-from sympy import finite_diff_weights
+from sympy import S, finite_diff_weights
 
 from devito.logger import error
+from devito.tools import memoized_func
 
 __all__ = ['first_derivative', 'second_derivative', 'cross_derivative',
-           'generic_derivative', 'second_cross_derivative',
+           'generic_derivative', 'second_cross_derivative', 'fd_weights',
            'left', 'right', 'centered']
 
 
@@ -61,6 +62,42 @@ right = Side(1)
 centered = Side(0)
 
 
+@memoized_func
+def fd_weights(deriv_order, offsets):
+    """
+    Return the finite-difference weights approximating the ``deriv_order``-th
+    derivative at a grid point from the values at ``offsets``.
+
+    :param deriv_order: Derivative order, eg. 2 for a second derivative.
+    :param offsets: Tuple of stencil positions, in units of grid spacing, wrt.
+                    the grid point. Fractional positions, as used by staggered
+                    grids, are allowed.
+    :returns: A tuple of rational weights, one per offset, for a unit spacing.
+
+    The weights are computed once for each pair (``deriv_order``, ``offsets``),
+    which encodes the finite-difference order, the side and the staggering of
+    the stencil. The weights for a spacing ``h`` are obtained by multiplying
+    the returned ones by ``h**-deriv_order``.
+    """
+    offsets = [S(i) for i in offsets]
+    return tuple(finite_diff_weights(deriv_order, offsets, 0)[-1][-1])
+
+
+def _stencil(args, dim, diff, deriv_order, offsets):
+    """
+    Return the finite-difference approximation of the ``deriv_order``-th
+    derivative wrt. ``dim`` of the product of ``args``, from the values at
+    ``dim + i*diff`` for each ``i`` in ``offsets``.
+    """
+    weights = fd_weights(deriv_order, tuple(offsets))
+    scale = diff**-deriv_order
+    deriv = 0
+    for i, w in zip(offsets, weights):
+        var = [a.xreplace({dim: dim + i * diff}) for a in args]
+        deriv += w * scale * reduce(mul, var, 1)
+    return deriv
+
+
 def second_derivative(*args, **kwargs):
     """Derives second derivative for a product of given functions.
 
@@ -81,16 +118,9 @@ def second_derivative(*args, **kwargs):
     dim = kwargs.get('dim')
     diff = kwargs.get('diff', dim.spacing)
 
-    ind = [(dim + i * diff) for i in range(-int(order / 2),
-                                           int(order / 2) + 1)]
-
-    coeffs = finite_diff_weights(2, ind, dim)[-1][-1]
-    deriv = 0
+    ind = range(-int(order / 2), int(order / 2) + 1)
 
-    for i in range(0, len(ind)):
-            var = [a.subs({dim: ind[i]}) for a in args]
-            deriv += coeffs[i] * reduce(mul, var, 1)
-    return deriv
+    return _stencil(args, dim, diff, 2, ind)
 
 
 def cross_derivative(*args, **kwargs):
@@ -119,30 +149,23 @@ def cross_derivative(*args, **kwargs):
     deriv = 0
 
     # Stencil positions for non-symmetric cross-derivatives with symmetric averaging
-    ind1r = [(dims[0] + i * diff[0])
-             for i in range(-int(order / 2) + 1 - (order < 4),
-                            int((order + 1) / 2) + 2 - (order < 4))]
-    ind2r = [(dims[1] + i * diff[1])
-             for i in range(-int(order / 2) + 1 - (order < 4),
-                            int((order + 1) / 2) + 2 - (order < 4))]
-    ind1l = [(dims[0] - i * diff[0])
-             for i in range(-int(order / 2) + 1 - (order < 4),
-                            int((order + 1) / 2) + 2 - (order < 4))]
-    ind2l = [(dims[1] - i * diff[1])
-             for i in range(-int(order / 2) + 1 - (order < 4),
-                            int((order + 1) / 2) + 2 - (order < 4))]
+    indr = list(range(-int(order / 2) + 1 - (order < 4),
+                      int((order + 1) / 2) + 2 - (order < 4)))
+    indl = [-i for i in indr]
 
     # Finite difference weights from Taylor approximation with this positions
-    c11 = finite_diff_weights(1, ind1r, dims[0])[-1][-1]
-    c21 = finite_diff_weights(1, ind1l, dims[0])[-1][-1]
-    c12 = finite_diff_weights(1, ind2r, dims[1])[-1][-1]
-    c22 = finite_diff_weights(1, ind2l, dims[1])[-1][-1]
+    c11 = [c * diff[0]**-1 for c in fd_weights(1, tuple(indr))]
+    c21 = [c * diff[0]**-1 for c in fd_weights(1, tuple(indl))]
+    c12 = [c * diff[1]**-1 for c in fd_weights(1, tuple(indr))]
+    c22 = [c * diff[1]**-1 for c in fd_weights(1, tuple(indl))]
 
     # Diagonal elements
-    for i in range(0, len(ind1r)):
-        for j in range(0, len(ind2r)):
-            var1 = [a.subs({dims[0]: ind1r[i], dims[1]: ind2r[j]}) for a in args]
-            var2 = [a.subs({dims[0]: ind1l[i], dims[1]: ind2l[j]}) for a in args]
+    for i in range(0, len(indr)):
+        for j in range(0, len(indr)):
+            var1 = [a.xreplace({dims[0]: dims[0] + indr[i] * diff[0],
+                                dims[1]: dims[1] + indr[j] * diff[1]}) for a in args]
+            var2 = [a.xreplace({dims[0]: dims[0] + indl[i] * diff[0],
+                                dims[1]: dims[1] + indl[j] * diff[1]}) for a in args]
             deriv += (.5 * c11[i] * c12[j] * reduce(mul, var1, 1) +
                       .5 * c21[-(j+1)] * c22[-(i+1)] * reduce(mul, var2, 1))
 
@@ -170,25 +193,17 @@ def first_derivative(*args, **kwargs):
     order = int(kwargs.get('order', 1))
     matvec = kwargs.get('matvec', direct)
     side = kwargs.get('side', centered).adjoint(matvec)
-    deriv = 0
     # Stencil positions for non-symmetric cross-derivatives with symmetric averaging
     if side == right:
-        ind = [(dim + i * diff) for i in range(-int(order / 2) + 1 - (order % 2),
-                                               int((order + 1) / 2) + 2 - (order % 2))]
+        ind = [i for i in range(-int(order / 2) + 1 - (order % 2),
+                                int((order + 1) / 2) + 2 - (order % 2))]
     elif side == left:
-        ind = [(dim - i * diff) for i in range(-int(order / 2) + 1 - (order % 2),
-                                               int((order + 1) / 2) + 2 - (order % 2))]
+        ind = [-i for i in range(-int(order / 2) + 1 - (order % 2),
+                                 int((order + 1) / 2) + 2 - (order % 2))]
     else:
-        ind = [(dim + i * diff) for i in range(-int(order / 2),
-                                               int((order + 1) / 2) + 1)]
-    # Finite difference weights from Taylor approximation with this positions
-    c = finite_diff_weights(1, ind, dim)
-    c = c[-1][-1]
+        ind = [i for i in range(-int(order / 2), int((order + 1) / 2) + 1)]
 
-    # Loop through positions
-    for i in range(0, len(ind)):
-            var = [a.subs({dim: ind[i]}) for a in args]
-            deriv += c[i] * reduce(mul, var, 1)
+    deriv = _stencil(args, dim, diff, 1, ind)
     return matvec._transpose*deriv
 
 
@@ -196,8 +211,8 @@ def generic_derivative(function, deriv_order, dim, fd_order):
     """
     Create generic arbitrary order derivative expression from a
     single :class:`Function` object. This methods is essentially a
-    dedicated wrapper around SymPy's `as_finite_diff` utility for
-    :class:`devito.Function` objects.
+    dedicated, cached alternative to SymPy's `as_finite_diff` utility
+    for :class:`devito.Function` objects.
 
     :param function: The symbol representing a function.
     :param deriv_order: Derivative order, eg. 2 for a second derivative.
@@ -206,9 +221,10 @@ def generic_derivative(function, deriv_order, dim, fd_order):
                      the width of the resulting stencil expression.
     """
 
-    deriv = function.diff(*(tuple(dim for _ in range(deriv_order))))
-    indices = [(dim + i * dim.spacing) for i in range(-fd_order, fd_order + 1)]
-    return deriv.as_finite_difference(indices)
+    indices = range(-fd_order, fd_order + 1)
+    if len(indices) < deriv_order + 1:
+        raise ValueError("Too few points for order %d" % deriv_order)
+    return _stencil([function], dim, dim.spacing, deriv_order, indices)
 
 
 def second_cross_derivative(function, dims, order):
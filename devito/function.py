@@ -1,5 +1,6 @@
 from collections import OrderedDict
 from functools import partial
+from itertools import product
 from math import ceil
 
 import sympy
@@ -22,6 +23,25 @@ __all__ = ['Constant', 'Function', 'TimeFunction', 'SparseFunction',
            'Forward', 'Backward', 'CompositeFunction']
 
 
+def memoized_derivative(func):
+    """
+    Decorator. Cache the derivative ``func(self)`` of a :class:`Function`.
+
+    All instances of a Function (e.g., ``u(t, x)`` and ``u(t + dt, x)``) share
+    the same state, hence the cache lives in the Function and is keyed on the
+    instance the derivative is taken from.
+    """
+    def wrapper(self):
+        cache = self.__dict__.setdefault('_derivatives', {})
+        key = (func, self)
+        try:
+            return cache[key]
+        except KeyError:
+            return cache.setdefault(key, func(self))
+    wrapper.__doc__ = func.__doc__
+    return wrapper
+
+
 class TimeAxis(object):
     """Direction in which to advance the time index on
     :class:`TimeFunction` objects.
@@ -205,40 +225,40 @@ class Function(TensorFunction):
         """
         for dim in self.space_dimensions:
             # First derivative, centred
-            dx = partial(first_derivative, order=self.space_order,
-                         dim=dim, side=centered)
+            dx = memoized_derivative(partial(first_derivative, order=self.space_order,
+                                             dim=dim, side=centered))
             setattr(self.__class__, 'd%s' % dim.name,
                     property(dx, 'Return the symbolic expression for '
                              'the centered first derivative wrt. '
                              'the %s dimension' % dim.name))
 
             # First derivative, left
-            dxl = partial(first_derivative, order=self.space_order,
-                          dim=dim, side=left)
+            dxl = memoized_derivative(partial(first_derivative, order=self.space_order,
+                                              dim=dim, side=left))
             setattr(self.__class__, 'd%sl' % dim.name,
                     property(dxl, 'Return the symbolic expression for '
                              'the left-sided first derivative wrt. '
                              'the %s dimension' % dim.name))
 
             # First derivative, right
-            dxr = partial(first_derivative, order=self.space_order,
-                          dim=dim, side=right)
+            dxr = memoized_derivative(partial(first_derivative, order=self.space_order,
+                                              dim=dim, side=right))
             setattr(self.__class__, 'd%sr' % dim.name,
                     property(dxr, 'Return the symbolic expression for '
                              'the right-sided first derivative wrt. '
                              'the %s dimension' % dim.name))
 
             # Second derivative
-            dx2 = partial(generic_derivative, deriv_order=2, dim=dim,
-                          fd_order=int(self.space_order / 2))
+            dx2 = memoized_derivative(partial(generic_derivative, deriv_order=2, dim=dim,
+                                              fd_order=int(self.space_order / 2)))
             setattr(self.__class__, 'd%s2' % dim.name,
                     property(dx2, 'Return the symbolic expression for '
                              'the second derivative wrt. the '
                              '%s dimension' % dim.name))
 
             # Fourth derivative
-            dx4 = partial(generic_derivative, deriv_order=4, dim=dim,
-                          fd_order=max(int(self.space_order / 2), 2))
+            dx4 = memoized_derivative(partial(generic_derivative, deriv_order=4, dim=dim,
+                                              fd_order=max(int(self.space_order / 2), 2)))
             setattr(self.__class__, 'd%s4' % dim.name,
                     property(dx4, 'Return the symbolic expression for '
                              'the fourth derivative wrt. the '
@@ -246,8 +266,8 @@ class Function(TensorFunction):
 
             for dim2 in self.space_dimensions:
                 # First cross derivative
-                dxy = partial(cross_derivative, order=self.space_order,
-                              dims=(dim, dim2))
+                dxy = memoized_derivative(partial(cross_derivative, dims=(dim, dim2),
+                                                  order=self.space_order))
                 setattr(self.__class__, 'd%s%s' % (dim.name, dim2.name),
                         property(dxy, 'Return the symbolic expression for '
                                  'the first cross derivative wrt. the '
@@ -255,8 +275,9 @@ class Function(TensorFunction):
                                  (dim.name, dim2.name)))
 
                 # Second cross derivative
-                dx2y2 = partial(second_cross_derivative, dims=(dim, dim2),
-                                order=self.space_order)
+                dx2y2 = memoized_derivative(partial(second_cross_derivative,
+                                                    dims=(dim, dim2),
+                                                    order=self.space_order))
                 setattr(self.__class__, 'd%s2%s2' % (dim.name, dim2.name),
                         property(dx2y2, 'Return the symbolic expression for '
                                  'the second cross derivative wrt. the '
@@ -457,6 +478,7 @@ class Function(TensorFunction):
                      zip(self.indices, self.staggered))
 
     @property
+    @memoized_derivative
     def laplace(self):
         """
         Generates a symbolic expression for the Laplacian, the second
@@ -634,26 +656,56 @@ class TimeFunction(Function):
         return self.subs(_t, _t - i * _t.spacing)
 
     @property
+    @memoized_derivative
     def dt(self):
         """Symbol for the first derivative wrt the time dimension"""
         _t = self.indices[0]
         if self.time_order == 1:
             # This hack is needed for the first-order diffusion test
-            indices = [_t, _t + _t.spacing]
+            return first_derivative(self, dim=_t, side=right, order=1)
         else:
             width = int(self.time_order / 2)
-            indices = [(_t + i * _t.spacing) for i in range(-width, width + 1)]
-
-        return self.diff(_t).as_finite_difference(indices)
+            return generic_derivative(self, deriv_order=1, dim=_t, fd_order=width)
 
     @property
+    @memoized_derivative
     def dt2(self):
         """Symbol for the second derivative wrt the t dimension"""
         _t = self.indices[0]
         width_t = int(self.time_order / 2)
-        indt = [(_t + i * _t.spacing) for i in range(-width_t, width_t + 1)]
 
-        return self.diff(_t, _t).as_finite_difference(indt)
+        return generic_derivative(self, deriv_order=2, dim=_t, fd_order=width_t)
+
+
+class DerivedFunction(Function):
+    """
+    A :class:`Function` whose data is derived from the data of other
+    :class:`Function`s. The data is lazily recomputed, when passed to
+    an :class:`Operator`, if the data it is derived from has changed.
+
+    :param derive: Callable filling the data, given as a :class:`numpy.ndarray`.
+    :param sources: The :class:`Function`s the data is derived from.
+
+    Any other parameter is as in :class:`Function`.
+    """
+
+    def __init__(self, *args, **kwargs):
+        if not self._cached():
+            super(DerivedFunction, self).__init__(*args, **kwargs)
+            self.derive = kwargs.get('derive')
+            self.sources = tuple(kwargs.get('sources', ()))
+            assert(callable(self.derive))
+            self._snapshot = None
+
+    @property
+    def _data_buffer(self):
+        data = [i.data for i in self.sources]
+        if self._snapshot is None or \
+                any(not np.array_equal(i, j) for i, j in zip(data, self._snapshot)):
+            debug("Recomputing data for %s" % self.name)
+            self.derive(self.data)
+            self._snapshot = [np.array(i) for i in data]
+        return self.data
 
 
 class CompositeFunction(Function):
@@ -685,6 +737,10 @@ class SparseFunction(CompositeFunction):
     :param nt: Size of the time dimension for point data
     :param coordinates: Optional coordinate data for the sparse points
     :param dtype: Data type of the buffered data
+    :param interpolation: (Optional) An :class:`Interpolator`, such as
+                          :class:`SincInterpolator`, whose weights are
+                          precomputed from the coordinates. Defaults to
+                          symbolic multi-linear interpolation.
 
     .. note::
 
@@ -716,6 +772,39 @@ class SparseFunction(CompositeFunction):
             if coordinates is not None:
                 self.coordinates.data[:] = coordinates[:]
 
+            # Grid indices and interpolation coefficients of the sparse points,
+            # computed from the coordinates rather than at each time step
+            # by operators built with ``precompute=True``
+            self.gridpoints = DerivedFunction(name='%s_gridpoints' % self.name,
+                                              dimensions=self.coordinates.indices,
+                                              shape=self.coordinates.shape,
+                                              dtype=np.int32,
+                                              derive=self._derive_gridpoints,
+                                              sources=[self.coordinates])
+            k = Dimension(name='corner')
+            self.interpolation_coeffs = DerivedFunction(
+                name='%s_coeffs' % self.name, dimensions=[self.indices[-1], k],
+                shape=(self.npoint, 2**self.grid.dim), dtype=self.dtype,
+                derive=self._derive_interpolation_coeffs, sources=[self.coordinates]
+            )
+            self._children.extend([self.gridpoints, self.interpolation_coeffs])
+
+            # Numerically precomputed 1D weights of a custom interpolation kernel
+            self.interpolator = kwargs.get('interpolation')
+            self.interpolation_weights = []
+            if self.interpolator is not None:
+                for i, d in enumerate(self.grid.dimensions):
+                    r = Dimension(name='r%s_%s' % (d.name, self.name))
+                    weights = DerivedFunction(
+                        name='%s_w%s' % (self.name, d.name),
+                        dimensions=[self.indices[-1], r],
+                        shape=(self.npoint, len(self.interpolator.offsets)),
+                        dtype=self.dtype, sources=[self.coordinates],
+                        derive=partial(self._derive_interpolation_weights, dim=i)
+                    )
+                    self.interpolation_weights.append(weights)
+                self._children.extend(self.interpolation_weights)
+
     def __new__(cls, *args, **kwargs):
         nt = kwargs.get('nt', 0)
         npoint = kwargs.get('npoint')
@@ -845,6 +934,66 @@ class SparseFunction(CompositeFunction):
                                            self.coordinate_indices,
                                            indices[:self.grid.dim])])
 
+    def _coordinates_to_gridpoints(self):
+        """Numerically evaluate :attr:`coordinate_indices` and
+        :attr:`coordinate_bases` from the coordinate data."""
+        coordinates = self.coordinates.data
+        dtype = coordinates.dtype
+        origin = np.array([o.data for o in self.grid.origin], dtype=dtype)
+        spacing = np.array([d.spacing.data for d in self.grid.dimensions], dtype=dtype)
+        gridpoints = np.floor((coordinates - origin) / spacing).astype(np.int32)
+        bases = (coordinates - (gridpoints * spacing).astype(dtype)).astype(dtype)
+        return gridpoints, bases, spacing
+
+    def _derive_gridpoints(self, data):
+        data[:] = self._coordinates_to_gridpoints()[0]
+
+    def _derive_interpolation_coeffs(self, data):
+        _, bases, spacing = self._coordinates_to_gridpoints()
+        point_symbols = self.point_symbols[:self.grid.dim]
+        spacing_symbols = self.grid.spacing_symbols
+        for i, b in enumerate(self.coefficients):
+            b = b.subs(dict(zip(spacing_symbols, spacing)))
+            evaluate = sympy.lambdify(point_symbols, b, 'numpy')
+            data[:, i] = evaluate(*[bases[:, j] for j in range(self.grid.dim)])
+
+    def _derive_interpolation_weights(self, data, dim):
+        _, bases, spacing = self._coordinates_to_gridpoints()
+        data[:] = self.interpolator.weights(bases[:, dim] / spacing[dim])
+
+    def _interpolation_points(self, offset=0):
+        """The indirection indices and weights of the grid points used by
+        :attr:`interpolator`. If the interpolation is not unrolled, a single
+        pair is returned, indexed by the Dimensions spanning the kernel support."""
+        p_dim = self.indices[-1]
+        ndim = self.grid.dim
+        indices = [self.gridpoints.indexify((p_dim, i)) for i in range(ndim)]
+        weights = self.interpolation_weights
+        if self.interpolator.unroll(ndim):
+            offsets = self.interpolator.offsets
+            support = list(product(*[list(enumerate(offsets))]*ndim))
+        else:
+            r = 1 - self.interpolator.radius
+            support = [tuple((w.indices[-1], w.indices[-1] + r) for w in weights)]
+        index_matrix = [tuple(idx + k + offset for idx, (_, k) in zip(indices, inc))
+                        for inc in support]
+        coefficients = [sympy.Mul(*[w.indexify((p_dim, j))
+                                    for w, (j, _) in zip(weights, inc)])
+                        for inc in support]
+        return index_matrix, coefficients
+
+    def _precomputed(self, offset=0):
+        """The indirection indices and coefficients for the interpolation of the
+        adjacent grid points, read from :attr:`gridpoints` and
+        :attr:`interpolation_coeffs`."""
+        p_dim = self.indices[-1]
+        indices = [self.gridpoints.indexify((p_dim, i)) for i in range(self.grid.dim)]
+        index_matrix = [tuple(idx + ii + offset for ii, idx in zip(inc, indices))
+                        for inc in self.point_increments]
+        coefficients = [self.interpolation_coeffs.indexify((p_dim, i))
+                        for i in range(len(index_matrix))]
+        return index_matrix, coefficients
+
     def interpolate(self, expr, offset=0, **kwargs):
         """Creates a :class:`sympy.Eq` equation for the interpolation
         of an expression onto this sparse point collection.
@@ -856,9 +1005,15 @@ class SparseFunction(CompositeFunction):
                     field data in `expr`.
         :param p_t: (Optional) time index to use for indexing into
                     the sparse point data.
+        :param precompute: (Optional) read the grid indices and the interpolation
+                           coefficients from :attr:`gridpoints` and
+                           :attr:`interpolation_coeffs`, computed once from the
+                           coordinates, rather than recomputing them at each
+                           time step.
         """
         u_t = kwargs.get('u_t', None)
         p_t = kwargs.get('p_t', None)
+        precompute = kwargs.get('precompute', False)
         expr = indexify(expr)
 
         # Apply optional time symbol substitutions to expr
@@ -868,24 +1023,32 @@ class SparseFunction(CompositeFunction):
             expr = expr.subs(t, u_t).subs(time, u_t)
 
         variables = list(retrieve_indexed(expr))
-        # List of indirection indices for all adjacent grid points
-        index_matrix = [tuple(idx + ii + offset for ii, idx
-                              in zip(inc, self.coordinate_indices))
-                        for inc in self.point_increments]
+        if self.interpolator is not None:
+            index_matrix, coefficients = self._interpolation_points(offset)
+        elif precompute:
+            index_matrix, coefficients = self._precomputed(offset)
+        else:
+            # List of indirection indices for all adjacent grid points
+            index_matrix = [tuple(idx + ii + offset for ii, idx
+                                  in zip(inc, self.coordinate_indices))
+                            for inc in self.point_increments]
+            # Substitute coordinate base symbols into the coefficients
+            subs = OrderedDict(zip(self.point_symbols, self.coordinate_bases))
+            coefficients = [b.subs(subs) for b in self.coefficients]
         # Generate index substituions for all grid variables
         idx_subs = []
         for i, idx in enumerate(index_matrix):
             v_subs = [(v, v.base[v.indices[:-self.grid.dim] + idx])
                       for v in variables]
             idx_subs += [OrderedDict(v_subs)]
-        # Substitute coordinate base symbols into the coefficients
-        subs = OrderedDict(zip(self.point_symbols, self.coordinate_bases))
-        rhs = sum([expr.subs(vsub) * b.subs(subs)
-                   for b, vsub in zip(self.coefficients, idx_subs)])
+        rhs = sum([expr.subs(vsub) * b for b, vsub in zip(coefficients, idx_subs)])
         # Apply optional time symbol substitutions to lhs of assignment
         lhs = self if p_t is None else self.subs(self.indices[0], p_t)
 
         cummulative = kwargs.get("cummulative", False)
+        if self.interpolator is not None and not self.interpolator.unroll(self.grid.dim):
+            # Accumulate over the kernel support, spanned by loops
+            return ([] if cummulative else [Eq(lhs, 0.)]) + [Inc(lhs, lhs + rhs)]
         rhs = rhs + lhs if cummulative else rhs
 
         return [Eq(lhs, rhs)]
@@ -899,9 +1062,11 @@ class SparseFunction(CompositeFunction):
                        absorbing boundary conditions.
         :param u_t: (Optional) time index to use for indexing into `field`.
         :param p_t: (Optional) time index to use for indexing into `expr`.
+        :param precompute: (Optional) as in :meth:`interpolate`.
         """
         u_t = kwargs.get('u_t', None)
         p_t = kwargs.get('p_t', None)
+        precompute = kwargs.get('precompute', False)
 
         expr = indexify(expr)
         field = indexify(field)
@@ -913,10 +1078,18 @@ class SparseFunction(CompositeFunction):
         if p_t is not None:
             expr = expr.subs(self.indices[0], p_t)
 
-        # List of indirection indices for all adjacent grid points
-        index_matrix = [tuple(idx + ii + offset for ii, idx
-                              in zip(inc, self.coordinate_indices))
-                        for inc in self.point_increments]
+        subs = OrderedDict(zip(self.point_symbols, self.coordinate_bases))
+        if self.interpolator is not None:
+            index_matrix, coefficients = self._interpolation_points(offset)
+        elif precompute:
+            index_matrix, coefficients = self._precomputed(offset)
+        else:
+            # List of indirection indices for all adjacent grid points
+            index_matrix = [tuple(idx + ii + offset for ii, idx
+                                  in zip(inc, self.coordinate_indices))
+                            for inc in self.point_increments]
+            # Substitute coordinate base symbols into the coefficients
+            coefficients = [b.subs(subs) for b in self.coefficients]
 
         # Generate index substituions for all grid variables except
         # the sparse `SparseFunction` types
@@ -926,8 +1099,5 @@ class SparseFunction(CompositeFunction):
                       for v in variables if not v.base.function.is_SparseFunction]
             idx_subs += [OrderedDict(v_subs)]
 
-        # Substitute coordinate base symbols into the coefficients
-        subs = OrderedDict(zip(self.point_symbols, self.coordinate_bases))
-        return [Inc(field.subs(vsub),
-                    field.subs(vsub) + expr.subs(subs).subs(vsub) * b.subs(subs))
-                for b, vsub in zip(self.coefficients, idx_subs)]
+        return [Inc(field.subs(vsub), field.subs(vsub) + expr.subs(subs).subs(vsub) * b)
+                for b, vsub in zip(coefficients, idx_subs)]
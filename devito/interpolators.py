@@ -0,0 +1,127 @@
+import numpy as np
+
+__all__ = ['LinearInterpolator', 'SincInterpolator']
+
+
+class Interpolator(object):
+
+    """
+    Base class for the interpolation kernels of a :class:`SparseFunction`.
+
+    An interpolation kernel is separable: the weight of a grid point is the
+    product, over all space dimensions, of a 1D weight that only depends on the
+    distance, in grid points, between the sparse point and the grid point.
+    Along each dimension, the ``2*radius`` grid points at the offsets
+    ``-radius + 1, ..., radius`` from the grid point preceding the sparse point
+    are used. The 1D weights are computed numerically, once per set of
+    coordinates, rather than being expressed symbolically.
+
+    :param radius: The half-width, in grid points, of the kernel.
+    :param unroll: (Optional) Fully unroll the interpolation of a sparse point,
+                   rather than generating loops over the kernel support. By
+                   default, the loops are unrolled if the kernel support does
+                   not exceed :attr:`max_unroll` grid points.
+    """
+
+    max_unroll = 16
+    """The largest kernel support, in grid points, unrolled by default."""
+
+    def __init__(self, radius, unroll=None):
+        if radius < 1:
+            raise ValueError("The interpolation radius must be positive")
+        self.radius = radius
+        self._unroll = unroll
+
+    def __repr__(self):
+        return "%s(radius=%d)" % (self.__class__.__name__, self.radius)
+
+    @property
+    def offsets(self):
+        """The offsets, along each dimension, of the grid points used
+        to interpolate a sparse point."""
+        return tuple(range(-self.radius + 1, self.radius + 1))
+
+    def support(self, ndim):
+        """The number of grid points used to interpolate a sparse point
+        in ``ndim`` dimensions."""
+        return len(self.offsets)**ndim
+
+    def unroll(self, ndim):
+        """True if the interpolation of a sparse point should be unrolled."""
+        if self._unroll is None:
+            return self.support(ndim) <= self.max_unroll
+        return self._unroll
+
+    def weights(self, x):
+        """
+        Compute the 1D weights.
+
+        :param x: Array of the normalized distances, in ``[0, 1)``, between
+                  the sparse points and the preceding grid points.
+        :returns: Array of shape ``(len(x), 2*radius)``.
+        """
+        distances = np.array(self.offsets)[None, :] - np.asarray(x)[:, None]
+        return self._kernel(distances)
+
+    def _kernel(self, d):
+        raise NotImplementedError
+
+
+class LinearInterpolator(Interpolator):
+
+    """
+    Multi-linear interpolation, equivalent to the default interpolation
+    of a :class:`SparseFunction`.
+
+    :param unroll: (Optional) As in :class:`Interpolator`.
+    """
+
+    def __init__(self, unroll=None):
+        super(LinearInterpolator, self).__init__(1, unroll)
+
+    def __repr__(self):
+        return "LinearInterpolator()"
+
+    def _kernel(self, d):
+        return np.maximum(0., 1. - np.abs(d))
+
+
+class SincInterpolator(Interpolator):
+
+    """
+    Kaiser-windowed sinc interpolation, as described in: ::
+
+        Hicks, G. J. (2002). Arbitrary source and receiver positioning in
+        finite-difference schemes using Kaiser windowed sinc functions.
+        Geophysics, 67(1), 156-165.
+
+    The interpolation is exact at the grid points, and much more accurate than
+    multi-linear interpolation elsewhere. Note that the grid points up to
+    ``radius`` points away from a sparse point are accessed, which must
+    hence lie in the computational domain (or in the absorbing layers,
+    through the ``offset`` of :meth:`SparseFunction.interpolate` and
+    :meth:`SparseFunction.inject`).
+
+    :param radius: (Optional) The half-width, in grid points, of the kernel.
+                   Defaults to 4.
+    :param beta: (Optional) The shape parameter of the Kaiser window. Defaults
+                 to the optimal value, for the given ``radius``, from Hicks
+                 (2002).
+    :param unroll: (Optional) As in :class:`Interpolator`.
+    """
+
+    _betas = (1.24, 2.94, 4.53, 4.14, 5.26, 6.40, 7.51, 8.56, 9.56, 10.64)
+    """The optimal Kaiser window shape parameter for radii 1 to 10."""
+
+    def __init__(self, radius=4, beta=None, unroll=None):
+        super(SincInterpolator, self).__init__(radius, unroll)
+        if beta is None:
+            beta = self._betas[min(radius, len(self._betas)) - 1]
+        self.beta = beta
+
+    def __repr__(self):
+        return "SincInterpolator(radius=%d, beta=%s)" % (self.radius, self.beta)
+
+    def _kernel(self, d):
+        window = np.sqrt(np.maximum(0., 1. - (d / self.radius)**2))
+        return np.sinc(d) * np.i0(self.beta * window) / np.i0(self.beta)
@@ -5,6 +5,7 @@ from cached_property import cached_property
 
 from devito.ir.support import Space
 from devito.ir.clusters.graph import FlowGraph
+from devito.symbolics import Inc, q_inc
 
 __all__ = ["Cluster", "ClusterGroup"]
 
@@ -67,7 +68,8 @@ class Cluster(PartialCluster):
     """A Cluster is an immutable :class:`PartialCluster`."""
 
     def __init__(self, exprs, ispace):
-        self._exprs = tuple(Eq(*i.args, evaluate=False) for i in exprs)
+        self._exprs = tuple(Inc(*i.args) if q_inc(i) else Eq(*i.args, evaluate=False)
+                            for i in exprs)
         self._ispace = ispace
 
     @cached_property
@@ -87,6 +89,10 @@ class Cluster(PartialCluster):
         Build a new cluster with expressions ``exprs`` having same iteration
         space as ``self``.
         """
+        # Increments are tracked through the written objects, as ``exprs``
+        # might have been obtained through arbitrary symbolic manipulation
+        increments = [i.lhs for i in self.exprs if q_inc(i)]
+        exprs = [Inc(*i.args) if i.lhs in increments else i for i in exprs]
         return Cluster(exprs, self.ispace)
 
     @PartialCluster.exprs.setter
@@ -23,9 +23,11 @@ class Node(Eq):
     def __new__(cls, lhs, rhs, **kwargs):
         reads = kwargs.pop('reads', [])
         readby = kwargs.pop('readby', [])
-        inc = kwargs.pop('inc', False)
+        if kwargs.pop('inc', False):
+            # Increments are tracked through the type, so that they are
+            # preserved when the Node gets rebuilt (e.g., by xreplace)
+            cls = IncrementNode
         obj = super(Node, cls).__new__(cls, lhs, rhs, **kwargs)
-        obj._is_Increment = inc
         obj._reads = set(reads)
         obj._readby = set(readby)
         return obj
@@ -34,10 +36,6 @@ class Node(Eq):
     def function(self):
         return self.lhs.base.function
 
-    @property
-    def is_Increment(self):
-        return self._is_Increment
-
     @property
     def reads(self):
         return self._reads
@@ -62,6 +60,13 @@ class Node(Eq):
         return "Node(key=%s, reads=%s, readby=%s)" % (self.lhs, reads, readby)
 
 
+class IncrementNode(Node):
+
+    """A :class:`Node` performing a linear increment."""
+
+    is_Increment = True
+
+
 class FlowGraph(OrderedDict):
 
     """
@@ -8,9 +8,11 @@ perform actual data dependence analysis.
 from collections import OrderedDict
 from functools import cmp_to_key
 
-from devito.ir.iet import (Iteration, SEQUENTIAL, PARALLEL, VECTOR, WRAPPABLE,
-                           MapIteration, NestedTransformer, retrieve_iteration_tree)
+from devito.ir.iet import (Iteration, SEQUENTIAL, PARALLEL, PARALLEL_IF_ATOMIC,
+                           VECTOR, WRAPPABLE, MapIteration, NestedTransformer,
+                           retrieve_iteration_tree)
 from devito.ir.support import Scope
+from devito.symbolics import q_inc, retrieve_indexed
 from devito.tools import as_tuple, filter_ordered
 
 __all__ = ['iet_analyze']
@@ -23,8 +25,9 @@ class Analysis(object):
         self.properties = OrderedDict()
 
         self.trees = retrieve_iteration_tree(iet)
-        self.scopes = OrderedDict([(k, Scope([i.expr for i in v]))
-                                   for k, v in MapIteration().visit(iet).items()])
+        self.exprs = OrderedDict([(k, [i.expr for i in v])
+                                  for k, v in MapIteration().visit(iet).items()])
+        self.scopes = OrderedDict([(k, Scope(v)) for k, v in self.exprs.items()])
 
     def update(self, properties):
         for k, v in properties.items():
@@ -79,15 +82,59 @@ def mark_parallel(analysis):
             # (d_1, ..., d_{i-1}) > 0, OR
             # (d_1, ..., d_i) = 0
             is_sequential = False
+            is_atomic = False
             for dep in analysis.scopes[i].d_all:
                 if not ((dims[:-1] and any(dep.is_carried(d) for d in dims[:-1])) or
-                        all(dep.is_independent(d) for d in dims)):
+                        all(dep.is_independent(d) for d in dims)) or \
+                        is_aliasing(dep, i.dim):
+                    # Dependences between increments (e.g., A[B[i]] += ...) may
+                    # be honoured through atomic updates
+                    if not i.dim.is_Time and is_reduction(dep, analysis.exprs[i]):
+                        is_atomic = True
+                        continue
                     is_sequential = True
                     break
-            properties[i] = SEQUENTIAL if is_sequential else PARALLEL
+            if is_sequential:
+                properties[i] = SEQUENTIAL
+            elif is_atomic:
+                properties[i] = PARALLEL_IF_ATOMIC
+            else:
+                properties[i] = PARALLEL
     analysis.update(properties)
 
 
+def is_aliasing(dep, dim):
+    """Return True if the entries of ``dep.function`` accessed at distinct
+    iterations along ``dim`` may coincide, even though they are at a null
+    distance, False otherwise. This is the case if ``dim`` only appears in
+    indirection arrays, such as ``A[B[i]] += f(i)`` along ``i``, or does not
+    appear at all, such as ``A[i] += f(i, j)`` along ``j``."""
+    if dim.is_Time or not dep.findices:
+        return False
+    for access in (dep.source, dep.sink):
+        for i in access:
+            direct = i.xreplace({j: 0 for j in retrieve_indexed(i)})
+            if dim in getattr(direct, 'free_symbols', ()):
+                return False
+    return True
+
+
+def is_reduction(dep, exprs):
+    """Return True if ``dep`` is induced by increments of ``dep.function``
+    which commute, such as ``A[B[i]] += f(i)``, False otherwise."""
+    if not dep.is_increment:
+        return False
+    for e in exprs:
+        accesses = [i for i in retrieve_indexed(e, mode='all')
+                    if i.base.function is dep.function]
+        if not accesses:
+            continue
+        # ``dep.function`` may only be accessed by the increment itself
+        if not q_inc(e) or e.lhs not in e.rhs.args or len(accesses) != 2:
+            return False
+    return True
+
+
 @propertizer
 def mark_vectorizable(analysis):
     """Update the ``analysis`` detecting the ``VECTOR`` Iterations within
@@ -10,15 +10,15 @@ from sympy import Eq, Indexed, Symbol
 
 from devito.cgen_utils import ccode
 from devito.ir.iet import (IterationProperty, SEQUENTIAL, PARALLEL,
-                           VECTOR, ELEMENTAL, REMAINDER, WRAPPABLE,
-                           tagger, ntags)
+                           PARALLEL_IF_ATOMIC, VECTOR, ELEMENTAL, REMAINDER, SKEWED,
+                           WRAPPABLE, tagger, ntags)
 from devito.ir.support import Stencil
 from devito.symbolics import as_symbol, retrieve_terminals
 from devito.tools import as_tuple, filter_ordered, filter_sorted, flatten
 import devito.types as types
 
 __all__ = ['Node', 'Block', 'Denormals', 'Expression', 'Element', 'Callable',
-           'Call', 'Iteration', 'List', 'LocalExpression', 'TimedList',
+           'Call', 'Iteration', 'List', 'LocalExpression', 'Increment', 'TimedList',
            'UnboundedIndex', 'MetaCall']
 
 
@@ -171,8 +171,11 @@ class Expression(Node):
 
         # Traverse /expression/ to determine meta information
         # Note: at this point, expressions have already been indexified
-        self.reads = [i for i in retrieve_terminals(self.expr.rhs)
+        self.reads = [i for i in retrieve_terminals(self.expr.rhs, deep=True)
                       if isinstance(i, (types.Indexed, types.Symbol))]
+        if self.expr.lhs.is_Indexed:
+            self.reads += [i for i in retrieve_terminals(self.expr.lhs, deep=True)
+                           if isinstance(i, types.Indexed) and i is not self.expr.lhs]
         self.reads = filter_ordered(self.reads)
         self.functions = [self.write] + [i.base.function for i in self.reads]
         self.functions = filter_ordered(self.functions)
@@ -309,6 +312,10 @@ class Iteration(Node):
     def is_Parallel(self):
         return PARALLEL in self.properties
 
+    @property
+    def is_ParallelAtomic(self):
+        return PARALLEL_IF_ATOMIC in self.properties
+
     @property
     def is_Vectorizable(self):
         return VECTOR in self.properties
@@ -325,6 +332,10 @@ class Iteration(Node):
     def is_Remainder(self):
         return REMAINDER in self.properties
 
+    @property
+    def is_Skewed(self):
+        return SKEWED in self.properties
+
     @property
     def tag(self):
         for i in self.properties:
@@ -516,6 +527,26 @@ class LocalExpression(Expression):
         self.dtype = dtype
 
 
+class Increment(Expression):
+
+    """
+    A node encapsulating a SymPy equation of the form ``lhs = lhs + inc``,
+    generated as an in-place update ``lhs += inc``.
+    """
+
+    def __init__(self, expr, dtype=None):
+        super(Increment, self).__init__(expr, dtype)
+        assert expr.lhs in expr.rhs.args
+
+    @property
+    def increment(self):
+        """
+        Return the value ``inc`` by which the LHS is incremented.
+        """
+        return self.expr.rhs.func(*[i for i in self.expr.rhs.args
+                                    if i != self.expr.lhs])
+
+
 class UnboundedIndex(object):
 
     """
@@ -39,6 +39,10 @@ SEQUENTIAL = IterationProperty('sequential')
 PARALLEL = IterationProperty('parallel')
 """The Iteration can be executed in parallel w/o need for synchronization."""
 
+PARALLEL_IF_ATOMIC = IterationProperty('parallel_if_atomic')
+"""The Iteration can be executed in parallel as long as all of the increments
+it performs (e.g., injection of sparse points into a grid) are atomic."""
+
 VECTOR = IterationProperty('vector-dim')
 """The Iteration can be SIMD-vectorized."""
 
@@ -48,6 +52,11 @@ ELEMENTAL = IterationProperty('elemental')
 REMAINDER = IterationProperty('remainder')
 """The Iteration implements a remainder/peeler loop."""
 
+SKEWED = IterationProperty('skewed')
+"""The Iteration bounds depend on an outer Iteration over time, as a result of
+wavefront temporal blocking; hence, they must be left untouched by other loop
+transformations."""
+
 WRAPPABLE = IterationProperty('wrappable')
 """The Iteration implements modulo buffered iteration and its expressions are so that
 one or more buffer slots can be dropped without affecting correctness. For example,
@@ -177,6 +177,9 @@ class CGen(Visitor):
     def visit_Expression(self, o):
         return c.Assign(ccode(o.expr.lhs), ccode(o.expr.rhs))
 
+    def visit_Increment(self, o):
+        return c.Statement('%s += %s' % (ccode(o.expr.lhs), ccode(o.increment)))
+
     def visit_LocalExpression(self, o):
         return c.Initializer(c.Value(c.dtype_to_ctype(o.dtype),
                              ccode(o.expr.lhs)), ccode(o.expr.rhs))
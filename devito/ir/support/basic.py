@@ -1,6 +1,7 @@
 from cached_property import cached_property
 
 from sympy import Basic, Eq
+from sympy.core.cache import cacheit
 
 from devito.dimension import Dimension
 from devito.symbolics import retrieve_terminals, q_affine, q_inc
@@ -174,11 +175,16 @@ class IterationInstance(Vector):
         obj.findices = tuple(indexed.base.function.indices)
         if len(obj.findices) != len(set(obj.findices)):
             raise ValueError("Illegal non-unique `findices`")
+        # A compact representation of the index functions, used to compare
+        # and compute distances through integer arithmetic rather than SymPy
+        obj.offsets = tuple(split_offset(i) for i in obj)
         return obj
 
     def __eq__(self, other):
-        if isinstance(other, IterationInstance) and self.findices != other.findices:
-            raise TypeError("Cannot compare due to mismatching `findices`")
+        if isinstance(other, IterationInstance):
+            if self.findices != other.findices:
+                raise TypeError("Cannot compare due to mismatching `findices`")
+            return self.offsets == other.offsets
         return super(IterationInstance, self).__eq__(other)
 
     def __ne__(self, other):
@@ -223,7 +229,12 @@ class IterationInstance(Vector):
                 raise TypeError("Cannot compute distance as `findex` not in `findices`")
         else:
             limit = self.rank
-        return super(IterationInstance, self).distance(other)[:limit]
+        ret = []
+        for (b0, o0), (b1, o1), i, j in zip(self.offsets[:limit], other.offsets,
+                                            self, other):
+            # Same base (e.g., `x+2` and `x-1`) => integer distance
+            ret.append(o0 - o1 if b0 == b1 else i - j)
+        return Vector(*ret)
 
     def section(self, findices):
         """Return a view of ``self`` in which the slots corresponding to the
@@ -369,10 +380,11 @@ class TimedAccess(Access):
             raise TypeError("Cannot compare due to mismatching `direction`")
         return super(TimedAccess, self).__lt__(other)
 
-    @property
+    @cached_property
     def index_mode(self):
-        return ['regular' if (is_integer(i) or q_affine(i, fi)) else 'irregular'
-                for i, fi in zip(self, self.findices)]
+        return ['regular' if (b == fi or is_integer(i) or q_affine(i, fi))
+                else 'irregular'
+                for i, (b, _), fi in zip(self, self.offsets, self.findices)]
 
     @property
     def is_regular(self):
@@ -547,7 +559,7 @@ class Scope(object):
         self.writes = {}
         for i, e in enumerate(exprs):
             # reads
-            for j in retrieve_terminals(e.rhs):
+            for j in terminals(e.rhs):
                 v = self.reads.setdefault(j.base.function, [])
                 mode = 'R' if not q_inc(e) else 'RI'
                 v.append(TimedAccess(j, mode, i))
@@ -677,3 +689,30 @@ class Scope(object):
     def d_all(self):
         """Retrieve all flow, anti, and output dependences."""
         return self.d_flow + self.d_anti + self.d_output
+
+
+@cacheit
+def split_offset(index):
+    """
+    Split the index function ``index`` into a 2-tuple ``(base, offset)``, in
+    which ``offset`` is an integer and ``base`` is ``index - offset``. For
+    example, ``x + 2`` is split into ``(x, 2)``, ``3`` into ``(0, 3)``, and
+    ``2*x`` into ``(2*x, 0)``.
+    """
+    if is_integer(index):
+        return 0, int(index)
+    offset, base = index.as_coeff_Add()
+    if offset.is_Integer:
+        return base, int(offset)
+    else:
+        return index, 0
+
+
+@cacheit
+def terminals(expr):
+    """
+    Return the :class:`Indexed` and :class:`Symbol` objects in ``expr``. As the
+    same expressions are repeatedly analyzed (e.g., when the dependences
+    between pairs of expressions are computed), the search is cached.
+    """
+    return tuple(retrieve_terminals(expr))
@@ -64,6 +64,9 @@ class Stencil(DefaultOrderedDict):
             for a in e.indices:
                 if isinstance(a, Dimension):
                     stencil[a].update([0])
+                elif a.is_Indexed:
+                    # Indirect access, handled through the nested Indexeds
+                    continue
                 d = None
                 off = [0]
                 for i in a.args:
@@ -71,6 +74,9 @@ class Stencil(DefaultOrderedDict):
                         d = i
                     elif i.is_integer:
                         off += [int(i)]
+                if any(i.is_Indexed for i in a.args):
+                    # The offset is relative to an indirect access, not to `d`
+                    off = [0]
                 if d is not None:
                     stencil[d].update(off)
 
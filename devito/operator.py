@@ -255,7 +255,7 @@ def retrieve_symbols(expressions):
     Return the :class:`Function` and :class:`Dimension` objects appearing
     in ``expressions``.
     """
-    terms = flatten(retrieve_terminals(i) for i in expressions)
+    terms = flatten(retrieve_terminals(i, deep=True) for i in expressions)
 
     input = []
     for i in terms:
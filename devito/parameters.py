@@ -98,6 +98,8 @@ env_vars_mapper = {
     'DEVITO_PLATFORM': 'platform',
     'DEVITO_BACKEND': 'backend',
     'DEVITO_DSE': 'dse',
+    'DEVITO_DSE_WORKERS': 'dse_workers',
+    'DEVITO_DSE_CACHE': 'dse_cache',
     'DEVITO_DLE': 'dle',
     'DEVITO_DLE_OPTIONS': 'dle_options',
     'DEVITO_OPENMP': 'openmp',
@@ -110,6 +112,13 @@ configuration = Parameters("Devito-Configuration")
 """The Devito configuration parameters."""
 
 
+def _cast(value):
+    try:
+        return eval(value)
+    except (NameError, SyntaxError):
+        return value
+
+
 def init_configuration(configuration=configuration, env_vars_mapper=env_vars_mapper):
     # Populate /configuration/ with user-provided options
     if environ.get('DEVITO_CONFIG') is None:
@@ -126,8 +135,8 @@ def init_configuration(configuration=configuration, env_vars_mapper=env_vars_map
             items = v.split(';')
             # Env variable format: 'var=k1:v1;k2:v2:k3:v3:...'
             keys, values = zip(*[i.split(':') for i in items])
-            # Casting
-            values = [eval(i) for i in values]
+            # Casting (unquoted strings, e.g. 'schedule:dynamic', are left as is)
+            values = [_cast(i) for i in values]
         except AttributeError:
             # Env variable format: 'var=v', 'v' is not a string
             keys = [v]
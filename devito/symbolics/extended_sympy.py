@@ -9,8 +9,9 @@ from sympy.functions.elementary.trigonometric import TrigonometricFunction
 
 from devito.tools import as_tuple
 
-__all__ = ['FrozenExpr', 'Eq', 'Mul', 'Add', 'FunctionFromPointer', 'ListInitializer',
-           'Inc', 'taylor_sin', 'taylor_cos', 'bhaskara_sin', 'bhaskara_cos']
+__all__ = ['FrozenExpr', 'Eq', 'Mul', 'Add', 'Pow', 'FunctionFromPointer',
+           'ListInitializer', 'Inc', 'taylor_sin', 'taylor_cos', 'bhaskara_sin',
+           'bhaskara_cos']
 
 
 class FrozenExpr(Expr):
@@ -74,6 +75,10 @@ class Add(sympy.Add, FrozenExpr):
     pass
 
 
+class Pow(sympy.Pow, FrozenExpr):
+    pass
+
+
 class FunctionFromPointer(sympy.Symbol):
 
     """
@@ -1,17 +1,22 @@
 from collections import OrderedDict
 from operator import attrgetter
 
-from sympy import Indexed, cos, sin
+from sympy import Indexed, S, cos, sin
+from sympy.core.cache import cacheit
 
 from devito.dimension import Dimension
-from devito.symbolics.search import retrieve_indexed, retrieve_ops, search
-from devito.symbolics.queries import q_timedimension
+from devito.symbolics.search import retrieve_indexed, search
+from devito.symbolics.queries import q_leaf, q_timedimension
 from devito.logger import warning
 from devito.tools import flatten, filter_sorted, partial_order
 
 __all__ = ['count', 'estimate_cost', 'estimate_memory', 'dimension_sort']
 
 
+external_functions = {sin: 50, cos: 50}
+"""The approximate operation count of known functions."""
+
+
 def count(exprs, query):
     """
     Return a mapper ``{(k, v)}`` where ``k`` is a sub-expression in ``exprs``
@@ -33,7 +38,6 @@ def estimate_cost(handle, estimate_functions=False):
     :param estimate_functions: approximate the operation count of known
                                functions (eg, sin, cos).
     """
-    external_functions = {sin: 50, cos: 50}
     try:
         # Is it a plain SymPy object ?
         iter(handle)
@@ -52,19 +56,10 @@ def estimate_cost(handle, estimate_functions=False):
         # At this point it must be a list of SymPy objects
         # We don't use SymPy's count_ops because we do not count integer arithmetic
         # (e.g., array index functions such as i+1 in A[i+1])
-        # Also, the routine below is *much* faster than count_ops
+        # Also, the routine below is *much* faster than count_ops, as the
+        # operation count of each sub-expression is cached
         handle = [i.rhs if i.is_Equality else i for i in handle]
-        operations = flatten(retrieve_ops(i) for i in handle)
-        flops = 0
-        for op in operations:
-            if op.is_Function:
-                if estimate_functions:
-                    flops += external_functions.get(op.__class__, 1)
-                else:
-                    flops += 1
-            else:
-                flops += len(op.args) - (1 + sum(True for i in op.args if i.is_Integer))
-        return flops
+        return sum(_analyze(i)[1 if estimate_functions else 0] for i in handle)
     except:
         warning("Cannot estimate cost of %s" % str(handle))
 
@@ -88,14 +83,6 @@ def estimate_memory(handle, mode='realistic'):
     """
     assert mode in ['ideal', 'ideal_with_stores', 'realistic']
 
-    def access(symbol):
-        assert isinstance(symbol, Indexed)
-        # Irregular accesses (eg A[B[i]]) are counted as compulsory traffic
-        if any(i.atoms(Indexed) for i in symbol.indices):
-            return symbol
-        else:
-            return symbol.base
-
     try:
         # Is it a plain SymPy object ?
         iter(handle)
@@ -103,19 +90,69 @@ def estimate_memory(handle, mode='realistic'):
         handle = [handle]
 
     if mode in ['ideal', 'ideal_with_stores']:
-        filter = lambda s: any(q_timedimension(i) for i in s.atoms())
+        filter = lambda timedep: timedep
     else:
-        filter = lambda s: s
-    reads = set(flatten([retrieve_indexed(e.rhs) for e in handle]))
-    writes = set(flatten([retrieve_indexed(e.lhs) for e in handle]))
-    reads = set([access(s) for s in reads if filter(s)])
-    writes = set([access(s) for s in writes if filter(s)])
+        filter = lambda timedep: True
+    reads = set().union(*[_analyze(e.rhs)[2] for e in handle])
+    writes = set().union(*[_analyze(e.lhs)[2] for e in handle])
+    reads = set([s for s, timedep in reads if filter(timedep)])
+    writes = set([s for s, timedep in writes if filter(timedep)])
     if mode == 'ideal':
         return len(set(reads) | set(writes))
     else:
         return len(reads) + len(writes)
 
 
+@cacheit
+def _analyze(expr):
+    """
+    Analyze ``expr`` in a single post-order traversal. Return a 3-tuple: ::
+
+        * the operation count of ``expr``;
+        * the operation count of ``expr``, with known functions (eg, sin, cos)
+          given their approximate cost rather than 1;
+        * the data accessed in ``expr``, as a set of 2-tuples ``(data, timedep)``,
+          where ``data`` is an array accessed through an :class:`Indexed`, or
+          the Indexed itself for irregular accesses (eg A[B[i]]), while
+          ``timedep`` tells whether the access depends on a time dimension.
+
+    The analysis of each sub-expression is cached, so that queries on
+    expressions sharing sub-trees, or repeated over a sequence of rewrites,
+    only visit the new nodes.
+    """
+    if expr.is_Indexed:
+        # Irregular accesses (eg A[B[i]]) are counted as compulsory traffic
+        if any(i.atoms(Indexed) for i in expr.indices):
+            data = expr
+        else:
+            data = expr.base
+        timedep = any(q_timedimension(i) for i in expr.atoms())
+        return 0, 0, frozenset([(data, timedep)])
+    elif q_leaf(expr):
+        return 0, 0, frozenset()
+
+    flops = 0
+    fflops = 0
+    accesses = frozenset()
+    for a in expr.args:
+        i, j, k = _analyze(a)
+        flops += i
+        fflops += j
+        accesses |= k
+
+    if expr.is_Function:
+        flops += 1
+        fflops += external_functions.get(expr.__class__, 1)
+    elif expr.is_Add or expr.is_Mul:
+        # Integer arithmetic (e.g., array index functions such as i+1 in A[i+1])
+        # is not counted
+        handle = len(expr.args) - (1 + sum(True for i in expr.args if i.is_Integer))
+        flops += handle
+        fflops += handle
+
+    return flops, fflops, accesses
+
+
 def dimension_sort(expr, key=None):
     """
     Topologically sort the :class:`Dimension`s in ``expr``, based on the order
@@ -131,6 +168,8 @@ def dimension_sort(expr, key=None):
     for i, constraint in enumerate(list(constraints)):
         normalized = []
         for j in constraint:
+            # Skip the Dimensions of indirection arrays, constrained on their own
+            j = j.xreplace({k: S.Zero for k in retrieve_indexed(j)})
             found = [d for d in j.free_symbols if isinstance(d, Dimension)]
             normalized.extend([d for d in found if d not in normalized])
         constraints[i] = normalized
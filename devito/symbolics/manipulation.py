@@ -3,19 +3,20 @@ from collections import Iterable, OrderedDict
 import sympy
 from sympy import Number, Indexed, Function, Symbol
 
-from devito.symbolics.extended_sympy import Add, Mul, Eq
+from devito.symbolics.extended_sympy import Add, Mul, Pow, Eq
 from devito.symbolics.search import retrieve_indexed, retrieve_functions
 from devito.dimension import Dimension
 from devito.tools import as_tuple, flatten
 
 __all__ = ['freeze_expression', 'xreplace_constrained', 'xreplace_indices',
-           'pow_to_mul', 'as_symbol', 'indexify']
+           'xreplace_zeros', 'pow_to_mul', 'as_symbol', 'indexify']
 
 
 def freeze_expression(expr):
     """
-    Reconstruct ``expr`` turning all :class:`sympy.Mul` and :class:`sympy.Add`
-    into, respectively, :class:`devito.Mul` and :class:`devito.Add`.
+    Reconstruct ``expr`` turning all :class:`sympy.Mul`, :class:`sympy.Add`
+    and :class:`sympy.Pow` into, respectively, :class:`devito.Mul`,
+    :class:`devito.Add` and :class:`devito.Pow`.
     """
     if expr.is_Atom or expr.is_Indexed:
         return expr
@@ -25,6 +26,9 @@ def freeze_expression(expr):
     elif expr.is_Mul:
         rebuilt_args = [freeze_expression(e) for e in expr.args]
         return Mul(*rebuilt_args, evaluate=False)
+    elif expr.is_Pow:
+        rebuilt_args = [freeze_expression(e) for e in expr.args]
+        return Pow(*rebuilt_args, evaluate=False)
     elif expr.is_Equality:
         rebuilt_args = [freeze_expression(e) for e in expr.args]
         return Eq(*rebuilt_args, evaluate=False)
@@ -147,16 +151,63 @@ def xreplace_indices(exprs, mapper, candidates=None, only_rhs=False):
     return replaced if isinstance(exprs, Iterable) else replaced[0]
 
 
+def xreplace_zeros(expr, zeros):
+    """
+    Replace the subexpressions of ``expr`` appearing in ``zeros`` with 0, and
+    drop the terms and factors that consequently vanish. Unlike ``xreplace``,
+    this also applies to frozen expressions. For example, with ``zeros = [a]``: ::
+
+        a*b + c -> c
+        1/(a*b + c) -> 1/c
+    """
+    if expr in zeros:
+        return sympy.S.Zero
+    elif expr.is_Atom or expr.is_Indexed:
+        return expr
+    args = [xreplace_zeros(i, zeros) for i in expr.args]
+    if all(i is j for i, j in zip(args, expr.args)):
+        return expr
+    elif expr.is_Mul and any(i == 0 for i in args):
+        return sympy.S.Zero
+    elif expr.is_Add:
+        args = [i for i in args if i != 0]
+        if len(args) <= 1:
+            return args[0] if args else sympy.S.Zero
+    try:
+        return expr.func(*args, evaluate=False)
+    except TypeError:
+        return expr.func(*args)
+
+
 def pow_to_mul(expr):
+    """
+    Expand the integer and half-integer powers in ``expr`` into products,
+    with at most one square root and one reciprocal. For example: ::
+
+        a**3 -> a*a*a
+        a**(-2) -> 1/(a*a)
+        a**(5/2) -> a*a*sqrt(a)
+    """
     if expr.is_Atom or expr.is_Indexed:
         return expr
     elif expr.is_Pow:
         base, exp = expr.as_base_exp()
-        if exp <= 0:
-            # Cannot handle powers containing non-integer non-positive exponents
-            return expr
+        base = pow_to_mul(base)
+        if not exp.is_Number or int(2*exp) != 2*exp or exp.is_zero:
+            # Cannot handle symbolic or non-half-integer exponents
+            return sympy.Pow(base, exp, evaluate=False)
+        n, half = divmod(abs(int(2*exp)), 2)
+        factors = [base]*n
+        if half:
+            factors.append(sympy.Pow(base, sympy.S.Half, evaluate=False))
+        if len(factors) == 1:
+            handle = factors[0]
+        else:
+            handle = sympy.Mul(*factors, evaluate=False)
+        if exp < 0:
+            return sympy.Pow(handle, -1, evaluate=False)
         else:
-            return sympy.Mul(*[base]*exp, evaluate=False)
+            return handle
     else:
         return expr.func(*[pow_to_mul(i) for i in expr.args], evaluate=False)
 
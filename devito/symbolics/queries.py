@@ -5,7 +5,7 @@ from devito.tools import as_tuple
 
 __all__ = ['q_leaf', 'q_indexed', 'q_terminal', 'q_trigonometry', 'q_op',
            'q_terminalop', 'q_sum_of_product', 'q_indirect', 'q_timedimension',
-           'q_affine', 'q_linear', 'q_identity', 'q_inc',
+           'q_affine', 'q_linear', 'q_identity', 'q_inc', 'q_reciprocal',
            'iq_timeinvariant', 'iq_timevarying']
 
 
@@ -66,6 +66,14 @@ def q_sum_of_product(expr):
     return q_leaf(expr) or q_terminalop(expr) or all(q_terminalop(i) for i in expr.args)
 
 
+def q_reciprocal(expr):
+    """
+    Return True if ``expr`` is a power with a negative numeric exponent, that
+    is a division, False otherwise.
+    """
+    return expr.is_Pow and expr.exp.is_Number and expr.exp < 0
+
+
 def q_indirect(expr):
     """
     Return True if ``indexed`` has indirect accesses, False otherwise.
@@ -27,18 +27,22 @@ class Search(object):
         'all': List
     }
 
-    def __init__(self, query, mode):
+    def __init__(self, query, mode, deep=False):
         """
         Search objects in an expression. This is much quicker than the more
         general SymPy's find.
 
         :param query: Any query from the ``queries`` module.
         :param mode: Either 'unique' or 'all' (catch all instances).
+        :param deep: If True, also search the indices of :class:`Indexed` objects.
         """
         self.query = query
         self.collection = self.modes[mode]
+        self.deep = deep
 
     def _next(self, expr):
+        if self.deep is True and expr.is_Indexed:
+            return expr.indices
         return [] if q_leaf(expr) else expr.args
 
     def dfs(self, expr):
@@ -82,7 +86,7 @@ class Search(object):
         return found
 
 
-def search(expr, query, mode='unique', visit='dfs'):
+def search(expr, query, mode='unique', visit='dfs', deep=False):
     """
     Interface to Search.
     """
@@ -90,7 +94,7 @@ def search(expr, query, mode='unique', visit='dfs'):
     assert mode in Search.modes, "Unknown mode"
     assert visit in ['dfs', 'bfs', 'bfs_first_hit'], "Unknown visit type"
 
-    searcher = Search(query, mode)
+    searcher = Search(query, mode, deep)
     if visit == 'dfs':
         return searcher.dfs(expr)
     elif visit == 'bfs':
@@ -116,11 +120,12 @@ def retrieve_functions(expr, mode='unique'):
     return search(expr, q_function, mode, 'dfs')
 
 
-def retrieve_terminals(expr, mode='unique'):
+def retrieve_terminals(expr, mode='unique', deep=False):
     """
     Shorthand to retrieve :class:`Indexed` and :class:`Symbol` objects in ``expr``.
+    If ``deep`` is True, also retrieve the objects used as (indirect) indices.
     """
-    return search(expr, q_terminal, mode, 'dfs')
+    return search(expr, q_terminal, mode, 'dfs', deep)
 
 
 def retrieve_trigonometry(expr):
@@ -1,4 +1,12 @@
+import os
+import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
 from pyrevolve import Checkpoint, Operator
+
 from devito import TimeFunction
 
 
@@ -72,3 +80,152 @@ class DevitoCheckpoint(Checkpoint):
     def size(self):
         """The memory consumption of the data contained in a checkpoint."""
         return sum([o.size for o in self.objects])
+
+
+class MultiLevelStorage(object):
+    """A two-level (memory + disk) checkpoint storage for pyRevolve.
+
+       pyRevolve accesses its storage as ``storage[key]``, where ``key`` is a
+       checkpoint slot, and uses the returned buffer as the ``ptr`` argument to
+       :meth:`DevitoCheckpoint.save` and :meth:`DevitoCheckpoint.load`. This
+       class provides the same interface, but only keeps ``n_memory``
+       checkpoints in RAM; the others are spilled to files in ``path``.
+
+       The revolve algorithm uses its slots as a stack -- the highest slot in
+       use is always the next one to be restored. Hence, the lowest resident
+       slot is the one spilled to disk when room is needed, and whenever a
+       slot is accessed the slot below it is prefetched into a spare buffer,
+       ahead of the reverse sweep. All disk I/O happens in a background thread.
+
+       :param size: The number of entries in a checkpoint.
+       :param n_checkpoints: The number of checkpoint slots.
+       :param dtype: The data type of a checkpoint.
+       :param n_memory: The number of checkpoints kept in memory.
+       :param path: (Optional) directory for the spilled checkpoints. Defaults
+                    to a new temporary directory, removed by :meth:`close`.
+    """
+
+    def __init__(self, size, n_checkpoints, dtype, n_memory, path=None):
+        if n_memory < 1:
+            raise ValueError("At least one checkpoint must be kept in memory")
+        self.size = size
+        self.n_checkpoints = n_checkpoints
+        self.dtype = dtype
+        self.n_memory = min(n_memory, n_checkpoints)
+
+        self._tmpdir = path is None
+        self.path = tempfile.mkdtemp(prefix='devito-checkpoints-') if path is None \
+            else path
+
+        self._resident = {}
+        self._prefetched = {}
+        self._spilled = set()
+        self._written = set()
+        self._writes = deque()
+        self._free = []
+        self._nbuffers = 0
+
+        # A single worker guarantees that disk operations are executed in
+        # submission order (i.e., a read never overtakes a write)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def __getitem__(self, key):
+        if not 0 <= key < self.n_checkpoints:
+            raise IndexError("Checkpoint slot %d out of range" % key)
+
+        if key in self._resident:
+            buf = self._resident[key]
+        else:
+            if len(self._resident) >= self.n_memory:
+                self._evict()
+            if key in self._prefetched:
+                buf = self._prefetched.pop(key).result()
+            elif key in self._spilled:
+                buf = self._executor.submit(self._read, key, self._acquire()).result()
+            else:
+                buf = self._acquire()
+            self._resident[key] = buf
+            # The caller may overwrite the buffer, so the copy on disk is stale
+            self._spilled.discard(key)
+
+        self._prefetch(key - 1)
+
+        return buf
+
+    def __len__(self):
+        return self.n_checkpoints
+
+    @property
+    def nbytes_memory(self):
+        """The memory consumption of the in-memory checkpoints, in bytes."""
+        return self._nbuffers * self.size * np.dtype(self.dtype).itemsize
+
+    def close(self):
+        """Wait for any pending I/O, then release all resources."""
+        self._executor.shutdown(wait=True)
+        if self._tmpdir:
+            shutil.rmtree(self.path, ignore_errors=True)
+        else:
+            for key in self._written:
+                os.remove(self._filename(key))
+        self._resident.clear()
+        self._prefetched.clear()
+        self._spilled.clear()
+        self._written.clear()
+        self._writes.clear()
+        self._free = []
+
+    def _filename(self, key):
+        return os.path.join(self.path, 'checkpoint%d.bin' % key)
+
+    def _write(self, key, buf):
+        buf.tofile(self._filename(key))
+        return buf
+
+    def _read(self, key, buf):
+        with open(self._filename(key), 'rb') as f:
+            f.readinto(buf)
+        return buf
+
+    def _recycle(self):
+        """Reclaim the buffers of all completed writes."""
+        while self._writes and self._writes[0].done():
+            self._free.append(self._writes.popleft().result())
+
+    def _allocate(self):
+        """Return a spare buffer if one is available without blocking, None
+        otherwise. At most ``n_memory + 1`` buffers are ever allocated."""
+        self._recycle()
+        if self._free:
+            return self._free.pop()
+        elif self._nbuffers <= self.n_memory:
+            self._nbuffers += 1
+            return np.empty(self.size, dtype=self.dtype)
+        return None
+
+    def _acquire(self):
+        """Return a spare buffer, waiting for pending writes if necessary."""
+        buf = self._allocate()
+        if buf is not None:
+            return buf
+        elif self._writes:
+            return self._writes.popleft().result()
+        else:
+            # Sacrifice a prefetched checkpoint, which is also still on disk
+            key = min(self._prefetched)
+            return self._prefetched.pop(key).result()
+
+    def _evict(self):
+        """Spill the lowest resident checkpoint to disk."""
+        key = min(self._resident)
+        buf = self._resident.pop(key)
+        self._spilled.add(key)
+        self._written.add(key)
+        self._writes.append(self._executor.submit(self._write, key, buf))
+
+    def _prefetch(self, key):
+        if key not in self._spilled or key in self._prefetched:
+            return
+        buf = self._allocate()
+        if buf is not None:
+            self._prefetched[key] = self._executor.submit(self._read, key, buf)
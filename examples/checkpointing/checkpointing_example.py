@@ -3,7 +3,9 @@ from cached_property import cached_property
 
 from devito import TimeFunction, silencio
 from examples.seismic.acoustic import GradientOperator
-from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
+from examples.checkpointing.checkpoint import (DevitoCheckpoint, CheckpointOperator,
+                                               MultiLevelStorage)
+from examples.checkpointing.native import NativeRevolver
 from examples.seismic.acoustic.gradient_example import GradientExample
 from pyrevolve import Revolver
 
@@ -25,7 +27,17 @@ class CheckpointingExample(GradientExample):
                                 time_order=self.time_order, spc_order=self.space_order,
                                 save=False)
 
-    def gradient(self, m0, maxmem=None):
+    def gradient(self, m0, maxmem=None, nmemory=None, path=None, native=False):
+        """
+        Compute the gradient through checkpointing. If ``nmemory`` is given,
+        only ``nmemory`` checkpoints are kept in memory, while the others are
+        spilled to disk (in ``path``, if provided) -- see :class:`MultiLevelStorage`.
+        If ``native`` is True, the revolve schedule is executed in C, with a
+        single kernel call per sweep -- see :class:`NativeRevolver`.
+        """
+        if native and nmemory is not None:
+            raise ValueError("Native checkpointing only supports in-memory storage")
+
         cp = DevitoCheckpoint([self.forward_field])
         n_checkpoints = None
         if maxmem is not None:
@@ -37,7 +49,11 @@ class CheckpointingExample(GradientExample):
         wrap_rev = CheckpointOperator(self.gradient_operator, u=self.forward_field,
                                       v=self.adjoint_field, m=m0, rec=self.rec_g,
                                       grad=self.grad, dt=self.dt)
-        wrp = Revolver(cp, wrap_fw, wrap_rev, n_checkpoints, self.nt-self.time_order)
+        revolver = NativeRevolver if native else Revolver
+        wrp = revolver(cp, wrap_fw, wrap_rev, n_checkpoints, self.nt-self.time_order)
+        if nmemory is not None:
+            wrp.storage = MultiLevelStorage(cp.size, wrp.n_checkpoints, cp.dtype,
+                                            nmemory, path)
 
         wrp.apply_forward()
 
@@ -45,16 +61,19 @@ class CheckpointingExample(GradientExample):
 
         wrp.apply_reverse()
 
+        if nmemory is not None:
+            wrp.storage.close()
+
         # The result is in grad
         return self.grad.data, self.rec.data
 
 
 @silencio(log_level='WARNING')
 def run(shape=(150, 150), tn=None, spacing=None, time_order=2, space_order=4, nbpml=10,
-        maxmem=None):
+        maxmem=None, nmemory=None, native=False):
     example = CheckpointingExample(shape, spacing, tn, time_order, space_order, nbpml)
     m0, dm = example.initial_estimate()
-    gradient, rec_data = example.gradient(m0, maxmem)
+    gradient, rec_data = example.gradient(m0, maxmem, nmemory, native=native)
     example.verify(m0, gradient, rec_data, dm)
 
 
@@ -0,0 +1,261 @@
+import ctypes
+from math import factorial
+
+import cgen as c
+import numpy as np
+from cached_property import cached_property
+
+from devito.compiler import jit_compile, load
+from devito.parameters import configuration
+from devito.tools import numpy_to_ctypes
+
+__all__ = ['NativeRevolver', 'revolve_schedule']
+
+
+ADVANCE, TAKESHOT, RESTORE, REVERSE = range(4)
+"""The actions of a revolve schedule."""
+
+
+def beta(s, r):
+    """
+    Return the maximum number of timesteps that can be reversed with ``s``
+    snapshots and ``r`` repetitions (Griewank and Walther, 2000).
+    """
+    return factorial(s + r) // (factorial(s) * factorial(r))
+
+
+def adjust(n_timesteps):
+    """
+    Return a number of snapshots such that the number of repetitions
+    needed to reverse ``n_timesteps`` does not exceed it.
+    """
+    s = 1
+    while beta(s, s) < n_timesteps:
+        s += 1
+    return s
+
+
+def revolve_schedule(n_checkpoints, n_timesteps):
+    """
+    Compute offline the binomial checkpointing schedule reversing ``n_timesteps``
+    with ``n_checkpoints`` snapshots.
+
+    Return a list of ``(action, i0, i1)`` tuples, where ``action`` is one of: ::
+
+        * ADVANCE: Run the forward operator from ``i0`` to ``i1``.
+        * TAKESHOT: Copy the live data into snapshot ``i0``.
+        * RESTORE: Copy snapshot ``i0`` into the live data.
+        * REVERSE: Run the reverse operator from ``i0`` to ``i1 = i0 + 1``.
+
+    As in pyRevolve, a timestep ``t`` is reversed by first advancing the
+    forward computation from ``t`` to ``t + 1``. The first REVERSE marks the
+    end of the forward sweep.
+    """
+    if n_checkpoints < 1:
+        raise ValueError("At least one checkpoint is required")
+
+    actions = [(TAKESHOT, 0, 0)]
+
+    def advance(start, end):
+        if end > start:
+            actions.append((ADVANCE, start, end))
+
+    def reverse(start, end, free, slot):
+        # On entry, the live data is at ``start``, also stored in ``slot``
+        n = end - start
+        if n == 1:
+            advance(start, end)
+            actions.append((REVERSE, start, end))
+        elif free == 0:
+            # No snapshots left -- recompute from ``start`` at each timestep
+            for t in reversed(range(start, end)):
+                advance(start, t)
+                advance(t, t + 1)
+                actions.append((REVERSE, t, t + 1))
+                if t > start:
+                    actions.append((RESTORE, slot, slot))
+        else:
+            r = 0
+            while beta(free, r) < n:
+                r += 1
+            mid = start + min(beta(free, r - 1), n - 1)
+            advance(start, mid)
+            actions.append((TAKESHOT, slot + 1, slot + 1))
+            reverse(mid, end, free - 1, slot + 1)
+            actions.append((RESTORE, slot, slot))
+            reverse(start, mid, free, slot)
+
+    reverse(0, n_timesteps, min(n_checkpoints, n_timesteps) - 1, 0)
+
+    return actions
+
+
+class NativeRevolver(object):
+    """
+    A drop-in replacement for ``pyrevolve.Revolver``, in which each of
+    :meth:`apply_forward` and :meth:`apply_reverse` executes a precomputed
+    revolve schedule through a single call to a JIT-compiled C driver.
+
+    The driver invokes the JIT-compiled functions of the forward and reverse
+    :class:`Operator`s directly and copies snapshots in and out of a storage
+    array with ``memcpy``; hence, no Python code runs between revolve actions.
+
+    :param checkpoint: A :class:`DevitoCheckpoint`.
+    :param fwd_operator: The forward :class:`CheckpointOperator`.
+    :param rev_operator: The reverse :class:`CheckpointOperator`.
+    :param n_checkpoints: The number of snapshots. Automatically determined
+                          if ``None``.
+    :param n_timesteps: The number of timesteps.
+    """
+
+    def __init__(self, checkpoint, fwd_operator, rev_operator, n_checkpoints,
+                 n_timesteps):
+        if n_timesteps is None:
+            raise ValueError("The number of timesteps must be provided")
+
+        self.checkpoint = checkpoint
+        self.fwd_operator = fwd_operator
+        self.rev_operator = rev_operator
+        self.n_timesteps = n_timesteps
+        self.n_checkpoints = min(n_checkpoints or adjust(n_timesteps), n_timesteps)
+
+        actions = revolve_schedule(self.n_checkpoints, n_timesteps)
+        split = [i for i, _, _ in actions].index(REVERSE)
+        self.forward_actions = np.array(actions[:split], dtype=np.int32)
+        self.reverse_actions = np.array(actions[split:], dtype=np.int32)
+
+        self.storage = np.empty((self.n_checkpoints, checkpoint.size),
+                                dtype=checkpoint.dtype)
+
+        self._compiler = configuration['compiler']
+        self._lib = None
+
+    def apply_forward(self):
+        """Run the forward sweep, storing the snapshots."""
+        self._execute(self.forward_actions)
+
+    def apply_reverse(self):
+        """Run the reverse sweep, recomputing the forward trajectory from the
+        snapshots as needed."""
+        self._execute(self.reverse_actions)
+
+    @property
+    def _operators(self):
+        return (('fwd', self.fwd_operator), ('rev', self.rev_operator))
+
+    @cached_property
+    def ccode(self):
+        """The C code of the revolve driver."""
+        t_s, t_e = [self.fwd_operator.t_arg_names[i] for i in ('t_start', 't_end')]
+
+        decls = []
+        body = []
+        calls = {}
+        for prefix, wrapper in self._operators:
+            decls.append(c.Pointer(c.Value('void', '_%s' % prefix)))
+            params = wrapper.op.parameters
+            ctypes_ = []
+            for i in params:
+                name = '%s_%s' % (prefix, i.name)
+                if i.is_ScalarArgument:
+                    ctype = 'const %s' % c.dtype_to_ctype(i.dtype)
+                    decls.append(c.Value(ctype, name))
+                elif i.is_TensorArgument:
+                    ctype = '%s*' % c.dtype_to_ctype(i.dtype)
+                    decls.append(c.Pointer(c.Value(c.dtype_to_ctype(i.dtype), name)))
+                else:
+                    ctype = 'void*'
+                    decls.append(c.Pointer(c.Value('void', name)))
+                ctypes_.append(ctype)
+            body.append(c.Line('typedef int (*%s_t)(%s);' % (prefix, ', '.join(ctypes_))))
+            body.append(c.Initializer(c.Value('%s_t' % prefix, prefix),
+                                      '(%s_t) _%s' % (prefix, prefix)))
+            # The Operator may shift the user-provided time bounds
+            arguments = self._arguments(wrapper)
+            mapper = {t_s: 'i0 + %d' % arguments[t_s],
+                      t_e: 'i1 + %d' % (arguments[t_e] - self.n_timesteps)}
+            args = [mapper.get(i.name, '%s_%s' % (prefix, i.name)) for i in params]
+            calls[prefix] = c.Statement('%s(%s)' % (prefix, ', '.join(args)))
+
+        # Snapshot storage
+        decls.append(c.Pointer(c.Value('char', 'storage')))
+        save, restore = [], []
+        stride = self.checkpoint.size * np.dtype(self.checkpoint.dtype).itemsize
+        offset = 0
+        for n, o in enumerate(self.checkpoint.objects):
+            decls.append(c.Pointer(c.Value('char', 'ckp%d' % n)))
+            nbytes = o.size * np.dtype(o.dtype).itemsize
+            snapshot = 'storage + (size_t)i0*%d + %d' % (stride, offset)
+            save.append(c.Statement('memcpy(%s, ckp%d, %d)' % (snapshot, n, nbytes)))
+            restore.append(c.Statement('memcpy(ckp%d, %s, %d)' % (n, snapshot, nbytes)))
+            offset += nbytes
+
+        # The schedule
+        decls.extend([c.Pointer(c.Value('const int', 'actions')),
+                      c.Value('const int', 'nactions')])
+        schedule = [c.Initializer(c.Value('const int', 'action'), 'actions[3*a]'),
+                    c.Initializer(c.Value('const int', 'i0'), 'actions[3*a + 1]'),
+                    c.Initializer(c.Value('const int', 'i1'), 'actions[3*a + 2]'),
+                    c.If('action == %d' % ADVANCE, c.Block([calls['fwd']])),
+                    c.If('action == %d' % TAKESHOT, c.Block(save)),
+                    c.If('action == %d' % RESTORE, c.Block(restore)),
+                    c.If('action == %d' % REVERSE, c.Block([calls['rev']]))]
+        body.append(c.For('int a = 0', 'a < nactions', 'a += 1', c.Block(schedule)))
+        body.append(c.Statement('return 0'))
+
+        signature = c.FunctionDeclaration(c.Value('int', 'revolve'), decls)
+        cglobals = []
+        if self._compiler.src_ext == 'cpp':
+            cglobals.append(c.Extern('C', signature))
+        return c.Module([c.Include('stdlib.h', system=False),
+                         c.Include('string.h', system=False)] + cglobals +
+                        [c.FunctionBody(signature, c.Block(body))])
+
+    @property
+    def cfunction(self):
+        """The JIT-compiled revolve driver, as a ctypes.FuncPtr object."""
+        if self._lib is None:
+            basename = jit_compile(self.ccode, self._compiler)
+            self._lib = load(basename, self._compiler)
+            self._cfunction = self._lib.revolve
+
+            argtypes = []
+            for _, wrapper in self._operators:
+                argtypes.append(ctypes.c_void_p)
+                for i in wrapper.op.parameters:
+                    if i.is_ScalarArgument:
+                        argtypes.append(numpy_to_ctypes(i.dtype))
+                    elif i.is_TensorArgument:
+                        argtypes.append(np.ctypeslib.ndpointer(dtype=i.dtype, flags='C'))
+                    else:
+                        argtypes.append(ctypes.c_void_p)
+            argtypes.append(np.ctypeslib.ndpointer(dtype=self.checkpoint.dtype,
+                                                   flags='C'))
+            argtypes.extend([np.ctypeslib.ndpointer(dtype=o.dtype, flags='C')
+                             for o in self.checkpoint.objects])
+            argtypes.extend([np.ctypeslib.ndpointer(dtype=np.int32, flags='C'),
+                             ctypes.c_int])
+            self._cfunction.argtypes = argtypes
+
+        return self._cfunction
+
+    def _arguments(self, wrapper):
+        # Derive the Operator arguments once, over the whole time range;
+        # the driver then overrides the time bounds of each action
+        args = wrapper.args.copy()
+        args[wrapper.t_arg_names['t_start']] = 0
+        args[wrapper.t_arg_names['t_end']] = self.n_timesteps
+        return wrapper.op.arguments(**args)
+
+    def _execute(self, actions):
+        cfunction = self.cfunction
+
+        arguments = []
+        for _, wrapper in self._operators:
+            arguments.append(ctypes.cast(wrapper.op.cfunction, ctypes.c_void_p))
+            arguments.extend(self._arguments(wrapper).values())
+        arguments.append(self.storage)
+        arguments.extend([o.data for o in self.checkpoint.objects])
+        arguments.extend([actions, len(actions)])
+
+        cfunction(*arguments)
@@ -65,7 +65,7 @@ def option_performance(f):
         'O3': {'autotune': True, 'dse': 'aggressive', 'dle': 'advanced'},
         # Parametric
         'dse': {'autotune': True,
-                'dse': ['basic', 'advanced', 'aggressive'],
+                'dse': ['basic', 'advanced', 'aggressive', 'auto'],
                 'dle': 'advanced'},
         'dle': {'autotune': True,
                 'dse': 'advanced',
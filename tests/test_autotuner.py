@@ -114,3 +114,40 @@ def test_timesteps_per_at_run():
     temporary_handler.close()
     buffer.flush()
     buffer.close()
+
+
+@silencio(log_level='DEBUG')
+@skipif_yask
+def test_at_openmp_parameters():
+    """
+    Check that the OpenMP chunk size and number of threads are autotuned
+    once the block shape has been determined.
+    """
+    buffer = StringIO()
+    temporary_handler = logging.StreamHandler(buffer)
+    logger.addHandler(temporary_handler)
+
+    shape = (30, 30, 30)
+    grid = Grid(shape=shape)
+
+    infield = Function(name='infield', grid=grid)
+    infield.data[:] = np.arange(reduce(mul, shape), dtype=np.int32).reshape(shape)
+    outfield = Function(name='outfield', grid=grid)
+    stencil = Eq(outfield.indexify(), outfield.indexify() + infield.indexify()*3.0)
+    op = Operator(stencil, dle=('blocking,openmp', {'blockalways': True,
+                                                    'schedule': 'dynamic',
+                                                    'nthreads': 4}))
+    arguments = op.arguments(infield=infield, outfield=outfield, autotune=True)
+    out = [i for i in buffer.getvalue().split('\n') if 'AutoTuner:' in i]
+    assert len([i for i in out if 'Block shape' in i]) == 4
+    assert len([i for i in out if 'chunk_size' in i]) == 7
+    assert len([i for i in out if 'nthreads' in i]) == 3
+    assert arguments['chunk_size'] in (1, 2, 4, 8, 16, 32, 64)
+    assert arguments['nthreads'] in (1, 2, 4)
+
+    logger.removeHandler(temporary_handler)
+
+    temporary_handler.flush()
+    temporary_handler.close()
+    buffer.flush()
+    buffer.close()
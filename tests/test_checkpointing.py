@@ -1,5 +1,8 @@
 from examples.checkpointing.checkpointing_example import CheckpointingExample
-from examples.checkpointing.checkpoint import DevitoCheckpoint, CheckpointOperator
+from examples.checkpointing.checkpoint import (DevitoCheckpoint, CheckpointOperator,
+                                               MultiLevelStorage)
+from examples.checkpointing.native import (NativeRevolver, revolve_schedule, ADVANCE,
+                                           TAKESHOT, RESTORE, REVERSE)
 from examples.seismic.acoustic.acoustic_example import acoustic_setup
 from pyrevolve import Revolver
 import numpy as np
@@ -147,6 +150,108 @@ def test_forward_with_breaks(shape, time_order, space_order):
     assert(np.allclose(rec_temp, example.rec.data))
 
 
+@skipif_yask
+@pytest.mark.parametrize('nmemory', [1, 2, 5])
+def test_multilevel_storage(nmemory, tmpdir):
+    """
+    Test that checkpoints spilled to disk by a :class:`MultiLevelStorage` are
+    read back intact, using a revolve-like (i.e., stack-like) access pattern.
+    """
+    ncheckpoints = 6
+    storage = MultiLevelStorage(10, ncheckpoints, np.float32, nmemory, str(tmpdir))
+
+    # Forward sweep: take all snapshots
+    for i in range(ncheckpoints):
+        storage[i][:] = i
+    assert storage.nbytes_memory <= (nmemory + 1)*10*4
+
+    # Reverse sweep: restore the snapshots, top of the stack first, and
+    # occasionally overwrite a slot as revolve does
+    for i in reversed(range(ncheckpoints)):
+        assert np.all(storage[i] == i)
+        storage[i][:] = -i
+        assert np.all(storage[i] == -i)
+    for i in reversed(range(ncheckpoints)):
+        assert np.all(storage[i] == -i)
+
+    storage.close()
+    assert not tmpdir.listdir()
+
+
+@pytest.mark.parametrize('ncheckpoints, ntimesteps', [
+    (1, 1), (1, 7), (2, 10), (3, 10), (5, 40), (10, 10), (20, 10)
+])
+def test_revolve_schedule(ncheckpoints, ntimesteps):
+    """
+    Simulate a revolve schedule, checking that each timestep is reversed
+    exactly once, in reverse order, with the forward state in the right place.
+    """
+    state = None
+    snapshots = {}
+    reversed_steps = []
+    for action, i0, i1 in revolve_schedule(ncheckpoints, ntimesteps):
+        if action == ADVANCE:
+            assert state == i0 and i1 > i0
+            state = i1
+        elif action == TAKESHOT:
+            assert 0 <= i0 < ncheckpoints
+            snapshots[i0] = state or 0
+            state = snapshots[i0]
+        elif action == RESTORE:
+            state = snapshots[i0]
+        elif action == REVERSE:
+            # Reversing timestep `t` requires the forward state at `t + 1`
+            assert i1 == i0 + 1 and state == i1
+            reversed_steps.append(i0)
+    assert reversed_steps == list(reversed(range(ntimesteps)))
+
+
+@silencio(log_level='WARNING')
+@skipif_yask
+def test_native_index_alignment(const):
+    """
+    As in ``test_index_alignment``, check that the forward and reverse fields
+    are correctly aligned, with the revolve schedule executed in C.
+    """
+    nt = 10
+    grid = Grid(shape=(3, 5))
+    order_of_eqn = 1
+    last_time_step_u = nt - order_of_eqn
+    last_time_step_v = last_time_step_u % (order_of_eqn + 1)
+
+    u = TimeFunction(name='u', grid=grid)
+    v = TimeFunction(name='v', grid=grid)
+    prod = Function(name="prod", grid=grid)
+    fwd_op = Operator(Eq(u.forward, u + 1.*const))
+    rev_op = Operator([Eq(v.backward, v - 1.*const), Eq(prod, prod + u * v)],
+                      time_axis=Backward)
+
+    cp = DevitoCheckpoint([u])
+    wrap_fw = CheckpointOperator(fwd_op, time=nt, constant=1)
+    wrap_rev = CheckpointOperator(rev_op, constant=1)
+    wrp = NativeRevolver(cp, wrap_fw, wrap_rev, 3, nt-order_of_eqn)
+
+    wrp.apply_forward()
+    assert(np.allclose(u.data[last_time_step_v, :, :], nt - order_of_eqn))
+
+    v.data[last_time_step_v, :, :] = u.data[last_time_step_v, :, :]
+    wrp.apply_reverse()
+    assert(np.allclose(v.data[0, :, :], 0))
+    assert(np.allclose(prod.data, sum([n**2 for n in range(nt)])))
+
+
+@silencio(log_level='WARNING')
+@skipif_yask
+@pytest.mark.parametrize('shape', [(70, 80)])
+def test_native_checkpointed_gradient_test(shape):
+    """ Run the gradient test with checkpointing executed natively in C """
+    spacing = tuple([15.0 for _ in shape])
+    example = CheckpointingExample(shape, spacing, 500., 2, 4)
+    m0, dm = example.initial_estimate()
+    gradient, rec_data = example.gradient(m0, maxmem=1, native=True)
+    example.verify(m0, gradient, rec_data, dm)
+
+
 @silencio(log_level='WARNING')
 @skipif_yask
 def test_acoustic_save_and_nosave(shape=(50, 50), spacing=(15.0, 15.0), tn=500.,
@@ -1,9 +1,9 @@
 import numpy as np
 import pytest
 from conftest import skipif_yask
-from sympy import Derivative, simplify
+from sympy import Derivative, Rational, Symbol, finite_diff_weights, simplify
 
-from devito import Grid, Function, TimeFunction
+from devito import Grid, Function, TimeFunction, fd_weights
 
 
 @pytest.fixture
@@ -111,3 +111,34 @@ def test_second_derivatives_space(grid, derivative, dim, order):
     s_expr = u.diff(dim, dim).as_finite_difference(indices)
     assert(simplify(expr - s_expr) == 0)  # Symbolic equality
     assert(expr == s_expr)  # Exact equailty
+
+
+@pytest.mark.parametrize('deriv_order, offsets', [
+    (1, (-1, 0, 1)), (1, (0, 1)), (1, (0, -1, -2)), (2, (-2, -1, 0, 1, 2)),
+    (4, (-2, -1, 0, 1, 2)), (1, (Rational(-1, 2), Rational(1, 2)))
+])
+def test_fd_weights(deriv_order, offsets):
+    """Test the cached finite-difference weights against native sympy"""
+    h = Symbol('h')
+    points = [i*h for i in offsets]
+    expected = finite_diff_weights(deriv_order, points, 0)[-1][-1]
+    weights = fd_weights(deriv_order, offsets)
+    assert all(i*h**-deriv_order == j for i, j in zip(weights, expected))
+    assert fd_weights(deriv_order, offsets) is weights
+
+
+@skipif_yask
+def test_memoized_derivatives(grid):
+    """Test that derivatives are cached per Function instance"""
+    u = TimeFunction(name='u', grid=grid, time_order=2, space_order=4)
+    v = TimeFunction(name='v', grid=grid, time_order=2, space_order=4)
+    assert u.laplace is u.laplace
+    assert u.dx2 is u.dx2
+    assert u.dt2 is u.dt2
+    # Different instances of the same Function
+    assert u.forward.dx2 is not u.dx2
+    t = u.indices[0]
+    assert u.forward.dx2 == u.dx2.subs(t, t + t.spacing)
+    # Different Functions
+    assert v.dx2 is not u.dx2
+    assert len(v.dx2.args) == len(u.dx2.args)
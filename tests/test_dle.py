@@ -9,9 +9,10 @@ from sympy import solve
 
 from conftest import EVAL
 
-from devito.dle import transform
-from devito.dle.backends import DevitoRewriter as Rewriter
-from devito import Grid, Function, TimeFunction, Eq, Operator
+from devito.dle import blockshape_heuristic, transform, wavefront_skew
+from devito.dle.blocking_utils import blocksize_candidates
+from devito.dle.backends import DevitoRewriter as Rewriter, get_cache_size
+from devito import Grid, Function, TimeFunction, SparseFunction, Eq, Operator
 from devito.ir.iet import (ELEMENTAL, Expression, Callable, Iteration, List, tagger,
                            Transformer, FindNodes, iet_analyze, retrieve_iteration_tree)
 
@@ -140,6 +141,55 @@ def _new_operator3(shape, time_order, **kwargs):
     return u.data[1, :], op
 
 
+def _new_operator4(shape, space_order, time_order, **kwargs):
+    grid = Grid(shape=shape)
+    u = TimeFunction(name='u', grid=grid, space_order=space_order,
+                     time_order=time_order)
+    u.data[:] = np.random.RandomState(0).rand(*u.shape)
+    m = Function(name='m', grid=grid)
+    m.data[:] = 1.5
+
+    if time_order == 1:
+        stencil = u + 10*grid.stepping_dim.spacing*m*u.laplace
+    else:
+        stencil = solve(m*u.dt2 - u.laplace, u.forward)[0]
+
+    # Run the operator
+    dle_arguments = {k: kwargs.pop(k) for k in ['time0_tile', 'x0_tile']
+                     if k in kwargs}
+    op = Operator(Eq(u.forward, stencil), **kwargs)
+    op.apply(time=17, dt=0.001, **dle_arguments)
+
+    return u.data, op
+
+
+def _new_operator5(shape, nbpml, regions=False, **kwargs):
+    grid = Grid(shape=shape)
+    u = TimeFunction(name='u', grid=grid, space_order=4, time_order=2)
+    u.data[:] = np.random.RandomState(0).rand(*u.shape)
+    m = Function(name='m', grid=grid)
+    m.data[:] = 1.5
+
+    # A damping field which is zero outside of a boundary layer of width /nbpml/
+    damp = Function(name='damp', grid=grid)
+    for i in range(nbpml):
+        for d in range(len(shape)):
+            index = [slice(None)]*len(shape)
+            index[d] = [i, -(i + 1)]
+            damp.data[tuple(index)] += (nbpml - i) / nbpml
+
+    stencil = solve(m*u.dt2 - u.laplace + damp*u.dt, u.forward)[0]
+
+    # Run the operator
+    if regions:
+        mode, options = kwargs.pop('dle')
+        kwargs['dle'] = (mode, dict(options, regions={damp: nbpml}))
+    op = Operator(Eq(u.forward, stencil), **kwargs)
+    op.apply(time=7, dt=0.001)
+
+    return u.data, op
+
+
 @skipif_yask
 def test_create_elemental_functions_simple(simple_function):
     roots = [i[-1] for i in retrieve_iteration_tree(simple_function)]
@@ -363,6 +413,85 @@ def test_cache_blocking_edge_cases_highorder(shape, blockshape):
     assert np.equal(wo_blocking.data, w_blocking.data).all()
 
 
+@skipif_yask
+def test_cache_blocking_heuristic():
+    assert get_cache_size(2) > 0
+
+    def build(space_order):
+        grid = Grid(shape=(100, 100, 100))
+        u = TimeFunction(name='u', grid=grid, space_order=space_order)
+        op = Operator(Eq(u.forward, u.laplace), dle='noop')
+        # Block along x and y, not along the innermost Dimension
+        return retrieve_iteration_tree(op)[0][1:3]
+
+    low, high = build(2), build(16)
+    smallest, largest = blocksize_candidates[0], blocksize_candidates[-1]
+
+    # The block size shrinks as the cache size decreases ...
+    sizes = [blockshape_heuristic(low, 2**i)(1000) for i in range(14, 26)]
+    assert sizes[0] == smallest and sizes[-1] == largest
+    assert sizes == sorted(sizes)
+    # ... as well as when the stencil radius increases
+    assert blockshape_heuristic(high, 2**20)(1000) <\
+        blockshape_heuristic(low, 2**20)(1000)
+
+    # Blocks never exceed the iteration space
+    heuristic = blockshape_heuristic(low, 2**30)
+    assert heuristic(20) == 20
+    assert heuristic(0) == 1
+
+    # Blocking with the heuristic block shape computes the right thing
+    wo_blocking, _ = _new_operator3((25, 25), time_order=2, dle='noop')
+    w_blocking, op = _new_operator3((25, 25), time_order=2,
+                                    dle=('blocking', {'blockinner': True}))
+    assert all(callable(i.value) for i in op.dle_arguments)
+    assert np.equal(wo_blocking, w_blocking).all()
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape,space_order,time_order,skew", [
+    ((23, 11), 2, 1, 1),
+    ((19, 12, 9), 4, 2, 2),
+    ((31, 9, 8), 8, 2, 4)
+])
+def test_wavefront_skew(shape, space_order, time_order, skew):
+    _, op = _new_operator4(shape, space_order, time_order, dle='noop')
+    tree = retrieve_iteration_tree(op)[-1]
+    assert tree[0].dim.is_Time
+    assert wavefront_skew(tree[0], tree[1]) == skew
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape,space_order,time_order", [
+    ((23, 11), 2, 1),
+    ((19, 12, 9), 4, 2),
+    ((31, 9, 8), 8, 2)
+])
+@pytest.mark.parametrize("tileshape", [(1, 1), (3, 2), (5, 7), (100, 100)])
+def test_wavefront_blocking(shape, space_order, time_order, tileshape):
+    wo_blocking, _ = _new_operator4(shape, space_order, time_order, dle='noop')
+    w_blocking, op = _new_operator4(shape, space_order, time_order,
+                                    dle=('wavefront', {}), time0_tile=tileshape[0],
+                                    x0_tile=tileshape[1])
+
+    assert [i.argument.name for i in op.dle_arguments] == ['time0_tile', 'x0_tile']
+    assert any(i.is_Skewed for i in FindNodes(Iteration).visit(op))
+    assert np.allclose(wo_blocking, w_blocking, rtol=1e-5, atol=1e-5)
+
+
+@skipif_yask
+def test_wavefront_blocking_sparse():
+    grid = Grid(shape=(20, 20))
+    u = TimeFunction(name='u', grid=grid, space_order=2)
+    src = SparseFunction(name='src', grid=grid, npoint=1, nt=10)
+    eqs = [Eq(u.forward, u + u.laplace)] + src.inject(u.forward, expr=src)
+
+    # Sparse point injection happens at every timestep, so it prevents tiling
+    op = Operator(eqs, dle=('wavefront', {}))
+    assert not op.dle_arguments
+    assert not any(i.is_Skewed for i in FindNodes(Iteration).visit(op))
+
+
 @skipif_yask
 @pytest.mark.parametrize('exprs,expected', [
     # trivial 1D
@@ -422,6 +551,153 @@ def test_loops_ompized(fa, fb, fc, fd, t0, t1, t2, t3, exprs, expected, iters):
                 assert 'omp for' not in k.value
 
 
+@skipif_yask
+@pytest.mark.parametrize('options,pragma,region,arguments', [
+    ({}, 'omp for schedule(static)', 'omp parallel', []),
+    ({'chunk': 4}, 'omp for schedule(static,chunk_size)', 'omp parallel',
+     ['chunk_size']),
+    ({'schedule': 'dynamic'}, 'omp for schedule(dynamic,chunk_size)', 'omp parallel',
+     ['chunk_size']),
+    ({'schedule': 'guided', 'nthreads': 6}, 'omp for schedule(guided,chunk_size)',
+     'omp parallel num_threads(nthreads)', ['chunk_size', 'nthreads']),
+    ({'collapse': 1}, 'omp for schedule(static)', 'omp parallel', []),
+    ({'collapse': 8, 'nthreads': 2}, 'omp for collapse(2) schedule(static)',
+     'omp parallel num_threads(nthreads)', ['nthreads']),
+])
+def test_ompize_options(options, pragma, region, arguments):
+    wo_openmp, _ = _new_operator1((10, 31, 45), dle='noop')
+    w_openmp, op = _new_operator1((10, 31, 45), dle=('openmp', options))
+
+    iterations = FindNodes(Iteration).visit(op)
+    assert iterations[0].pragmas[0].value == pragma
+    assert region in str(op)
+    assert [i.argument.name for i in op.dle_arguments] == arguments
+    assert all(i.value in i.candidates for i in op.dle_arguments)
+    assert np.equal(wo_openmp.data, w_openmp.data).all()
+
+
+@skipif_yask
+@pytest.mark.parametrize('precompute', [False, True])
+def test_injection_ompized(precompute):
+    """
+    Test that sparse point injection is parallelized through atomic updates,
+    since different points may increment the same grid point.
+    """
+    grid = Grid(shape=(11, 11))
+    npoint = 50
+    results = []
+    for dle in ['noop', 'openmp']:
+        u = Function(name='u', grid=grid)
+        # Many points sharing the same cells
+        sf = SparseFunction(name='sf', grid=grid, npoint=npoint)
+        sf.coordinates.data[:] = np.linspace(0.1, 0.4, npoint)[:, None]
+        sf.data[:] = np.arange(npoint)
+
+        op = Operator(sf.inject(u, sf, precompute=precompute), dle=dle)
+        op.apply()
+        results.append(u.data.copy())
+
+        iterations = FindNodes(Iteration).visit(op)
+        assert len(iterations) == 1
+        if dle == 'openmp':
+            assert iterations[0].is_ParallelAtomic
+            assert 'omp for' in iterations[0].pragmas[0].value
+            assert str(op).count('omp atomic update') == 2**grid.dim
+    assert np.allclose(*results)
+    assert np.isclose(np.sum(results[0]), np.sum(np.arange(npoint)), rtol=1.e-5)
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape,space_order", [
+    ((23, 17), 4),
+    ((19, 13, 11), 8),
+    ((20, 21, 9), 2)
+])
+@pytest.mark.parametrize("passes", ['unroll', 'blocking,split,unroll'])
+@pytest.mark.parametrize("factor", [2, 3, 4])
+def test_loop_unroll_jam(shape, space_order, passes, factor):
+    wo_unrolling, _ = _new_operator4(shape, space_order, 2, dle='noop')
+    w_unrolling, op = _new_operator4(shape, space_order, 2,
+                                     dle=(passes, {'blockalways': True,
+                                                   'unroll': factor}))
+
+    # Each loop nest is split into an unrolled-and-jammed nest and a remainder nest
+    trees = [i for i in retrieve_iteration_tree(op.body + op.elemental_functions)
+             if len(i) > 1 and FindNodes(Expression).visit(i[-1])]
+    unrolled = [i for i in trees if i[-2].limits[2] == factor]
+    assert len(unrolled) == len(trees) // 2
+    for i in unrolled:
+        exprs = FindNodes(Expression).visit(i[-1])
+        assert len(exprs) % factor == 0
+        for n in range(factor):
+            assert any(i[-2].dim + n in j.output.indices for j in exprs if j.is_tensor)
+    assert np.allclose(wo_unrolling, w_unrolling, rtol=1e-5, atol=1e-5)
+
+
+@skipif_yask
+def test_loop_unroll_jam_collapsed():
+    # Loops collapsed by OpenMP are not unrolled
+    _, op = _new_operator1((10, 31, 45), dle=('openmp,unroll',
+                                              {'collapse': 2, 'unroll': 2}))
+    assert all(i.limits[2] == 1 for i in FindNodes(Iteration).visit(op))
+
+    w_unrolling, op = _new_operator1((10, 31, 45), dle=('openmp,unroll',
+                                                        {'collapse': 1, 'unroll': 2}))
+    assert any(i.limits[2] == 2 for i in FindNodes(Iteration).visit(op))
+
+    wo_unrolling, _ = _new_operator1((10, 31, 45), dle='noop')
+    assert np.equal(wo_unrolling.data, w_unrolling.data).all()
+
+
+@skipif_yask
+@pytest.mark.parametrize("shape", [(20, 18), (19, 17, 15)])
+@pytest.mark.parametrize("dle", [
+    ('advanced', {}),
+    ('advanced', {'blockalways': True}),
+    ('speculative', {}),
+    ('blocking,split,regions', {'blockalways': True}),
+])
+def test_specialize_regions(shape, dle):
+    wo_regions, _ = _new_operator5(shape, 4, dle='noop')
+    w_regions, op = _new_operator5(shape, 4, regions=True, dle=dle)
+
+    # Each loop nest is split into an interior nest, in which `damp` is dropped,
+    # and two boundary nests per dimension
+    trees = [FindNodes(Expression).visit(i[-1]) for i in
+             retrieve_iteration_tree(op.body + op.elemental_functions)]
+    interior = [i for i in trees if i and all('damp' not in str(j.expr) for j in i)]
+    boundary = [i for i in trees if any('damp' in str(j.expr) for j in i)]
+    assert len(interior) > 0
+    assert len(boundary) == 2*len(shape)*len(interior)
+    assert np.allclose(wo_regions, w_regions, rtol=1e-5, atol=1e-5)
+
+
+@skipif_yask
+@pytest.mark.parametrize("passes,distance,expected", [
+    ('blocking,split,prefetch', None, ['u[t0][x][y + 5][z_start]',
+                                       'u[t0][x + 4][y + 1][z_start]',
+                                       'u[t2][x][y + 1][z_start]']),
+    ('blocking,split,prefetch', 3, ['u[t0][x][y + 7][z_start]',
+                                    'u[t0][x - 4][y + 3][z_start]']),
+    ('blocking,split,unroll,prefetch', 2, ['u[t0][x][y + 7][z_start]',
+                                           'u[t0][x][y + 8][z_start]',
+                                           'm[x][y + 3][z_start]']),
+    ('blocking,split,prefetch', False, []),
+])
+def test_prefetch(passes, distance, expected):
+    wo_prefetch, _ = _new_operator4((19, 13, 11), 8, 2, dle='noop')
+    w_prefetch, op = _new_operator4((19, 13, 11), 8, 2,
+                                    dle=(passes, {'blockalways': True, 'unroll': 2,
+                                                  'prefetch': distance}))
+
+    code = str(op)
+    if expected:
+        assert all('__builtin_prefetch(&%s, 0, 3);' % i in code for i in expected)
+    else:
+        assert '__builtin_prefetch' not in code
+    assert np.allclose(wo_prefetch, w_prefetch, rtol=1e-5, atol=1e-5)
+
+
 @skipif_yask
 def test_loop_nofission(simple_function):
     old = Rewriter.thresholds['min_fission'], Rewriter.thresholds['max_fission']
@@ -5,11 +5,18 @@ import numpy as np
 import pytest
 from conftest import x, y, z, time, skipif_yask  # noqa
 
-from devito import Eq  # noqa
+from devito import (Eq, Grid, Function, TimeFunction, Constant, Operator,  # noqa
+                    configuration)
 from devito.ir import Stencil, clusterize, FlowGraph, LoweredEq
-from devito.dse import rewrite, common_subexprs_elimination, collect
+from devito.dse import (rewrite, common_subexprs_elimination, collect,
+                        collect_coefficients)
+from devito.dse import cache
+from devito.dse.backends import AutoRewriter
 from devito.symbolics import (xreplace_constrained, iq_timeinvariant, iq_timevarying,
-                              estimate_cost, pow_to_mul)
+                              estimate_cost, estimate_memory, pow_to_mul,
+                              xreplace_zeros, freeze_expression,
+                              retrieve_indexed)
+from devito.tools import flatten
 from devito.types import Scalar
 from examples.seismic.acoustic import AcousticWaveSolver
 from examples.seismic import demo_model, RickerSource, GaborSource, Receiver
@@ -123,6 +130,60 @@ def test_tti_clusters_to_graph():
     assert all(v.reads or v.readby for v in graph.values())
 
 
+@skipif_yask
+@pytest.mark.parametrize('mode', ['basic', 'aggressive'])
+def test_tti_rewrite_parallel(mode):
+    solver = tti_operator()
+
+    expressions = solver.op_fwd('centered').args['expressions']
+    subs = solver.op_fwd('centered').args['subs']
+    expressions = [LoweredEq(e, subs=subs) for e in expressions]
+
+    configuration['dse_cache'] = 'off'
+    try:
+        sequential = rewrite(clusterize(expressions), mode=mode, workers=1)
+        parallel = rewrite(clusterize(expressions), mode=mode, workers=3)
+    finally:
+        configuration['dse_cache'] = 'memory'
+
+    assert len(sequential) == len(parallel)
+    for c1, c2 in zip(sequential, parallel):
+        assert c1.ispace == c2.ispace
+        assert [str(i) for i in c1.exprs] == [str(i) for i in c2.exprs]
+        assert [estimate_cost(i) for i in c1.exprs] ==\
+            [estimate_cost(i) for i in c2.exprs]
+
+
+@skipif_yask
+def test_tti_rewrite_cached():
+    def lower(solver):
+        expressions = solver.op_fwd('centered').args['expressions']
+        subs = solver.op_fwd('centered').args['subs']
+        return clusterize([LoweredEq(e, subs=subs) for e in expressions])
+
+    cache.clear()
+
+    # Two solvers, hence two sets of Functions, for the same physics
+    clusters1 = lower(tti_operator())
+    clusters2 = lower(tti_operator())
+    assert all(cache.fetch(i, 'aggressive') is None for i in clusters2)
+
+    processed1 = rewrite(clusters1, mode='aggressive')
+    retrieved = [cache.fetch(i, 'aggressive') for i in clusters2]
+    assert all(i is not None for i in retrieved)
+    processed2 = rewrite(clusters2, mode='aggressive')
+
+    assert len(processed1) == len(processed2)
+    functions = {i.base.function for c in clusters2 for e in c.exprs
+                 for i in retrieve_indexed(e)}
+    for c1, c2 in zip(processed1, processed2):
+        assert c1.ispace == c2.ispace
+        assert [str(i) for i in c1.exprs] == [str(i) for i in c2.exprs]
+        # The retrieved Clusters use the Functions of the second solver
+        for i in flatten(retrieve_indexed(e) for e in c2.exprs):
+            assert i.base.function in functions or i.base.function.is_Array
+
+
 @skipif_yask
 def test_tti_rewrite_basic(tti_nodse):
     operator = tti_operator(dse='basic')
@@ -159,10 +220,55 @@ def test_tti_rewrite_aggressive(tti_nodse):
     assert np.allclose(tti_nodse[1].data, rec.data, atol=10e-1)
 
 
+@skipif_yask
+@pytest.mark.parametrize('isa', ['cpp', 'avx512'])
+def test_tti_rewrite_auto(tti_nodse, isa):
+    configuration['isa'] = isa
+    try:
+        operator = tti_operator(dse='auto')
+        rec, u, v, _ = operator.forward()
+    finally:
+        configuration['isa'] = 'cpp'
+
+    assert np.allclose(tti_nodse[0].data, v.data, atol=10e-1)
+    assert np.allclose(tti_nodse[1].data, rec.data, atol=10e-1)
+
+
+@skipif_yask
+@pytest.mark.parametrize('isa,expected', [
+    ('cpp', 'AggressiveRewriter'), ('avx512', 'AdvancedRewriter')
+])
+def test_auto_rewriter_selection(isa, expected):
+    solver = tti_operator()
+
+    expressions = solver.op_fwd('shifted').args['expressions']
+    subs = solver.op_fwd('shifted').args['subs']
+    expressions = [LoweredEq(e, subs=subs) for e in expressions]
+    main_cluster = clusterize(expressions)[0]
+
+    configuration['isa'] = isa
+    try:
+        selected = AutoRewriter(False).run(main_cluster)
+    finally:
+        configuration['isa'] = 'cpp'
+
+    # The selected candidate minimizes the roofline estimate
+    peak, bandwidth = AutoRewriter.machines[isa]
+    scores = {}
+    for rewriter in AutoRewriter.candidates:
+        processed = rewriter(False).run(main_cluster)
+        flops, traffic = AutoRewriter()._estimate(main_cluster, processed)
+        scores[rewriter.__name__] = max(flops / peak, traffic / bandwidth)
+        if rewriter.__name__ == expected:
+            assert [str(i) for i in flatten(c.exprs for c in processed)] ==\
+                [str(i) for i in flatten(c.exprs for c in selected)]
+    assert scores[expected] == min(scores.values())
+
+
 @skipif_yask
 @pytest.mark.parametrize('kernel,space_order,expected', [
-    ('shifted', 8, 355), ('shifted', 16, 811),
-    ('centered', 8, 168), ('centered', 16, 300)
+    ('shifted', 8, 352), ('shifted', 16, 808),
+    ('centered', 8, 165), ('centered', 16, 297)
 ])
 def test_tti_rewrite_aggressive_opcounts(kernel, space_order, expected):
     operator = tti_operator(dse='aggressive', space_order=space_order)
@@ -170,6 +276,65 @@ def test_tti_rewrite_aggressive_opcounts(kernel, space_order, expected):
     assert summary['main'].ops == expected
 
 
+@skipif_yask
+def test_extract_reciprocals():
+    grid = Grid(shape=(6, 6))
+    f = Function(name='f', grid=grid)
+    g = Function(name='g', grid=grid)
+    c = Constant(name='c')
+    f.data[:] = 2.
+    g.data[:] = 3.
+    c.data = 4.
+
+    results = []
+    for dse in ['advanced-safemath', 'advanced']:
+        u = TimeFunction(name='u', grid=grid)
+        u.data[:] = 1.
+        op = Operator(Eq(u.forward, u/(f + g) + u/c**2 + u*f**(-3)), dse=dse)
+        op.apply(time=3)
+        results.append((str(op.ccode), u.data.copy()))
+
+    # The reciprocals are computed outside of the time loop, either in
+    # time-invariant Arrays or in scalar temporaries
+    (safe, ref), (code, data) = results
+    assert 'rcp' not in safe
+    assert 'rcp0[x][y] = 1.0F/(f[x][y] + g[x][y]);' in code
+    assert 'rcp1[x][y] = 1.0F/f[x][y];' in code
+    assert 'float rcp2 = 1.0F/c;' in code
+    assert code.index('rcp1[x][y] = ') < code.index('for (int time')
+    assert np.allclose(ref, data, rtol=1e-6)
+
+
+@skipif_yask
+@pytest.mark.parametrize('dse', ['advanced-safemath', 'advanced', 'aggressive'])
+def test_symbolic_spacing_divisions(dse):
+    grid = Grid(shape=(8, 8, 8), extent=(7., 14., 21.))
+    m = Function(name='m', grid=grid)
+    m.data[:] = 2.
+
+    results = []
+    for mode in ['noop', dse]:
+        u = TimeFunction(name='u', grid=grid, space_order=4)
+        u.data[:, 4, 4, 4] = 1.
+        op = Operator(Eq(u.forward, 2*u - u.backward + u.laplace/m), dse=mode)
+        op.apply(time=6)
+        results.append(u.data.copy())
+
+    assert np.allclose(*results, rtol=1e-5)
+
+
+@skipif_yask
+@pytest.mark.parametrize('space_order,expected', [(8, 47), (16, 83)])
+def test_laplace_symmetric_opcounts(space_order, expected):
+    grid = Grid(shape=(4, 4, 4))
+    u = TimeFunction(name='u', grid=grid, space_order=space_order)
+
+    # The symmetric pairs are collected even though the grid spacing is symbolic
+    clusters = clusterize([LoweredEq(Eq(u.forward, u.laplace))])
+    processed = rewrite(clusters, mode='advanced')
+    assert sum(estimate_cost(c.exprs) for c in processed) == expected
+
+
 # DSE manipulation
 
 @skipif_yask
@@ -235,11 +400,19 @@ def test_xreplace_constrained_time_varying(tu, tv, tw, ti0, ti1, t0, t1,
     # intersecting
     pytest.mark.xfail((['Eq(tu, ti0*ti1 + ti0*ti1*t0 + ti0*ti1*t0*t1)'],
                        ['ti0*ti1', 'r0', 'r0*t0', 'r0*t0*t1'])),
+    # nested
+    (['Eq(tu, (tv + tw)*(ti0 + ti1)*t0 + (tv + tw)*(ti0 + ti1)*t1 + (tv + tw)*t0)'],
+     ['ti0[x, y, z] + ti1[x, y, z]', 'tv[t, x, y, z] + tw[t, x, y, z]',
+      'r0*r1*t0 + r0*r1*t1 + r1*t0']),
+    # index arithmetic
+    (['Eq(t0, fc[x + 1, y]*(x + 1) + fc[x, y + 1]*(x + 1) + fa[x + 1])'],
+     ['x + 1', 'r0*fc[x, y + 1] + r0*fc[x + 1, y] + fa[x + 1]']),
 ])
-def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, exprs, expected):
+def test_common_subexprs_elimination(tu, tv, tw, ti0, ti1, t0, t1, fa, fc, exprs,
+                                     expected):
     make = lambda i: Scalar(name='r%d' % i).indexify()
-    processed = common_subexprs_elimination(EVAL(exprs, tu, tv, tw, ti0, ti1, t0, t1),
-                                            make)
+    processed = common_subexprs_elimination(EVAL(exprs, tu, tv, tw, ti0, ti1, t0, t1,
+                                                 fa, fc), make)
     assert len(processed) == len(expected)
     assert all(str(i.rhs) == j for i, j in zip(processed, expected))
 
@@ -291,14 +464,47 @@ def test_graph_isindex(fa, fb, fc, t0, t1, t2, exprs, expected):
     ('fa[x]**2 + fb[x]**3', 'fa[x]*fa[x] + fb[x]*fb[x]*fb[x]'),
     ('3*fa[x]**4', '3*(fa[x]*fa[x]*fa[x]*fa[x])'),
     ('fa[x]**2', 'fa[x]*fa[x]'),
-    ('1/(fa[x]**2)', 'fa[x]**(-2)'),
+    ('1/(fa[x]**2)', '1/(fa[x]*fa[x])'),
     ('1/(fa[x] + fb[x])', '1/(fa[x] + fb[x])'),
     ('3*sin(fa[x])**2', '3*(sin(fa[x])*sin(fa[x]))'),
+    ('fa[x]**2.5', 'sqrt(fa[x])*fa[x]*fa[x]'),
+    ('fa[x]**(-1.5)', '1/(sqrt(fa[x])*fa[x])'),
+    ('fa[x]**0.3', 'fa[x]**0.3'),
+    ('fa[x]**fb[x]', 'fa[x]**fb[x]'),
 ])
 def test_pow_to_mul(fa, fb, expr, expected):
     assert str(pow_to_mul(eval(expr))) == expected
 
 
+@skipif_yask
+@pytest.mark.parametrize('expr,expected', [
+    ('2*fa[x] + fb[x]', 'fb[x]'),
+    ('fa[x + 1] + fb[x]', 'fa[x + 1] + fb[x]'),
+    ('fa[x]*fb[x]', '0'),
+    ('1/(3*fa[x] + 2*fb[x])', '1/(2*fb[x])'),
+    ('3*fb[x]*(fa[x] + fb[x])', '3*fb[x]*fb[x]'),
+    ('sin(fa[x]*fb[x] + fb[x])', 'sin(fb[x])'),
+])
+def test_xreplace_zeros(fa, fb, expr, expected):
+    assert str(xreplace_zeros(eval(expr), [fa[x]])) == expected
+    assert str(xreplace_zeros(freeze_expression(eval(expr)), [fa[x]])) == expected
+
+
+@skipif_yask
+@pytest.mark.parametrize('expr,expected,cost', [
+    ('fa[x-1] + fa[x+1] - 2*fa[x]', 'fa[x - 1] + fa[x + 1] - 2*fa[x]', 2),
+    ('t0*fa[x-1] - 2*t0*fa[x] + t0*fa[x+1]', 't0*(fa[x - 1] + fa[x + 1] - 2*fa[x])', 3),
+    ('0.5*t0*fa[x+1] - 0.5*t0*fa[x-1]', '0.5*t0*(-fa[x - 1] + fa[x + 1])', 3),
+    ('t0*fa[x+1]/12 + t0*fa[x-1]/12 + t1*fb[x]',
+     't0*(fa[x - 1] + fa[x + 1])/12 + t1*fb[x]', 5),
+    ('t0*t1*fa[x] + t0*t1*fb[x] + t1*fb[x+1]', 't0*t1*(fa[x] + fb[x]) + t1*fb[x + 1]', 5),
+])
+def test_collect_coefficients(fa, fb, t0, t1, expr, expected, cost):
+    handle = collect_coefficients(EVAL(expr, fa, fb, t0, t1))
+    assert str(handle) == expected
+    assert estimate_cost(handle) == cost
+
+
 @skipif_yask
 @pytest.mark.parametrize('exprs,expected', [
     # none (different distance)
@@ -351,3 +557,21 @@ def test_collect_aliases(fa, fb, fc, fd, t0, t1, t2, t3, exprs, expected):
 def test_estimate_cost(fa, fb, fc, t0, t1, t2, expr, expected):
     # Note: integer arithmetic isn't counted
     assert estimate_cost(EVAL(expr, fa, fb, fc, t0, t1, t2)) == expected
+
+
+@skipif_yask
+@pytest.mark.parametrize('expr,mode,expected', [
+    ('Eq(tu, tv + tw + ti0)', 'realistic', 4),
+    ('Eq(tu, tv + tw + ti0)', 'ideal', 3),
+    ('Eq(tu, tu + ti0*fa[x])', 'realistic', 4),
+    ('Eq(tu, tu + ti0*fa[x])', 'ideal', 1),
+    ('Eq(tu, tu + ti0*fa[x])', 'ideal_with_stores', 2),
+    ('Eq(ti0, fa[fb[x]] + fa[x])', 'realistic', 3),
+    ('Eq(ti0, fa[fb[x]] + fa[x])', 'ideal', 0),
+    ('[Eq(tu, tu + ti0*fa[x]), Eq(tv, fa[x] + tw)]', 'realistic', 6),
+])
+def test_estimate_memory(tu, tv, tw, ti0, fa, fb, expr, mode, expected):
+    exprs = EVAL(expr, tu, tv, tw, ti0, fa, fb)
+    assert estimate_memory(exprs, mode) == expected
+    # Repeated queries are answered from the cache
+    assert estimate_memory(exprs, mode) == expected
@@ -3,7 +3,8 @@ import pytest
 from conftest import skipif_yask
 
 from devito.cgen_utils import FLOAT
-from devito import Grid, Operator, Function, SparseFunction
+from devito import (Grid, Operator, Function, SparseFunction, LinearInterpolator,
+                    SincInterpolator)
 
 
 @pytest.fixture
@@ -25,11 +26,12 @@ def unit_box(name='a', shape=(11, 11)):
     return a
 
 
-def points(grid, ranges, npoints, name='points'):
+def points(grid, ranges, npoints, name='points', interpolation=None):
     """Create a set of sparse points from a set of coordinate
     ranges for each spatial dimension.
     """
-    points = SparseFunction(name=name, grid=grid, npoint=npoints)
+    points = SparseFunction(name=name, grid=grid, npoint=npoints,
+                            interpolation=interpolation)
     for i, r in enumerate(ranges):
         points.coordinates.data[:, i] = np.linspace(r[0], r[1], npoints)
     return points
@@ -147,3 +149,113 @@ def test_adjoint_inject_interpolate(shape, coords,
     term1 = np.dot(p2.data.reshape(-1), p.data.reshape(-1))
     term2 = np.dot(c.data.reshape(-1), a.data.reshape(-1))
     assert np.isclose((term1-term2) / term1, 0., atol=1.e-6)
+
+
+@skipif_yask
+@pytest.mark.parametrize('shape, coords', [
+    ((11, 11), [(.05, .9), (.01, .8)]),
+    ((11, 11, 11), [(.05, .9), (.01, .8), (0.07, 0.84)])
+])
+def test_interpolate_precompute(shape, coords, npoints=20):
+    """Test point interpolation with grid indices and coefficients precomputed
+    from the coordinates, which are recomputed if the coordinates change.
+    """
+    a = unit_box(shape=shape)
+    p = points(a.grid, coords, npoints=npoints)
+
+    expr = p.interpolate(a, precompute=True)
+    op = Operator(expr)
+    op(a=a)
+    assert np.allclose(p.data[:], p.coordinates.data[:, 0], rtol=1e-6)
+
+    p.coordinates.data[:] = p.coordinates.data[::-1]
+    op(a=a)
+    assert np.allclose(p.data[:], p.coordinates.data[:, 0], rtol=1e-6)
+
+
+@skipif_yask
+@pytest.mark.parametrize('shape, coords, result', [
+    ((11, 11), [(.05, .95), (.45, .45)], 1.),
+    ((11, 11, 11), [(.05, .95), (.45, .45), (.45, .45)], 0.5)
+])
+def test_inject_precompute(shape, coords, result, npoints=19):
+    """Test point injection with grid indices and coefficients precomputed
+    from the coordinates.
+    """
+    a = unit_box(shape=shape)
+    a.data[:] = 0.
+    p = points(a.grid, ranges=coords, npoints=npoints)
+
+    expr = p.inject(a, FLOAT(1.), precompute=True)
+
+    Operator(expr)(a=a)
+
+    indices = [slice(4, 6, 1) for _ in coords]
+    indices[0] = slice(1, -1, 1)
+    assert np.allclose(a.data[indices], result, rtol=1.e-5)
+
+
+def smooth_field(name='a', shape=(21, 21)):
+    """Create a field sampling a smooth function of the x-coordinate
+    over the unit box."""
+    grid = Grid(shape=shape)
+    a = Function(name=name, grid=grid)
+    xarr = np.linspace(0., 1., shape[0])
+    a.data[:] = np.sin(2*np.pi*xarr).reshape((-1,) + (1,)*(len(shape) - 1))
+    return a
+
+
+@skipif_yask
+@pytest.mark.parametrize('shape, interpolator', [
+    ((21, 21), LinearInterpolator()),
+    ((21, 21), LinearInterpolator(unroll=False)),
+    ((21, 21), SincInterpolator(radius=3)),
+    ((21, 21), SincInterpolator(radius=4, unroll=True)),
+    ((21, 21, 21), LinearInterpolator()),
+    ((21, 21, 21), SincInterpolator(radius=3)),
+])
+def test_interpolate_kernel(shape, interpolator, npoints=20):
+    """Test point interpolation with numerically precomputed kernel weights,
+    which must be exact at the grid points and at least as accurate as
+    the default multi-linear interpolation elsewhere.
+    """
+    a = smooth_field(shape=shape)
+    coords = [(.3, .7)] + [(.35, .65)]*(len(shape) - 1)
+    p = points(a.grid, coords, npoints=npoints, interpolation=interpolator)
+    p_ref = points(a.grid, coords, npoints=npoints, name='ref')
+
+    op = Operator(p.interpolate(a) + p_ref.interpolate(a))
+    op(a=a)
+    exact = np.sin(2*np.pi*p.coordinates.data[:, 0])
+    assert np.max(np.abs(p.data - exact)) <= np.max(np.abs(p_ref.data - exact)) + 1e-6
+
+    # Move the points onto grid points
+    p.coordinates.data[:] = np.round(p.coordinates.data * 20) / 20
+    op(a=a)
+    exact = np.sin(2*np.pi*p.coordinates.data[:, 0])
+    assert np.allclose(p.data, exact, atol=1e-5)
+
+
+@skipif_yask
+@pytest.mark.parametrize('shape, interpolator', [
+    ((21, 21), SincInterpolator(radius=2)),
+    ((21, 21), SincInterpolator(radius=4)),
+    ((21, 21, 21), SincInterpolator(radius=3)),
+])
+def test_adjoint_inject_interpolate_kernel(shape, interpolator, npoints=19):
+    """Test that injection is the adjoint of interpolation with numerically
+    precomputed kernel weights."""
+    a = unit_box(shape=shape)
+    a.data[:] = 0.
+    c = unit_box(shape=shape, name='c')
+    c.data[:] = np.random.rand(*shape)
+    coords = [(.3, .7)] + [(.35, .65)]*(len(shape) - 1)
+    p = points(a.grid, coords, npoints=npoints, interpolation=interpolator)
+    p.data[:] = np.random.rand(npoints)
+    p2 = points(a.grid, coords, npoints=npoints, name='points2',
+                interpolation=interpolator)
+    Operator(p.inject(field=a, expr=p) + p2.interpolate(expr=c))(a=a, c=c)
+
+    term1 = np.dot(p2.data.reshape(-1), p.data.reshape(-1))
+    term2 = np.dot(c.data.reshape(-1), a.data.reshape(-1))
+    assert np.isclose((term1-term2) / term1, 0., atol=1.e-5)
@@ -3,7 +3,8 @@ import pytest
 from conftest import EVAL, time, x, y, z, skipif_yask  # noqa
 
 from devito import Eq  # noqa
-from devito.ir.support.basic import IterationInstance, TimedAccess, Scope
+from devito.ir.support.basic import (IterationInstance, TimedAccess, Scope,
+                                     split_offset)
 from devito.ir.support.domain import NullInterval, Interval, Space
 
 
@@ -139,6 +140,35 @@ def test_iteration_instance_distance(dims, ii_num, ii_literal):
     assert fcxy.distance(fcx1y, y) == (-1, 0)
 
 
+@skipif_yask
+def test_iteration_instance_offsets(fc):
+    """
+    Tests the compact, integer-offset representation of the index functions
+    of an IterationInstance.
+    """
+    assert split_offset(x + 2) == (x, 2)
+    assert split_offset(x - 1) == (x, -1)
+    assert split_offset(x) == (x, 0)
+    assert split_offset(3) == (0, 3)
+    assert split_offset(2*x + 1) == (2*x, 1)
+    assert split_offset(x + y) == (x + y, 0)
+
+    fcx2y = IterationInstance(fc[x + 2, y])
+    fcx1y1 = IterationInstance(fc[x - 1, y + 1])
+    fc2xy = IterationInstance(fc[2*x, y])
+    assert fcx2y.offsets == ((x, 2), (y, 0))
+    assert fcx2y == IterationInstance(fc[x + 2, y])
+    assert fcx2y != fcx1y1
+
+    # Integer distances, computed without SymPy
+    distance = fcx2y.distance(fcx1y1)
+    assert distance == (3, -1)
+    assert all(type(i) == int for i in distance)
+
+    # Non-matching bases fall back to symbolic distances
+    assert fc2xy.distance(fcx2y) == (x - 2, 0)
+
+
 @skipif_yask
 def test_timed_access_cmp(ta_literal):
     """